@@ -0,0 +1,275 @@
+# Benchmark arun throughput, per-stage latency and memory against a local fixture site.
+#
+#   python p1.py --pages 60 --concurrency 1 4 8 --strategies lxml bs4 --output bench.json
+#
+# Compare two JSON reports from different crawl4ai versions to spot regressions.
+import argparse
+import asyncio
+import contextvars
+import json
+import platform
+import statistics
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import psutil
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy, WebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+try:
+    from crawl4ai.__version__ import __version__ as CRAWL4AI_VERSION
+except ImportError:
+    CRAWL4AI_VERSION = "unknown"
+
+# Per-page stage timings; each arun runs in its own task, so each gets its own dict
+_stage_times: contextvars.ContextVar = contextvars.ContextVar("stage_times")
+
+LISTING_SCHEMA = {
+    "name": "Products",
+    "baseSelector": ".thumbnail",
+    "fields": [
+        {"name": "product_name", "selector": ".title", "type": "text"},
+        {"name": "price", "selector": ".price", "type": "text"},
+        {"name": "image_url", "selector": ".img-responsive", "type": "attribute", "attribute": "src"}
+    ]
+}
+
+
+# ---------------------------------------------------------------- fixture site
+
+def listing_page(n: int) -> str:
+    # Same card layout as the webscraper.io test site in content-selection/p4.py
+    cards = "".join(
+        f"<div class='col-md-4'><div class='thumbnail'><img class='img-responsive' src='/img/{n}-{i}.png'>"
+        f"<div class='caption'><h4 class='price'>${i * 7 % 1000}.99</h4><h4><a class='title' href='/product/{i}'>"
+        f"Product {n}-{i}</a></h4><p class='description'>Lorem ipsum description {i}</p></div></div></div>"
+        for i in range(120)
+    )
+    return f"<html><head><title>Listing {n}</title></head><body><nav>Menu</nav><div class='row'>{cards}</div></body></html>"
+
+
+def article_page(n: int) -> str:
+    # Long, link-dense article in the spirit of the Wikipedia page in Local-Files-Raw-HTML/p4.py
+    sections = "".join(
+        f"<h2>Section {s}</h2>" + "".join(
+            f"<p>Paragraph {p} of section {s} with <a href='/article/{(n + p) % 50}'>a link</a> and "
+            f"<a href='https://example.org/ref/{s}-{p}'>a reference</a>. " + "Filler text for the article body. " * 12
+            + "</p>" for p in range(8))
+        for s in range(25)
+    )
+    return f"<html><head><title>Article {n}</title></head><body><main><h1>Article {n}</h1>{sections}</main></body></html>"
+
+
+def lazy_page(n: int) -> str:
+    images = "".join(f"<img loading='lazy' src='/img/lazy-{n}-{i}.png' width='300' height='200' alt='Image {i}'>"
+                     for i in range(80))
+    return f"<html><head><title>Gallery {n}</title></head><body><h1>Gallery {n}</h1>{images}</body></html>"
+
+
+PAGE_KINDS = {"listing": listing_page, "article": article_page, "lazy": lazy_page}
+TINY_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c6360000002000154a24f5d0000000049454e44ae426082"
+)
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        parts = self.path.strip("/").split("/")
+        if parts[0] == "img":
+            body, content_type = TINY_PNG, "image/png"
+        elif parts[0] in PAGE_KINDS and len(parts) == 2 and parts[1].isdigit():
+            body, content_type = PAGE_KINDS[parts[0]](int(parts[1])).encode(), "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+# ---------------------------------------------------------------- instrumentation
+
+def _record(stage: str, started: float) -> None:
+    times = _stage_times.get(None)
+    if times is not None:
+        times[stage] = times.get(stage, 0.0) + time.perf_counter() - started
+
+
+def timed_scraping(base_cls):
+    class TimedScraping(base_cls):
+        def scrap(self, url, html, **kwargs):
+            started = time.perf_counter()
+            try:
+                return super().scrap(url, html, **kwargs)
+            finally:
+                _record("scrape", started)
+    return TimedScraping()
+
+
+class TimedMarkdownGenerator(DefaultMarkdownGenerator):
+    def generate_markdown(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            # 0.4 passes cleaned_html, 0.5+ input_html: forward whatever came in
+            return super().generate_markdown(*args, **kwargs)
+        finally:
+            _record("markdown", started)
+
+
+class TimedJsonCssExtractionStrategy(JsonCssExtractionStrategy):
+    def run(self, url, sections, *q, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().run(url, sections, *q, **kwargs)
+        finally:
+            _record("extract", started)
+
+
+class ResourceSampler:
+    """Samples RSS of this process plus its children (the browser) in the background."""
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_browser_processes = 0
+        self._task = None
+
+    async def _run(self):
+        me = psutil.Process()
+        while True:
+            children = me.children(recursive=True)
+            rss = me.memory_info().rss
+            for child in children:
+                try:
+                    rss += child.memory_info().rss
+                except psutil.NoSuchProcess:
+                    pass
+            self.peak_rss = max(self.peak_rss, rss)
+            self.peak_browser_processes = max(self.peak_browser_processes, len(children))
+            await asyncio.sleep(self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+# ---------------------------------------------------------------- benchmark
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+async def run_once(base_url: str, strategy: str, concurrency: int, pages: int) -> Dict:
+    scraping_cls = {"lxml": LXMLWebScrapingStrategy, "bs4": WebScrapingStrategy}[strategy]
+    kinds = list(PAGE_KINDS)
+    urls = [f"{base_url}/{kinds[i % len(kinds)]}/{i}" for i in range(pages)]
+    listing_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        scraping_strategy=timed_scraping(scraping_cls),
+        markdown_generator=TimedMarkdownGenerator(),
+        extraction_strategy=TimedJsonCssExtractionStrategy(LISTING_SCHEMA),
+        verbose=False,
+    )
+    other_config = listing_config.clone(extraction_strategy=None)
+
+    stage_samples: Dict[str, List[float]] = {"total": [], "fetch": [], "scrape": [], "markdown": [], "extract": []}
+    failures = 0
+    slots = asyncio.Semaphore(concurrency)
+
+    async with AsyncWebCrawler(config=BrowserConfig(headless=True, verbose=False)) as crawler:
+        async def crawl(url: str):
+            nonlocal failures
+            async with slots:
+                times = {}
+                _stage_times.set(times)
+                started = time.perf_counter()
+                config = listing_config if "/listing/" in url else other_config
+                result = await crawler.arun(url=url, config=config)
+                total = time.perf_counter() - started
+            if not result.success:
+                failures += 1
+                return
+            stage_samples["total"].append(total)
+            # Whatever is not scraping/markdown/extraction is navigation and page loading
+            stage_samples["fetch"].append(total - sum(times.values()))
+            for stage, value in times.items():
+                stage_samples[stage].append(value)
+
+        with ResourceSampler() as sampler:
+            started = time.perf_counter()
+            await asyncio.gather(*(crawl(url) for url in urls))
+            wall = time.perf_counter() - started
+
+    return {
+        "strategy": strategy,
+        "concurrency": concurrency,
+        "pages": pages,
+        "failures": failures,
+        "wall_seconds": round(wall, 3),
+        "pages_per_second": round((pages - failures) / wall, 2),
+        "latency_ms": {
+            stage: {"p50": round(percentile(v, 50) * 1000, 1), "p99": round(percentile(v, 99) * 1000, 1)}
+            for stage, v in stage_samples.items() if v
+        },
+        "peak_rss_mb": round(sampler.peak_rss / 2**20, 1),
+        "peak_browser_processes": sampler.peak_browser_processes,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the crawl4ai pipeline on a local fixture site")
+    parser.add_argument("--pages", type=int, default=60, help="pages per run (mixed listing/article/lazy)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--strategies", nargs="+", default=["lxml", "bs4"], choices=["lxml", "bs4"])
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    report = {
+        "crawl4ai_version": CRAWL4AI_VERSION,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": psutil.cpu_count(),
+        "runs": [],
+    }
+    try:
+        for strategy in args.strategies:
+            for concurrency in args.concurrency:
+                run = await run_once(base_url, strategy, concurrency, args.pages)
+                report["runs"].append(run)
+                print(f"{strategy:5} x{concurrency:<3} {run['pages_per_second']:7.2f} pages/s  "
+                      f"p50 {run['latency_ms'].get('total', {}).get('p50', 0):7.1f} ms  "
+                      f"peak RSS {run['peak_rss_mb']:7.1f} MB")
+    finally:
+        server.shutdown()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"Report written to {args.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    asyncio.run(main())
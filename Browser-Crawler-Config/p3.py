@@ -0,0 +1,177 @@
+import asyncio
+import itertools
+import json
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+
+# Tiny page used to check that a pooled page still responds
+HEALTH_CHECK_URL = "raw:<html><body>ok</body></html>"
+
+
+class _PooledCrawler:
+    """One warm crawler (its own browser process) plus the idle pages (crawl4ai sessions) opened in it."""
+
+    def __init__(self, crawler: AsyncWebCrawler, max_pages: int):
+        self.crawler = crawler
+        self.idle: List[tuple] = []  # (session_id, released_at) of pages ready for reuse
+        self.uses: Dict[str, int] = {}
+        self.leased = 0
+        self.slots = asyncio.Semaphore(max_pages)  # Pages in use at once
+
+
+class CrawlerPool:
+    """
+    Keeps crawlers and their pages warm across arun calls.
+
+    Each identity, keyed by (proxy, storage_state, user agent, viewport),
+    gets its own AsyncWebCrawler, and so its own browser process: crawl4ai
+    sets proxy and storage state per browser. URLs that need the same
+    identity share that crawler. Least recently used crawlers are closed
+    once more than `max_browsers` are open. Each page is a crawl4ai session
+    (`session_id`), which keeps the Playwright page open between calls. At
+    most `max_pages_per_browser` pages are in use at once per crawler;
+    further leases wait. New pages are only opened when none is idle, so
+    this also bounds the pages a crawler keeps. A page is closed and
+    replaced after `max_uses_per_page` crawls, or when it fails a health
+    check. The check runs only when the page has been idle for more than
+    `health_check_after` seconds.
+    """
+
+    def __init__(
+        self,
+        max_browsers: int = 4,
+        max_pages_per_browser: int = 5,
+        max_uses_per_page: int = 50,
+        health_check_after: float = 30.0,
+    ):
+        self.max_browsers = max_browsers
+        self.max_pages_per_browser = max_pages_per_browser
+        self.max_uses_per_page = max_uses_per_page
+        self.health_check_after = health_check_after
+        self._crawlers: "OrderedDict[str, _PooledCrawler]" = OrderedDict()
+        self._session_ids = itertools.count()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def pool_key(proxy_config=None, storage_state=None, user_agent=None, viewport=(1080, 600)) -> str:
+        return json.dumps([proxy_config, storage_state, user_agent, list(viewport)], sort_keys=True, default=str)
+
+    async def _get_crawler(self, key: str, browser_config: BrowserConfig) -> _PooledCrawler:
+        async with self._lock:
+            if key in self._crawlers:
+                self._crawlers.move_to_end(key)
+                self._crawlers[key].leased += 1
+                return self._crawlers[key]
+
+            # Evict idle crawlers (least recently used first) to make room
+            for old_key in list(self._crawlers):
+                if len(self._crawlers) < self.max_browsers:
+                    break
+                if self._crawlers[old_key].leased == 0:
+                    await self._crawlers.pop(old_key).crawler.close()
+
+            crawler = AsyncWebCrawler(config=browser_config)
+            await crawler.start()
+            pooled = self._crawlers[key] = _PooledCrawler(crawler, self.max_pages_per_browser)
+            pooled.leased += 1  # Counted under the lock so eviction never closes a leased crawler
+            return pooled
+
+    async def _is_healthy(self, pooled: _PooledCrawler, session_id: str) -> bool:
+        try:
+            result = await pooled.crawler.arun(
+                url=HEALTH_CHECK_URL,
+                config=CrawlerRunConfig(session_id=session_id, cache_mode=CacheMode.BYPASS),
+            )
+            return result.success
+        except Exception:
+            return False
+
+    async def _kill_page(self, pooled: _PooledCrawler, session_id: str) -> None:
+        pooled.uses.pop(session_id, None)
+        await pooled.crawler.crawler_strategy.kill_session(session_id)
+
+    @asynccontextmanager
+    async def lease(
+        self,
+        proxy_config: Optional[dict] = None,
+        storage_state=None,
+        user_agent: Optional[str] = None,
+        viewport=(1080, 600),
+    ):
+        """Yield `(crawler, session_id)` for a warm page matching the identity."""
+        key = self.pool_key(proxy_config, storage_state, user_agent, viewport)
+        browser_kwargs = dict(
+            headless=True,
+            proxy_config=proxy_config,
+            storage_state=storage_state,
+            viewport_width=viewport[0],
+            viewport_height=viewport[1],
+        )
+        if user_agent:  # Otherwise keep BrowserConfig's default user agent
+            browser_kwargs["user_agent"] = user_agent
+        browser_config = BrowserConfig(**browser_kwargs)
+        pooled = await self._get_crawler(key, browser_config)
+        try:
+            async with pooled.slots:  # Waits while max_pages_per_browser pages are in use
+                session_id = None
+                try:
+                    while pooled.idle:
+                        candidate, released_at = pooled.idle.pop()
+                        recently_used = time.monotonic() - released_at < self.health_check_after
+                        if recently_used or await self._is_healthy(pooled, candidate):
+                            session_id = candidate
+                            break
+                        await self._kill_page(pooled, candidate)
+                    if session_id is None:
+                        # The page itself is created lazily by the first arun with this session id
+                        session_id = f"pool-{next(self._session_ids)}"
+                        pooled.uses[session_id] = 0
+
+                    yield pooled.crawler, session_id
+
+                    pooled.uses[session_id] += 1
+                    if pooled.uses[session_id] >= self.max_uses_per_page:
+                        await self._kill_page(pooled, session_id)
+                    else:
+                        pooled.idle.append((session_id, time.monotonic()))
+                except Exception:
+                    if session_id is not None:
+                        await self._kill_page(pooled, session_id)
+                    raise
+        finally:
+            pooled.leased -= 1
+
+    async def arun(self, url: str, config: CrawlerRunConfig, **identity):
+        """Crawl `url` on a pooled page, like `AsyncWebCrawler.arun`."""
+        async with self.lease(**identity) as (crawler, session_id):
+            return await crawler.arun(url=url, config=config.clone(session_id=session_id))
+
+    async def close(self) -> None:
+        async with self._lock:
+            while self._crawlers:
+                _, pooled = self._crawlers.popitem()
+                await pooled.crawler.close()
+
+
+async def main():
+    urls = ["https://example.com", "https://example.org", "https://example.net"]
+    proxies = [None, {"server": "http://proxy1.example.com:8080"}]
+    run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    pool = CrawlerPool(max_browsers=2, max_uses_per_page=20)
+    try:
+        # Second round reuses the crawlers and pages opened by the first
+        for round_no in range(2):
+            for url in urls:
+                for proxy in proxies:
+                    result = await pool.arun(url, run_config, proxy_config=proxy)
+                    print(f"[round {round_no}] {url} via {proxy and proxy['server']}: success={result.success}")
+    finally:
+        await pool.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
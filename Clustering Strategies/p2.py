@@ -0,0 +1,214 @@
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.extraction_strategy import CosineStrategy, ExtractionStrategy
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Process-wide model registry: every strategy instance shares one loaded copy of each model
+_models: Dict[str, tuple] = {}
+_classifier = None
+_models_lock = threading.Lock()
+
+
+def get_embedding_model(model_name: str):
+    """Load (once per process) and return (tokenizer, model, device) for `model_name`."""
+    with _models_lock:
+        if model_name not in _models:
+            from crawl4ai.model_loader import get_device, load_HF_embedding_model
+
+            device = get_device()
+            tokenizer, model = load_HF_embedding_model(model_name)
+            model.to(device)
+            model.eval()
+            _models[model_name] = (tokenizer, model, device)
+        return _models[model_name]
+
+
+def get_classifier():
+    """The multilabel tagger CosineStrategy uses for cluster tags, loaded on first use."""
+    global _classifier
+    with _models_lock:
+        if _classifier is None:
+            from crawl4ai.model_loader import load_text_multilabel_classifier
+
+            _classifier, _ = load_text_multilabel_classifier()
+        return _classifier
+
+
+class EmbeddingCache:
+    """
+    SQLite store of float32 embeddings keyed by (model name, SHA-256 of the text).
+
+    Lookups and inserts go in batches, so a page's worth of blocks costs a
+    couple of queries. Safe to share between threads.
+    """
+
+    def __init__(self, db_path: str = "embeddings.sqlite"):
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+        """)
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def get_many(self, model: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for i in range(0, len(hashes), 500):  # Stay under SQLite's bound-parameter limit
+                batch = hashes[i:i + 500]
+                rows = self.db.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({','.join('?' * len(batch))})",
+                    [model, *batch],
+                )
+                for text_hash, vector in rows:
+                    found[text_hash] = np.frombuffer(vector, dtype=np.float32)
+        return found
+
+    def put_many(self, model: str, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                [(model, h, v.astype(np.float32).tobytes()) for h, v in items.items()],
+            )
+            self.db.commit()
+
+
+class CachedCosineStrategy(CosineStrategy):
+    """
+    CosineStrategy with lazy shared models, batched inference and an embedding cache.
+
+    - The embedding model and the tag classifier are loaded on first use and
+      shared by every instance in the process. Creating a strategy per request
+      costs nothing.
+    - A call embeds each distinct text once. Texts are sorted by length before
+      batching, so a batch carries little padding.
+    - Embeddings of texts seen before (nav, footers, repeated reviews) come
+      from the EmbeddingCache, so they are never recomputed.
+
+    Mean pooling ignores padding tokens, unlike the stock strategy. With the
+    stock pooling a text's vector depends on which batch it lands in, and
+    such vectors could not be cached.
+    """
+
+    def __init__(self, semantic_filter=None, word_count_threshold=10, max_dist=0.2, linkage_method="ward",
+                 top_k=3, model_name="sentence-transformers/all-MiniLM-L6-v2", sim_threshold=0.3,
+                 cache: Optional[EmbeddingCache] = None, batch_size: Optional[int] = None, **kwargs):
+        # Skip CosineStrategy.__init__, which loads both models eagerly
+        ExtractionStrategy.__init__(self, **kwargs)
+        self.semantic_filter = semantic_filter
+        self.word_count_threshold = word_count_threshold
+        self.max_dist = max_dist
+        self.linkage_method = linkage_method
+        self.top_k = top_k
+        self.sim_threshold = sim_threshold
+        self.model_name = model_name
+        self.verbose = kwargs.get("verbose", False)
+        self.cache = cache
+        self.batch_size = batch_size
+        self.buffer_embeddings = np.array([])
+        self.get_embedding_method = "batch"
+        self.cache_hits = 0
+        self.embedded = 0
+
+    # Attributes the stock strategy sets in __init__, resolved lazily here
+    tokenizer = property(lambda self: get_embedding_model(self.model_name)[0])
+    model = property(lambda self: get_embedding_model(self.model_name)[1])
+    device = property(lambda self: get_embedding_model(self.model_name)[2])
+    nlp = property(lambda self: get_classifier())
+
+    @property
+    def default_batch_size(self) -> int:
+        from crawl4ai.model_loader import calculate_batch_size
+
+        return self.batch_size or calculate_batch_size(self.device)
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        import torch
+
+        tokenizer, model, device = get_embedding_model(self.model_name)
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors = np.empty((len(texts), model.config.hidden_size), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            encoded = tokenizer([texts[i] for i in batch], padding=True, truncation=True, return_tensors="pt")
+            encoded = {key: tensor.to(device) for key, tensor in encoded.items()}
+            with torch.inference_mode():
+                hidden = model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            vectors[batch] = pooled.cpu().numpy()
+        return vectors
+
+    def get_embeddings(self, sentences: List[str], batch_size=None, bypass_buffer=False):
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        hashes = [EmbeddingCache.key(s) for s in sentences]
+        unique = dict(zip(hashes, sentences))  # One embedding per distinct text
+        found = self.cache.get_many(self.model_name, list(unique)) if self.cache else {}
+        missing = [h for h in unique if h not in found]
+        self.cache_hits += len(unique) - len(missing)
+
+        if missing:
+            started = time.time()
+            vectors = self._encode([unique[h] for h in missing], batch_size or self.default_batch_size)
+            computed = dict(zip(missing, vectors))
+            self.embedded += len(missing)
+            if self.cache:
+                self.cache.put_many(self.model_name, computed)
+            found.update(computed)
+            if self.verbose:
+                print(f"[LOG] Embedded {len(missing)} texts in {time.time() - started:.2f}s "
+                      f"({len(unique) - len(missing)} from cache)")
+
+        self.buffer_embeddings = np.vstack([found[h] for h in hashes])
+        return self.buffer_embeddings
+
+
+async def main():
+    cache = EmbeddingCache("embeddings.sqlite")
+    urls = [
+        "https://www.nbcnews.com/business",
+        "https://www.nbcnews.com/tech-media",  # Same site: nav and footer blocks repeat
+    ]
+
+    async with AsyncWebCrawler() as crawler:
+        for url in urls:
+            # Cheap to create per request: the models are loaded once and shared
+            strategy = CachedCosineStrategy(
+                semantic_filter="business news",
+                word_count_threshold=20,
+                sim_threshold=0.5,
+                max_dist=0.3,
+                top_k=5,
+                model_name="sentence-transformers/all-MiniLM-L6-v2",
+                cache=cache,
+                batch_size=32,
+                verbose=True
+            )
+            result = await crawler.arun(
+                url=url,
+                config=CrawlerRunConfig(extraction_strategy=strategy, cache_mode=CacheMode.BYPASS)
+            )
+            if result.success:
+                clusters = json.loads(result.extracted_content)
+                print(f"{url}: {len(clusters)} clusters, "
+                      f"{strategy.embedded} texts embedded, {strategy.cache_hits} from cache")
+            else:
+                print(f"{url}: {result.error_message}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,155 @@
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.extraction_strategy import CosineStrategy
+import asyncio
+import contextvars
+import json
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# Vectors of the page being extracted, keyed by block text. A context variable rather than
+# instance state, so threads sharing one strategy each see only their own page's vectors
+_page_vectors: contextvars.ContextVar[Optional[Dict[str, np.ndarray]]] = contextvars.ContextVar(
+    "page_vectors", default=None
+)
+
+
+class ScalableCosineStrategy(CosineStrategy):
+    """
+    CosineStrategy that switches to a linear-memory clustering mode on large pages.
+
+    Up to `large_threshold` blocks, the stock ward linkage over the full
+    pairwise distance matrix is used. Above it, one of two modes runs:
+
+    - "knn_graph": a k-nearest-neighbour graph on cosine similarity,
+      built `block_size` rows at a time, with edges kept only within
+      `max_dist`. Clusters are its connected components. Memory is
+      O(block_size * n + n * knn_k) instead of O(n^2). This is
+      single-linkage clustering, not ward: a chain of close neighbours
+      joins blocks that are far apart. On pages of uniformly similar
+      blocks, such as reviews or comments, it can merge most of the page
+      into one cluster. Lower `max_dist` or `knn_k`, or use
+      "minibatch_kmeans", when that happens.
+    - "minibatch_kmeans": scikit-learn MiniBatchKMeans on normalized
+      embeddings, with about sqrt(n / 2) clusters unless `n_clusters` is given.
+
+    Blocks are embedded once per extract() call. The semantic_filter
+    pre-filter and the clustering share the same vectors. The vectors
+    belong to the call, so one instance can serve several threads.
+    """
+
+    def __init__(self, *args, large_threshold: int = 1000, large_method: str = "knn_graph", knn_k: int = 10,
+                 block_size: int = 1024, n_clusters: int = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if large_method not in ("knn_graph", "minibatch_kmeans"):
+            raise ValueError(f"Unknown large_method: {large_method}")
+        self.large_threshold = large_threshold
+        self.large_method = large_method
+        self.knn_k = knn_k
+        self.block_size = block_size
+        self.n_clusters = n_clusters
+
+    def get_embeddings(self, sentences: List[str], batch_size=None, bypass_buffer=False):
+        vectors = _page_vectors.get()
+        if vectors is None:  # Outside extract(): nothing to share
+            return super().get_embeddings(sentences, batch_size, bypass_buffer)
+        missing = list(dict.fromkeys(s for s in sentences if s not in vectors))
+        if missing:
+            for sentence, vector in zip(missing, super().get_embeddings(missing, batch_size, bypass_buffer)):
+                vectors[sentence] = vector
+        return np.vstack([vectors[s] for s in sentences]) if sentences else np.array([])
+
+    def extract(self, url: str, html: str, *q, **kwargs):
+        token = _page_vectors.set({})  # Vectors are only reused within one page
+        try:
+            return super().extract(url, html, *q, **kwargs)
+        finally:
+            _page_vectors.reset(token)
+
+    def hierarchical_clustering(self, sentences: List[str], embeddings=None):
+        if embeddings is None:
+            embeddings = self.get_embeddings(sentences)
+        if len(sentences) <= self.large_threshold:
+            from scipy.cluster.hierarchy import fcluster, linkage
+            from scipy.spatial.distance import pdist
+
+            return fcluster(linkage(pdist(embeddings, "cosine"), method=self.linkage_method),
+                            self.max_dist, criterion="distance")
+
+        started = time.time()
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        unit = (embeddings / np.maximum(norms, 1e-12)).astype(np.float32)
+        if self.large_method == "knn_graph":
+            labels = self._knn_graph_labels(unit)
+        else:
+            labels = self._minibatch_kmeans_labels(unit)
+        if self.verbose:
+            print(f"[LOG] {self.large_method} clustered {len(sentences)} blocks into "
+                  f"{len(set(labels.tolist()))} clusters in {time.time() - started:.2f}s")
+        return labels
+
+    def _knn_graph_labels(self, unit: np.ndarray) -> np.ndarray:
+        from scipy.sparse import csr_matrix
+        from scipy.sparse.csgraph import connected_components
+
+        n = len(unit)
+        k = min(self.knn_k, n - 1)
+        rows, cols = [], []
+        for start in range(0, n, self.block_size):
+            sims = unit[start:start + self.block_size] @ unit.T  # block_size x n, never n x n
+            for offset in range(len(sims)):
+                sims[offset, start + offset] = -np.inf  # No self-edges
+            neighbours = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            block_rows = np.repeat(np.arange(start, start + len(sims)), k)
+            neighbour_sims = np.take_along_axis(sims, neighbours, axis=1).ravel()
+            close = (1.0 - neighbour_sims) <= self.max_dist
+            rows.append(block_rows[close])
+            cols.append(neighbours.ravel()[close])
+
+        rows, cols = np.concatenate(rows), np.concatenate(cols)
+        graph = csr_matrix((np.ones(len(rows), dtype=np.int8), (rows, cols)), shape=(n, n))
+        # Single linkage: A-B and B-C within max_dist put A and C in one component however far apart they are
+        _, labels = connected_components(graph, directed=False)
+        return labels + 1  # fcluster labels start at 1
+
+    def _minibatch_kmeans_labels(self, unit: np.ndarray) -> np.ndarray:
+        from sklearn.cluster import MiniBatchKMeans  # Optional dependency: pip install scikit-learn
+
+        n_clusters = self.n_clusters or max(2, int(np.sqrt(len(unit) / 2)))
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, batch_size=self.block_size, n_init=3, random_state=0)
+        return kmeans.fit_predict(unit) + 1
+
+
+async def main():
+    # A review page with thousands of blocks: ward linkage here would need an n x n matrix
+    strategy = ScalableCosineStrategy(
+        semantic_filter=None,             # Cluster every block
+        word_count_threshold=15,
+        sim_threshold=0.4,
+        max_dist=0.3,
+        top_k=10,
+        model_name="sentence-transformers/all-MiniLM-L6-v2",
+        large_threshold=1000,             # Above this many blocks, use the kNN graph
+        large_method="knn_graph",
+        knn_k=10,
+        block_size=1024,
+        verbose=True
+    )
+
+    async with AsyncWebCrawler() as crawler:
+        result = await crawler.arun(
+            url="https://www.imdb.com/title/tt0111161/reviews",
+            config=CrawlerRunConfig(extraction_strategy=strategy, cache_mode=CacheMode.BYPASS)
+        )
+        if result.success:
+            clusters = json.loads(result.extracted_content)
+            print(f"Extracted {len(clusters)} clusters")
+            for cluster in clusters[:5]:
+                print(cluster["index"], cluster["tags"], cluster["content"][:100])
+        else:
+            print(f"Error: {result.error_message}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.extraction_strategy import CosineStrategy, JsonCssExtractionStrategy, LLMExtractionStrategy
+from crawl4ai.models import TokenUsage
+import asyncio
+import copy
+import functools
+import json
+from typing import Any, Dict
+
+import numpy as np
+
+
+class CloneableStrategyMixin:
+    """
+    Makes an extraction strategy's parameters read-only and adds `clone(**overrides)`.
+
+    A clone is a shallow copy. Models, tokenizers and the classifier are the
+    same objects as in the original, so a clone costs a few attribute copies
+    whatever the strategy loaded. Per-call state listed in `_per_call_state`
+    (embedding buffers, token usage) is reset, so clones never write into each
+    other's results. Assigning to a parameter after construction raises, which
+    catches code that still tunes a shared instance per request.
+    """
+
+    # Parameters clone() may override; subclasses list their own
+    _config_fields: tuple = ()
+    # Attribute name -> factory for a fresh value on each clone
+    _per_call_state: Dict[str, Any] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Wrap rather than override __init__: some stock strategies inspect the
+        # signature of self.__init__ in __setattr__, and functools.wraps keeps it
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+            if type(self).__init__ is __init__:  # Only the outermost __init__ freezes
+                object.__setattr__(self, "_frozen", True)
+
+        cls.__init__ = __init__
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False) and name in self._config_fields:
+            raise AttributeError(f"{type(self).__name__}.{name} is read-only; use clone({name}=...)")
+        super().__setattr__(name, value)
+
+    def clone(self, **overrides):
+        unknown = set(overrides) - set(self._config_fields)
+        if unknown:
+            raise TypeError(f"{type(self).__name__}.clone() cannot override: {', '.join(sorted(unknown))}")
+        clone = copy.copy(self)
+        for name, factory in self._per_call_state.items():
+            object.__setattr__(clone, name, factory())
+        for name, value in overrides.items():
+            object.__setattr__(clone, name, value)
+        clone._apply_overrides(overrides)
+        return clone
+
+    def _apply_overrides(self, overrides: Dict[str, Any]) -> None:
+        """Recompute attributes derived from parameters in __init__."""
+
+
+class FrozenCosineStrategy(CloneableStrategyMixin, CosineStrategy):
+    # model_name is missing on purpose: a different model is a new strategy, not a clone
+    _config_fields = ("semantic_filter", "word_count_threshold", "max_dist", "linkage_method",
+                      "top_k", "sim_threshold", "verbose")
+    _per_call_state = {"buffer_embeddings": lambda: np.array([])}
+
+
+class FrozenJsonCssExtractionStrategy(CloneableStrategyMixin, JsonCssExtractionStrategy):
+    _config_fields = ("schema", "input_format", "verbose")
+
+
+class FrozenLLMExtractionStrategy(CloneableStrategyMixin, LLMExtractionStrategy):
+    _config_fields = ("instruction", "schema", "extract_type", "chunk_token_threshold", "overlap_rate",
+                      "word_token_rate", "apply_chunking", "extra_args", "input_format", "verbose")
+    _per_call_state = {"usages": list, "total_usage": TokenUsage}
+
+    def _apply_overrides(self, overrides):
+        # Same derivations as LLMExtractionStrategy.__init__
+        if overrides.get("schema"):
+            object.__setattr__(self, "extract_type", "schema")
+        if "apply_chunking" in overrides and not self.apply_chunking:
+            object.__setattr__(self, "chunk_token_threshold", 1e9)
+
+
+# One strategy for the whole process: the embedding model and classifier load once
+base_strategy = FrozenCosineStrategy(
+    semantic_filter="mixed content",
+    word_count_threshold=20,
+    sim_threshold=0.5,
+    max_dist=0.3,
+    linkage_method='ward',
+    top_k=5,
+    model_name='sentence-transformers/all-MiniLM-L6-v2',
+    verbose=True
+)
+
+# The per-content-type settings from p1.py, as overrides instead of assignments
+CONTENT_TYPES = {
+    "reviews": dict(semantic_filter="customer reviews and ratings", word_count_threshold=15, sim_threshold=0.4, top_k=10),
+    "articles": dict(semantic_filter="main article content", word_count_threshold=100, sim_threshold=0.6, top_k=1),
+    "technical": dict(semantic_filter="technical specifications", word_count_threshold=30, sim_threshold=0.7, max_dist=0.2),
+}
+
+
+async def extract_content(crawler: AsyncWebCrawler, url: str, content_type: str = None) -> Dict[str, Any]:
+    strategy = base_strategy.clone(**CONTENT_TYPES.get(content_type, {}))
+    result = await crawler.arun(
+        url=url,
+        config=CrawlerRunConfig(extraction_strategy=strategy, cache_mode=CacheMode.BYPASS)
+    )
+    if not result.success:
+        return {'error': result.error_message, 'success': False}
+    content = json.loads(result.extracted_content)
+    return {
+        'content': content,
+        'num_clusters': len(content),
+        'content_type': content_type or 'general',
+        'success': True
+    }
+
+
+async def main():
+    jobs = [
+        ("https://www.imdb.com/title/tt0111161/reviews", "reviews"),
+        ("https://en.wikipedia.org/wiki/Web_crawler", "articles"),
+        ("https://www.apple.com/macbook-air/specs/", "technical"),
+        ("https://www.nbcnews.com/business", None),
+    ]
+
+    # Concurrent crawls with different parameters, all sharing one loaded model
+    async with AsyncWebCrawler() as crawler:
+        results = await asyncio.gather(*(extract_content(crawler, url, kind) for url, kind in jobs))
+    for (url, _), result in zip(jobs, results):
+        print(url, result.get('content_type'), result.get('num_clusters', result.get('error')))
+
+    clone = base_strategy.clone(top_k=3)
+    print("Model shared with clone:", clone.model is base_strategy.model)
+    try:
+        base_strategy.top_k = 10
+    except AttributeError as e:
+        print(e)
+
+if __name__ == "__main__":
+    asyncio.run(main())
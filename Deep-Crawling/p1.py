@@ -0,0 +1,355 @@
+import asyncio
+import hashlib
+import math
+import sqlite3
+import time
+from typing import AsyncIterator, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.models import CrawlResult
+
+TRACKING_PARAMS = {"gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "ref", "ref_src", "igshid"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+MASK64 = (1 << 64) - 1
+
+PENDING, IN_PROGRESS, DONE, FAILED = 0, 1, 2, 3
+
+
+def normalize_url(url: str, base: str = None) -> Optional[str]:
+    """
+    Canonical form of `url` (resolved against `base`), or None if it is not an http(s) URL.
+
+    Lowercases scheme and host, drops default ports, fragments and tracking
+    parameters (utm_*, gclid, ...), sorts the query, and turns an empty
+    path into "/", so the same page always gets the same key.
+    """
+    url = urljoin(base, url.strip()) if base else url.strip()
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in DEFAULT_PORTS or not parts.hostname:
+        return None
+    host = parts.hostname.lower().rstrip(".")
+    if parts.port and parts.port != DEFAULT_PORTS[scheme]:
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_") and k.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def url_hash(url: str) -> int:
+    """Signed 64-bit key for `url`; fits an SQLite INTEGER."""
+    return int.from_bytes(hashlib.blake2b(url.encode(), digest_size=8).digest(), "big", signed=True)
+
+
+def _mix64(x: int) -> int:
+    # splitmix64 finalizer: a second, independent hash derived from the first
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit URL hashes.
+
+    Memory is set by `capacity` and `error_rate` (10M URLs at 1e-6 is
+    about 36 MB) and never grows. A false positive makes the crawler skip a
+    URL it has not seen, at a rate of about `error_rate`. It never makes it
+    crawl a page twice.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-6, bits: bytes = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.m = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.k = max(1, round(self.m / capacity * math.log(2)))
+        self.bits = bytearray(bits) if bits is not None else bytearray((self.m + 7) // 8)
+
+    def _positions(self, key: int):
+        h1 = key & MASK64
+        h2 = _mix64(h1) | 1
+        return ((h1 + i * h2) % self.m for i in range(self.k))
+
+    def add(self, key: int) -> bool:
+        """Add `key`; returns True if it was (definitely) not present before."""
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self.bits[byte] & (1 << bit):
+                self.bits[byte] |= 1 << bit
+                new = True
+        return new
+
+    def __contains__(self, key: int) -> bool:
+        return all(self.bits[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key))
+
+
+class Frontier:
+    """
+    Disk-backed crawl frontier in SQLite.
+
+    - Every discovered URL is a row with its depth, score, priority and state
+      (pending, in progress, done, failed). Only the current batch is in
+      memory, so the frontier can hold millions of URLs.
+    - Dedup goes through a BloomFilter first and a unique index on the URL
+      hash second. Repeated nav and footer links cost no query.
+    - Priority is `depth * depth_weight - score`; lower goes first, and
+      earlier discoveries break ties, which gives breadth-first order by default.
+    - `next_batch` takes the best URLs of several domains at once, at most
+      `per_domain` each. A domain is not offered again for `domain_delay`
+      seconds.
+    - `checkpoint` commits the frontier and the Bloom filter in one
+      transaction. Reopening the same file resumes from the last checkpoint:
+      URLs that were in progress at that point go back to pending.
+    """
+
+    def __init__(self, path: str = "frontier.sqlite", capacity: int = 10_000_000, error_rate: float = 1e-6,
+                 depth_weight: float = 1.0, domain_delay: float = 1.0):
+        self.depth_weight = depth_weight
+        self.domain_delay = domain_delay
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY,
+                url TEXT NOT NULL,
+                url_hash INTEGER NOT NULL UNIQUE,
+                domain TEXT NOT NULL,
+                depth INTEGER NOT NULL,
+                score REAL NOT NULL,
+                priority REAL NOT NULL,
+                state INTEGER NOT NULL DEFAULT 0,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                discovered_at REAL NOT NULL,
+                crawled_at REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS urls_next ON urls (domain, state, priority, id);
+            CREATE TABLE IF NOT EXISTS domains (
+                domain TEXT PRIMARY KEY,
+                pending INTEGER NOT NULL DEFAULT 0,
+                next_fetch_at REAL NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS domains_ready ON domains (next_fetch_at) WHERE pending > 0;
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB);
+        """)
+        self.bloom = self._load_bloom(capacity, error_rate)
+
+        # Resume: whatever was being crawled when the last checkpoint was written gets crawled again
+        self.db.execute("BEGIN")
+        resumed = self.db.execute("UPDATE urls SET state = ? WHERE state = ?", (PENDING, IN_PROGRESS)).rowcount
+        self.db.execute("""
+            UPDATE domains SET next_fetch_at = 0,
+                pending = (SELECT COUNT(*) FROM urls WHERE urls.domain = domains.domain AND state = 0)
+        """)
+        if resumed:
+            print(f"[FRONTIER] Resumed with {resumed} interrupted URLs back in the queue")
+
+    def _load_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'bloom'").fetchone()
+        bloom = BloomFilter(capacity, error_rate)
+        if row is not None and len(row[0]) == len(bloom.bits):
+            bloom.bits = bytearray(row[0])
+        else:
+            # No checkpoint yet, or a different size: rebuild from the hashes in the table
+            for (key,) in self.db.execute("SELECT url_hash FROM urls"):
+                bloom.add(key)
+        return bloom
+
+    def add(self, urls: Iterable[str], depth: int = 0, score: float = 0.0, base: str = None) -> int:
+        """Queue the URLs not seen before; returns how many were new."""
+        now = time.time()
+        rows = []
+        for url in urls:
+            url = normalize_url(url, base)
+            if url is None:
+                continue
+            key = url_hash(url)
+            if not self.bloom.add(key):
+                continue  # Seen before (or, rarely, a false positive)
+            domain = urlsplit(url).netloc
+            rows.append((url, key, domain, depth, score, depth * self.depth_weight - score, now))
+        if not rows:
+            return 0
+        self._begin()
+        added = 0
+        for row in rows:
+            if self.db.execute(
+                "INSERT OR IGNORE INTO urls (url, url_hash, domain, depth, score, priority, discovered_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", row
+            ).rowcount:
+                added += 1
+                self.db.execute(
+                    "INSERT INTO domains (domain, pending) VALUES (?, 1) "
+                    "ON CONFLICT(domain) DO UPDATE SET pending = pending + 1", (row[2],)
+                )
+        return added
+
+    def next_batch(self, size: int = 32, per_domain: int = 4) -> List[Tuple[str, int, float]]:
+        """Up to `size` (url, depth, score) tuples, taken round-robin from domains that are ready."""
+        now = time.time()
+        self._begin()
+        domains = [d for (d,) in self.db.execute(
+            "SELECT domain FROM domains WHERE pending > 0 AND next_fetch_at <= ? ORDER BY next_fetch_at LIMIT ?",
+            (now, size),
+        )]
+        batch = []
+        for domain in domains:
+            take = min(per_domain, size - len(batch))
+            if take <= 0:
+                break
+            rows = self.db.execute(
+                "SELECT id, url, depth, score FROM urls WHERE domain = ? AND state = ? ORDER BY priority, id LIMIT ?",
+                (domain, PENDING, take),
+            ).fetchall()
+            self.db.executemany("UPDATE urls SET state = ?, attempts = attempts + 1 WHERE id = ?",
+                                [(IN_PROGRESS, row[0]) for row in rows])
+            self.db.execute("UPDATE domains SET pending = pending - ?, next_fetch_at = ? WHERE domain = ?",
+                            (len(rows), now + self.domain_delay, domain))
+            batch.extend((url, depth, score) for _, url, depth, score in rows)
+        return batch
+
+    def complete(self, url: str, success: bool, error: str = None) -> None:
+        self._begin()
+        self.db.execute("UPDATE urls SET state = ?, crawled_at = ?, error = ? WHERE url_hash = ?",
+                        (DONE if success else FAILED, time.time(), error, url_hash(url)))
+
+    def requeue_stale(self, max_age: float) -> int:
+        """Freshness: put pages crawled more than `max_age` seconds ago back in the queue."""
+        self._begin()
+        cutoff = time.time() - max_age
+        count = self.db.execute("UPDATE urls SET state = ? WHERE state = ? AND crawled_at < ?",
+                                (PENDING, DONE, cutoff)).rowcount
+        self.db.execute("UPDATE domains SET pending = (SELECT COUNT(*) FROM urls WHERE urls.domain = domains.domain AND state = 0)")
+        return count
+
+    def checkpoint(self) -> None:
+        self._begin()
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('bloom', ?)", (bytes(self.bloom.bits),))
+        self.db.execute("COMMIT")
+
+    def pending(self) -> int:
+        return self.db.execute("SELECT COALESCE(SUM(pending), 0) FROM domains").fetchone()[0]
+
+    def stats(self) -> dict:
+        names = {PENDING: "pending", IN_PROGRESS: "in_progress", DONE: "done", FAILED: "failed"}
+        counts = dict(self.db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state"))
+        return {name: counts.get(state, 0) for state, name in names.items()}
+
+    def close(self) -> None:
+        self.checkpoint()
+        self.db.close()
+
+    def _begin(self) -> None:
+        # Everything between checkpoints is one transaction, so a crash rolls back to the last checkpoint
+        if not self.db.in_transaction:
+            self.db.execute("BEGIN")
+
+
+class DeepCrawler:
+    """
+    Follows internal links from seed URLs through a Frontier, crawling batches with `arun_many`.
+
+    `crawl` yields each CrawlResult as it arrives. Links of pages above
+    `max_depth` are not followed. By default only the seeds' hosts are
+    crawled; `allowed_domains` widens that. `score_fn(url, depth,
+    parent_result)` can rank links, and a higher score is crawled sooner.
+    The frontier is checkpointed every `checkpoint_every` pages and at the end.
+    """
+
+    def __init__(self, crawler: AsyncWebCrawler, frontier: Frontier, config: Optional[CrawlerRunConfig] = None,
+                 max_depth: int = 3, max_pages: int = 1000, batch_size: int = 32, per_domain: int = 4,
+                 allowed_domains: Iterable[str] = None, checkpoint_every: int = 200,
+                 score_fn: Callable[[str, int, CrawlResult], float] = None):
+        self.crawler = crawler
+        self.frontier = frontier
+        self.config = (config or CrawlerRunConfig()).clone(stream=True)
+        self.max_depth = max_depth
+        self.max_pages = max_pages
+        self.batch_size = batch_size
+        self.per_domain = per_domain
+        self.allowed_domains = set(allowed_domains or ())
+        self.checkpoint_every = checkpoint_every
+        self.score_fn = score_fn
+
+    def _allowed(self, url: str) -> bool:
+        host = urlsplit(url).hostname or ""
+        return any(host == d or host.endswith("." + d) for d in self.allowed_domains)
+
+    def _follow(self, result: CrawlResult, depth: int) -> None:
+        base = result.redirected_url or result.url
+        links = []
+        for link in result.links.get("internal", []):
+            url = normalize_url(link.get("href", "") if isinstance(link, dict) else link, base)
+            if url and self._allowed(url):
+                links.append(url)
+        if not self.score_fn:
+            self.frontier.add(links, depth + 1)
+            return
+        for url in links:
+            self.frontier.add([url], depth + 1, self.score_fn(url, depth + 1, result))
+
+    async def crawl(self, seeds: Iterable[str]) -> AsyncIterator[CrawlResult]:
+        seeds = [u for u in (normalize_url(s) for s in seeds) if u]
+        if not self.allowed_domains:
+            self.allowed_domains = {urlsplit(u).hostname for u in seeds}
+        self.frontier.add(seeds, depth=0)
+        self.frontier.checkpoint()
+
+        crawled = 0
+        try:
+            while crawled < self.max_pages:
+                batch = self.frontier.next_batch(min(self.batch_size, self.max_pages - crawled), self.per_domain)
+                if not batch:
+                    if not self.frontier.pending():
+                        break
+                    await asyncio.sleep(self.frontier.domain_delay / 4)  # Every domain is cooling down
+                    continue
+
+                depths = {url: depth for url, depth, _ in batch}
+                async for result in await self.crawler.arun_many(list(depths), config=self.config):
+                    depth = depths.get(result.url, self.max_depth)
+                    self.frontier.complete(result.url, result.success, None if result.success else result.error_message)
+                    if result.success and depth < self.max_depth:
+                        self._follow(result, depth)
+                    crawled += 1
+                    if crawled % self.checkpoint_every == 0:
+                        self.frontier.checkpoint()
+                    yield result
+        finally:
+            self.frontier.checkpoint()
+
+
+async def main():
+    frontier = Frontier("datacamp_frontier.sqlite", capacity=1_000_000, domain_delay=0.5)
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        exclude_external_links=True,
+        exclude_social_media_links=True
+    )
+
+    async with AsyncWebCrawler(config=BrowserConfig(headless=True)) as crawler:
+        deep = DeepCrawler(
+            crawler,
+            frontier,
+            config=config,
+            max_depth=2,
+            max_pages=100,
+            # Blog posts before tag and author listings
+            score_fn=lambda url, depth, parent: 1.0 if "/blog/" in url else 0.0,
+        )
+        # Interrupt and re-run: the crawl picks up from the last checkpoint in datacamp_frontier.sqlite
+        async for result in deep.crawl(["https://www.datacamp.com/blog/category/machine-learning"]):
+            status = "OK" if result.success else f"ERROR {result.error_message[:60]}"
+            print(f"[{status}] {result.url}")
+
+    print(frontier.stats())
+    frontier.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
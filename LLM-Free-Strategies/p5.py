@@ -0,0 +1,371 @@
+import re
+import json
+import time
+import asyncio
+import hashlib
+import itertools
+from typing import Any, Callable, Dict, List, Optional
+
+from cssselect import HTMLTranslator  # Not a crawl4ai dependency: pip install cssselect
+from lxml import etree
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy, JsonXPathExtractionStrategy
+
+# tag, #id, .class and [attr] / [attr=value] chained without combinators, e.g. "div.card[data-id]"
+SIMPLE_SELECTOR = re.compile(r"^(?P<tag>[a-zA-Z][\w-]*|\*)?(?P<rest>(?:[.#][\w-]+|\[[\w-]+(?:=[\"']?[^\"'\]]*[\"']?)?\])*)$")
+SELECTOR_PART = re.compile(r"([.#])([\w-]+)|\[([\w-]+)(?:=[\"']?([^\"'\]]*)[\"']?)?\]")
+# BeautifulSoup's get_text() leaves out the contents of these elements
+NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+_translator = HTMLTranslator()
+_plan_cache: Dict[str, "CompiledSchema"] = {}
+
+
+def _compile_matcher(selector: str) -> Optional[tuple]:
+    """
+    Turn a simple CSS selector into (tag, index class, predicate), or None if
+    it needs full CSS matching. The index class lets the single-pass walk only
+    test elements that carry it.
+    """
+    m = SIMPLE_SELECTOR.match(selector.strip())
+    if not m or not (m.group("tag") or m.group("rest")):
+        return None
+    tag = (m.group("tag") or "*").lower()
+    element_id, classes, attrs = None, set(), []
+    for kind, name, attr, value in SELECTOR_PART.findall(m.group("rest")):
+        if kind == "#":
+            element_id = name
+        elif kind == ".":
+            classes.add(name)
+        else:
+            attrs.append((attr, value or None))
+
+    def predicate(el) -> bool:
+        if element_id is not None and el.get("id") != element_id:
+            return False
+        if classes and not classes.issubset(el.get("class", "").split()):
+            return False
+        return all(el.get(a) is not None if v is None else el.get(a) == v for a, v in attrs)
+
+    return tag, (min(classes) if classes else None), predicate
+
+
+class _Field:
+    __slots__ = ("name", "type", "tag", "index_class", "matcher", "xpath", "first_only", "attribute", "pattern",
+                 "transform", "default", "subplan", "expression", "function")
+
+    def __init__(self, field: Dict[str, Any], to_xpath: Callable[[str], str], use_matchers: bool):
+        self.name = field["name"]
+        self.type = field["type"]
+        self.attribute = field.get("attribute")
+        self.pattern = re.compile(field["pattern"]) if "pattern" in field else None
+        self.transform = field.get("transform")
+        self.default = field.get("default")
+        self.expression = compile(field["expression"], "<schema>", "eval") if "expression" in field else None
+        self.function = field.get("function")
+        # Lists keep every match; everything else only needs the first one
+        self.first_only = self.type not in ("list", "nested_list")
+        self.tag = self.index_class = self.matcher = self.xpath = None
+        selector = field.get("selector")
+        if selector:
+            compiled = _compile_matcher(selector) if use_matchers else None
+            if compiled:
+                self.tag, self.index_class, self.matcher = compiled
+            else:
+                self.xpath = etree.XPath(to_xpath(selector))
+        self.subplan = None
+        if "fields" in field:
+            self.subplan = [_Field(f, to_xpath, use_matchers) for f in field["fields"]]
+
+
+class CompiledSchema:
+    """
+    A JSON extraction schema compiled once into reusable lxml objects.
+
+    Simple selectors (tag/class/id/attribute) become predicates that are all
+    checked in one walk over each base element's descendants. The walk stops
+    early once every single-valued field has found its first match. Other
+    selectors are compiled to XPath a single time. Like soupsieve, a CSS
+    selector may use the base element itself as context (`div > p` under a
+    base `div`); ancestors above the base element are not consulted. Plans are
+    cached by schema hash, so every strategy built from the same schema shares
+    one plan.
+    """
+
+    def __init__(self, schema: Dict[str, Any], schema_type: str = "css"):
+        if schema_type == "css":
+            # descendant-or-self so that combinators can start at the base element; _match drops the element itself
+            to_xpath = lambda sel: _translator.css_to_xpath(sel, prefix="descendant-or-self::")
+            base_xpath = _translator.css_to_xpath(schema["baseSelector"], prefix="descendant-or-self::")
+        else:
+            to_xpath = _relative_xpath
+            base_xpath = schema["baseSelector"]
+        use_matchers = schema_type == "css"
+        # Mirror each strategy's text getter: BeautifulSoup get_text(strip=True) vs XPath text()
+        self.text = _css_text if schema_type == "css" else _xpath_text
+        self.base_xpath = etree.XPath(base_xpath)
+        self.base_fields = [_Field(f, to_xpath, use_matchers) for f in schema.get("baseFields", [])]
+        self.fields = [_Field(f, to_xpath, use_matchers) for f in schema["fields"]]
+        self.verbose = False
+        self._groups: Dict[int, tuple] = {}
+        # Plain lxml elements iterate noticeably faster than lxml.html's HtmlElement
+        self._parser = etree.HTMLParser()
+
+    @classmethod
+    def get(cls, schema: Dict[str, Any], schema_type: str = "css") -> "CompiledSchema":
+        key = hashlib.sha256(json.dumps([schema_type, schema], sort_keys=True, default=repr).encode()).hexdigest()
+        plan = _plan_cache.get(key)
+        if plan is None:
+            plan = _plan_cache[key] = cls(schema, schema_type)
+        return plan
+
+    def extract(self, html_content: str) -> List[Dict[str, Any]]:
+        root = etree.fromstring(html_content, self._parser)
+        if root is None:  # Empty document
+            return []
+        results = []
+        for element in self.base_xpath(root):
+            item = {}
+            if self.base_fields:
+                matches = self._match(element, self.base_fields)
+                for field in self.base_fields:
+                    value = self._single_value(element, field, matches)
+                    if value is not None:
+                        item[field.name] = value
+            item.update(self._item(element, self.fields))
+            if item:
+                results.append(item)
+        return results
+
+    def _match(self, element, fields: List[_Field]) -> Dict[_Field, list]:
+        """Find the elements every field selects, in one pass over the subtree."""
+        groups = self._groups.get(id(fields))
+        if groups is None:
+            groups = self._groups[id(fields)] = self._group(fields)
+        xpath_fields, by_tag, by_class, any_tag, first_only_count, collect_all = groups
+
+        found: Dict[_Field, list] = {
+            field: [el for el in field.xpath(element) if el is not element] for field in xpath_fields
+        }
+        if not (by_tag or by_class or any_tag):
+            return found
+
+        first_only_left = first_only_count
+        for el in element.iterdescendants():
+            tag = el.tag
+            if not isinstance(tag, str):  # Comments and processing instructions
+                continue
+            candidates = itertools.chain(by_tag.get(tag, ()), any_tag)
+            if by_class:
+                class_attr = el.get("class")
+                if class_attr:
+                    # A repeated class token (class="a a") must not test its fields twice
+                    candidates = itertools.chain(
+                        candidates, *(by_class.get(c, ()) for c in dict.fromkeys(class_attr.split()))
+                    )
+            for field in candidates:
+                if field.first_only and field in found:
+                    continue
+                if field.matcher(el):
+                    found.setdefault(field, []).append(el)
+                    if field.first_only:
+                        first_only_left -= 1
+            if first_only_left == 0 and not collect_all:
+                break
+        return found
+
+    @staticmethod
+    def _group(fields: List[_Field]) -> tuple:
+        """Index a field list by tag and class for the single-pass walk."""
+        xpath_fields, by_tag, by_class, any_tag = [], {}, {}, []
+        first_only_count, collect_all = 0, False
+        for field in fields:
+            if field.xpath is not None:
+                xpath_fields.append(field)
+            elif field.matcher is not None:
+                if field.tag != "*":
+                    by_tag.setdefault(field.tag, []).append(field)
+                elif field.index_class:
+                    by_class.setdefault(field.index_class, []).append(field)
+                else:
+                    any_tag.append(field)
+                if field.first_only:
+                    first_only_count += 1
+                else:
+                    collect_all = True
+        return xpath_fields, by_tag, by_class, any_tag, first_only_count, collect_all
+
+    def _item(self, element, fields: List[_Field]) -> Dict[str, Any]:
+        matches = self._match(element, fields)
+        item = {}
+        for field in fields:
+            if field.type == "computed":
+                value = self._compute(item, field)
+            else:
+                try:
+                    value = self._field_value(element, field, matches)
+                except Exception as e:
+                    if self.verbose:
+                        print(f"Error extracting field {field.name}: {str(e)}")
+                    value = field.default
+            if value is not None:
+                item[field.name] = value
+        return item
+
+    def _field_value(self, element, field: _Field, matches) -> Any:
+        if field.type == "nested":
+            selected = matches.get(field)
+            return self._item(selected[0], field.subplan) if selected else {}
+        if field.type == "list":
+            return [self._list_item(el, field.subplan) for el in matches.get(field, [])]
+        if field.type == "nested_list":
+            return [self._item(el, field.subplan) for el in matches.get(field, [])]
+        return self._single_value(element, field, matches)
+
+    def _list_item(self, element, fields: List[_Field]) -> Dict[str, Any]:
+        matches = self._match(element, fields)
+        item = {}
+        for field in fields:
+            value = self._single_value(element, field, matches)
+            if value is not None:
+                item[field.name] = value
+        return item
+
+    def _single_value(self, element, field: _Field, matches) -> Any:
+        if field.matcher is not None or field.xpath is not None:
+            selected = matches.get(field)
+            if not selected:
+                return field.default
+            selected = selected[0]
+        else:
+            selected = element
+
+        value = None
+        if field.type == "text":
+            value = self.text(selected)
+        elif field.type == "attribute":
+            value = selected.get(field.attribute)
+        elif field.type == "html":
+            value = etree.tostring(selected, encoding="unicode", with_tail=False)
+        elif field.type == "regex":
+            match = field.pattern.search(self.text(selected))
+            value = match.group(1) if match else None
+
+        if field.transform == "lowercase":
+            value = value.lower()
+        elif field.transform == "uppercase":
+            value = value.upper()
+        elif field.transform == "strip":
+            value = value.strip()
+        return value if value is not None else field.default
+
+    def _compute(self, item: Dict[str, Any], field: _Field) -> Any:
+        try:
+            if field.expression is not None:
+                return eval(field.expression, {}, item)
+            if field.function is not None:
+                return field.function(item)
+        except Exception as e:
+            if self.verbose:
+                print(f"Error computing field {field.name}: {str(e)}")
+            return field.default
+
+
+def _css_text(element) -> str:
+    if element.tag in NON_TEXT_TAGS:  # Selected directly, a script still has its own text
+        return "".join(s.strip() for s in element.itertext())
+    parts = []
+    _collect_text(element, parts)
+    return "".join(parts)
+
+
+def _collect_text(element, parts: List[str]) -> None:
+    if element.text:
+        parts.append(element.text.strip())
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            _collect_text(child, parts)
+        if child.tail:
+            parts.append(child.tail.strip())
+
+
+def _xpath_text(element) -> str:
+    return "".join(element.itertext()).strip()
+
+
+def _relative_xpath(selector: str) -> str:
+    # Same CSS-ish fallback as JsonXPathExtractionStrategy, anchored at the base element
+    if "/" not in selector:
+        if " > " in selector:
+            selector = "//" + "/".join(selector.split(" > "))
+        else:
+            selector = "//" + "//".join(selector.split(" "))
+    return selector if selector.startswith(".") else "." + selector
+
+
+class CompiledJsonCssExtractionStrategy(JsonCssExtractionStrategy):
+    """JsonCssExtractionStrategy backed by a cached CompiledSchema plan."""
+
+    def __init__(self, schema: Dict[str, Any], **kwargs):
+        super().__init__(schema, **kwargs)
+        self.plan = CompiledSchema.get(schema, "css")
+
+    def extract(self, url: str, html_content: str, *q, **kwargs) -> List[Dict[str, Any]]:
+        return self.plan.extract(html_content)
+
+
+class CompiledJsonXPathExtractionStrategy(JsonXPathExtractionStrategy):
+    """JsonXPathExtractionStrategy backed by a cached CompiledSchema plan."""
+
+    def __init__(self, schema: Dict[str, Any], **kwargs):
+        super().__init__(schema, **kwargs)
+        self.plan = CompiledSchema.get(schema, "xpath")
+
+    def extract(self, url: str, html_content: str, *q, **kwargs) -> List[Dict[str, Any]]:
+        return self.plan.extract(html_content)
+
+
+async def main():
+    # Same product schema as content-selection/p4.py
+    schema = {
+        "name": "Products",
+        "baseSelector": ".thumbnail",
+        "fields": [
+            {"name": "product_name", "selector": ".title", "type": "text"},
+            {"name": "price", "selector": ".price", "type": "text"},
+            {"name": "description", "selector": ".description", "type": "text"},
+            {"name": "image_url", "selector": ".img-responsive", "type": "attribute", "attribute": "src"}
+        ]
+    }
+
+    # 1. A 2,000-row listing page, extracted without a browser
+    rows = "".join(
+        f"<div class='thumbnail'><img class='img-responsive' src='/img/{i}.png'>"
+        f"<h4 class='price'>${i}.99</h4><a class='title'>Product {i}</a>"
+        f"<p class='description'>Description of product {i}</p></div>"
+        for i in range(2000)
+    )
+    listing_html = f"<html><body><div class='row'>{rows}</div></body></html>"
+
+    for strategy in (JsonCssExtractionStrategy(schema), CompiledJsonCssExtractionStrategy(schema)):
+        started = time.perf_counter()
+        data = strategy.extract(None, listing_html)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{type(strategy).__name__}: {len(data)} items in {elapsed:.1f} ms")
+
+    # 2. Drop-in use inside a regular crawl
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        extraction_strategy=CompiledJsonCssExtractionStrategy(schema)
+    )
+    async with AsyncWebCrawler() as crawler:
+        result = await crawler.arun(url="https://webscraper.io/test-sites/e-commerce/allinone", config=config)
+        if result.success:
+            data = json.loads(result.extracted_content)
+            print(f"Found {len(data)} products")
+            print(json.dumps(data[0], indent=2) if data else "No data found")
+        else:
+            print("Crawl failed:", result.error_message)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,217 @@
+# Generating a schema costs an LLM call, but pages built from the same template share one schema.
+# SchemaRegistry fingerprints the structure of a page's repeated block and reuses the schema it
+# generated for any structurally identical page, so 10k product pages on one template cost one call.
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from lxml import html as lxml_html
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy, JsonXPathExtractionStrategy
+
+STRATEGIES = {"CSS": JsonCssExtractionStrategy, "XPATH": JsonXPathExtractionStrategy}
+IGNORED_TAGS = {"script", "style", "noscript", "template", "svg"}
+
+
+def _signature(element) -> str:
+    # Runs of digits are collapsed so generated classes (col-md-4, item-17) stay stable across pages
+    classes = sorted(re.sub(r"\d+", "0", c) for c in (element.get("class") or "").split())
+    return ".".join([element.tag] + classes)
+
+
+def _paths(element, prefix: str = "", depth: int = 0, max_depth: int = 8) -> set:
+    """Set of tag/class paths below `element`; text, attributes and repetition are ignored."""
+    paths = set()
+    if depth >= max_depth:
+        return paths
+    for child in element:
+        if not isinstance(child.tag, str) or child.tag in IGNORED_TAGS:
+            continue
+        path = f"{prefix}/{_signature(child)}"
+        paths.add(path)
+        paths |= _paths(child, path, depth + 1, max_depth)
+    return paths
+
+
+def find_repeated_block(root) -> Optional[Tuple[Any, str, List[Any]]]:
+    """
+    Find the container whose children repeat the same tag/class signature most often.
+
+    Returns (container, block_signature, blocks), or None if nothing repeats
+    (e.g. a single product detail page).
+    """
+    best, best_score = None, 0
+    for parent in root.iter():
+        if not isinstance(parent.tag, str) or parent.tag in IGNORED_TAGS:
+            continue
+        children = [c for c in parent if isinstance(c.tag, str) and c.tag not in IGNORED_TAGS]
+        if len(children) < 2:
+            continue
+        signature, count = Counter(_signature(c) for c in children).most_common(1)[0]
+        if count < 2:
+            continue
+        blocks = [c for c in children if _signature(c) == signature]
+        # Prefer many repetitions of rich blocks over long runs of bare <li>/<p>
+        score = count * len(_paths(blocks[0]) or {""})
+        if score > best_score:
+            best, best_score = (parent, signature, blocks), score
+    return best
+
+
+def structure_fingerprint(page_html: str, sample_blocks: int = 5) -> str:
+    """Hash of the repeated block's skeleton, identical for pages rendered from the same template."""
+    root = lxml_html.fromstring(page_html)
+    found = find_repeated_block(root)
+    if found is None:
+        skeleton = {"page": sorted(_paths(root, max_depth=6))}
+    else:
+        container, signature, blocks = found
+        # The union over a few blocks keeps optional fields (a missing badge, say) from changing the hash
+        paths = set()
+        for block in blocks[:sample_blocks]:
+            paths |= _paths(block)
+        skeleton = {"container": _signature(container), "block": signature, "paths": sorted(paths)}
+    return hashlib.sha256(json.dumps(skeleton, sort_keys=True).encode()).hexdigest()
+
+
+def sample_html(page_html: str, max_blocks: int = 3) -> str:
+    """The repeated block's container cut down to a few blocks; a much smaller prompt than the whole page."""
+    root = lxml_html.fromstring(page_html)
+    found = find_repeated_block(root)
+    if found is None:
+        return page_html
+    container, _, blocks = found
+    for block in blocks[max_blocks:]:
+        container.remove(block)
+    return lxml_html.tostring(container, encoding="unicode")
+
+
+def validate_schema(schema: Dict[str, Any], page_html: str, schema_type: str = "CSS") -> List[Dict[str, Any]]:
+    """Run `schema` on `page_html` locally and raise if it finds nothing."""
+    items = STRATEGIES[schema_type.upper()](schema).extract(None, page_html)
+    if not any(any(value not in (None, "", [], {}) for value in item.values()) for item in items):
+        raise ValueError(f"Schema '{schema.get('name')}' extracted no data from the sample page")
+    return items
+
+
+class SchemaRegistry:
+    """
+    Persistent map from page-structure fingerprint to a validated extraction schema.
+
+    `get_schema` only calls `generate_schema` on a miss. Candidate schemas are
+    checked against the page they were generated from, and one that extracts
+    nothing is never stored. Concurrent callers needing the same missing
+    schema wait for a single LLM call instead of each making their own.
+    """
+
+    def __init__(self, db_path: str = "schemas.sqlite", max_attempts: int = 2):
+        self.max_attempts = max_attempts
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS schemas (
+                key TEXT PRIMARY KEY,
+                fingerprint TEXT NOT NULL,
+                schema_type TEXT NOT NULL,
+                schema TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                hits INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        self._db_lock = threading.Lock()
+        self._inflight: Dict[str, threading.Lock] = {}
+        self.llm_calls = 0
+
+    @staticmethod
+    def _key(fingerprint: str, schema_type: str, query: Optional[str]) -> str:
+        return hashlib.sha256(f"{fingerprint}|{schema_type}|{query or ''}".encode()).hexdigest()
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._db_lock:
+            row = self.db.execute("SELECT schema FROM schemas WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self.db.execute("UPDATE schemas SET hits = hits + 1 WHERE key = ?", (key,))
+            self.db.commit()
+        return json.loads(row[0])
+
+    def _store(self, key: str, fingerprint: str, schema_type: str, schema: Dict[str, Any]) -> None:
+        with self._db_lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO schemas (key, fingerprint, schema_type, schema, created_at) VALUES (?, ?, ?, ?, ?)",
+                (key, fingerprint, schema_type, json.dumps(schema), time.time()),
+            )
+            self.db.commit()
+
+    def get_schema(self, page_html: str, schema_type: str = "CSS", query: str = None, **llm_kwargs) -> Dict[str, Any]:
+        """
+        Return a schema for `page_html`, generating one only if no structurally identical page has been seen.
+
+        `llm_kwargs` (provider, api_token, ...) go to `generate_schema` unchanged.
+        """
+        schema_type = schema_type.upper()
+        fingerprint = structure_fingerprint(page_html)
+        key = self._key(fingerprint, schema_type, query)
+        schema = self._lookup(key)
+        if schema is not None:
+            return schema
+
+        with self._db_lock:
+            inflight = self._inflight.setdefault(key, threading.Lock())
+        with inflight:
+            schema = self._lookup(key)  # Generated by another caller while we waited
+            if schema is not None:
+                return schema
+
+            strategy_cls = STRATEGIES[schema_type]
+            if query is not None:
+                llm_kwargs["query"] = query
+            error = None
+            try:
+                for _ in range(self.max_attempts):
+                    self.llm_calls += 1
+                    candidate = strategy_cls.generate_schema(sample_html(page_html), schema_type=schema_type, **llm_kwargs)
+                    try:
+                        validate_schema(candidate, page_html, schema_type)
+                    except Exception as e:
+                        error = e
+                        continue
+                    self._store(key, fingerprint, schema_type, candidate)
+                    return candidate
+            finally:
+                with self._db_lock:
+                    self._inflight.pop(key, None)
+            raise ValueError(f"No usable schema after {self.max_attempts} attempts: {error}")
+
+
+# Pages rendered from one template, with different products on each
+def product_page(page: int) -> str:
+    cards = "".join(
+        f"""<div class="product-card item-{i}">
+            <h2 class="title">Laptop {page}-{i}</h2>
+            <div class="price">${500 + i * 10}.99</div>
+            <div class="specs"><ul><li>{8 * (i % 4 + 1)}GB RAM</li><li>1TB SSD</li></ul></div>
+        </div>"""
+        for i in range(12)
+    )
+    return f"<html><body><div class='grid'>{cards}</div></body></html>"
+
+
+registry = SchemaRegistry("schemas.sqlite")
+
+for page in range(1, 101):
+    schema = registry.get_schema(
+        product_page(page),
+        schema_type="css",
+        llm_provider="openai/gpt-4o",  # Forwarded to generate_schema as in p4.py
+        api_token=os.getenv("OPENAI_API_KEY")
+    )
+    items = JsonCssExtractionStrategy(schema).extract(None, product_page(page))
+
+print(f"100 pages, {registry.llm_calls} LLM call(s)")
+print(json.dumps(items[:2], indent=2))
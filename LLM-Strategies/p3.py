@@ -0,0 +1,287 @@
+# Import required libraries
+import os                  # For accessing environment variables
+import asyncio            # For handling asynchronous operations
+import functools         # Keeps the stock __init__ signature
+import json              # For JSON parsing and handling
+import random            # For retry jitter
+import threading         # The rate limiter is shared across event loops and threads
+import time              # For rate limiting clocks
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel  # For data validation and schema definition
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode  # Core crawler components
+from crawl4ai.extraction_strategy import LLMExtractionStrategy  # LLM-based extraction
+from crawl4ai.models import TokenUsage
+from crawl4ai.prompts import (
+    PROMPT_EXTRACT_BLOCKS, PROMPT_EXTRACT_BLOCKS_WITH_INSTRUCTION, PROMPT_EXTRACT_SCHEMA_WITH_INSTRUCTION
+)
+from crawl4ai.utils import (
+    escape_json_string, extract_xml_data, sanitize_html, sanitize_input_encode, split_and_parse_json_objects
+)
+
+try:
+    from crawl4ai import LLMConfig  # crawl4ai 0.5+ takes the provider settings as an LLMConfig
+except ImportError:
+    LLMConfig = None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that hands out reservations instead of blocking.
+
+    `reserve(n)` takes `n` tokens, letting the balance go negative, and
+    returns how long the caller must wait before using them. Waiting is left
+    to the caller, so one bucket can be shared by several event loops.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.tokens = per_minute
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= min(amount, self.capacity)  # A request larger than the budget waits for a full bucket
+            return max(0.0, -self.tokens / self.rate)
+
+    def adjust(self, amount: float) -> None:
+        """Correct an earlier estimate once the real usage is known (negative refunds tokens)."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens - amount)
+
+
+class ProviderLimiter:
+    """Requests-per-minute and tokens-per-minute budgets for one provider."""
+
+    def __init__(self, rpm: int = None, tpm: int = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    async def acquire(self, estimated_tokens: int) -> None:
+        wait = 0.0
+        if self.requests:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated_tokens: int, actual_tokens: int) -> None:
+        if self.tokens:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+
+# One limiter per provider and limits, shared by every strategy instance in the process
+_limiters: Dict[Tuple[str, Optional[int], Optional[int]], ProviderLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def provider_limiter(provider: str, rpm: int = None, tpm: int = None) -> ProviderLimiter:
+    """
+    The limiter for these budgets. Strategies that pass the same provider and
+    limits share one; different limits get their own, so a later instance's
+    rpm/tpm is never ignored.
+    """
+    key = (provider, rpm, tpm)
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = ProviderLimiter(rpm, tpm)
+        return _limiters[key]
+
+
+# LLMExtractionStrategy.__setattr__ inspects the signature of self.__init__, so subclasses
+# that add keyword arguments decorate their __init__ with this to keep the stock one
+keep_stock_signature = functools.wraps(LLMExtractionStrategy.__init__, assigned=(), updated=())
+
+
+def llm_settings(strategy: LLMExtractionStrategy) -> Tuple[str, Optional[str], Optional[str]]:
+    """Provider, API key and endpoint: 0.5+ keeps them on llm_config, 0.4 on the strategy itself."""
+    llm_config = getattr(strategy, "llm_config", None)
+    if llm_config is not None:
+        return llm_config.provider, llm_config.api_token, llm_config.base_url
+    return strategy.provider, strategy.api_token, strategy.api_base or strategy.base_url
+
+
+class ScheduledLLMExtractionStrategy(LLMExtractionStrategy):
+    """
+    LLMExtractionStrategy that sends chunks concurrently through an async scheduler.
+
+    Small adjacent chunks are packed together up to `chunk_token_threshold`.
+    Requests wait on the provider's RPM/TPM budgets and failed requests are
+    retried with full-jitter exponential backoff. Results come back in chunk
+    order, whatever order the requests finish in. Extra keyword arguments:
+    rpm, tpm, max_concurrency, max_retries, retry_base_delay, retry_max_delay.
+    """
+
+    @keep_stock_signature
+    def __init__(self, *args, rpm: int = None, tpm: int = None, max_concurrency: int = 16,
+                 max_retries: int = 5, retry_base_delay: float = 1.0, retry_max_delay: float = 60.0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limiter = provider_limiter(llm_settings(self)[0], rpm, tpm)
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self._usage_lock = threading.Lock()
+
+    def _estimate_tokens(self, text: str) -> int:
+        return int(len(text.split()) * self.word_token_rate)
+
+    def _pack(self, sections: List[str]) -> List[str]:
+        """Combine adjacent small sections so each request carries up to the token threshold."""
+        packed, current, current_tokens = [], [], 0
+        for section in sections:
+            tokens = self._estimate_tokens(section)
+            if current and current_tokens + tokens > self.chunk_token_threshold:
+                packed.append("\n\n".join(current))
+                current, current_tokens = [], 0
+            current.append(section)
+            current_tokens += tokens
+        if current:
+            packed.append("\n\n".join(current))
+        return packed
+
+    def _prompt(self, url: str, html: str) -> str:
+        # Same prompt selection as LLMExtractionStrategy.extract
+        variable_values = {"URL": url, "HTML": escape_json_string(sanitize_html(html))}
+        prompt = PROMPT_EXTRACT_BLOCKS
+        if self.instruction:
+            variable_values["REQUEST"] = self.instruction
+            prompt = PROMPT_EXTRACT_BLOCKS_WITH_INSTRUCTION
+        if self.extract_type == "schema" and self.schema:
+            variable_values["SCHEMA"] = json.dumps(self.schema, indent=2)
+            prompt = PROMPT_EXTRACT_SCHEMA_WITH_INSTRUCTION
+        for variable, value in variable_values.items():
+            prompt = prompt.replace("{" + variable + "}", value)
+        return prompt
+
+    def _parse(self, content: str) -> List[Dict[str, Any]]:
+        try:
+            blocks = json.loads(extract_xml_data(["blocks"], content)["blocks"])
+            for block in blocks:
+                block["error"] = False
+        except Exception:
+            blocks, unparsed = split_and_parse_json_objects(content)
+            if unparsed:
+                blocks.append({"index": 0, "error": True, "tags": ["error"], "content": unparsed})
+        return blocks
+
+    def _track_usage(self, response) -> None:
+        usage = TokenUsage(
+            completion_tokens=response.usage.completion_tokens,
+            prompt_tokens=response.usage.prompt_tokens,
+            total_tokens=response.usage.total_tokens,
+        )
+        with self._usage_lock:  # Requests finish concurrently
+            self.usages.append(usage)
+            self.total_usage.completion_tokens += usage.completion_tokens
+            self.total_usage.prompt_tokens += usage.prompt_tokens
+            self.total_usage.total_tokens += usage.total_tokens
+
+    async def aextract(self, url: str, ix: int, html: str) -> List[Dict[str, Any]]:
+        """Async counterpart of `extract` for a single chunk."""
+        from litellm import acompletion
+        from litellm.exceptions import (
+            APIConnectionError, InternalServerError, RateLimitError, ServiceUnavailableError, Timeout
+        )
+        retryable = (RateLimitError, APIConnectionError, InternalServerError, ServiceUnavailableError, Timeout)
+
+        prompt = self._prompt(url, html)
+        provider, api_token, base_url = llm_settings(self)
+        args = {"temperature": 0.01, "api_key": api_token, "base_url": base_url}
+        args.update(self.extra_args)
+        # Budget for the prompt plus the largest answer the provider may send back
+        estimated = self._estimate_tokens(prompt) + int(args.get("max_tokens", 0))
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            try:
+                response = await acompletion(model=provider, messages=[{"role": "user", "content": prompt}], **args)
+                break
+            except retryable as e:
+                self.limiter.settle(estimated, 0)  # The failed request did not use its tokens
+                if attempt == self.max_retries:
+                    raise
+                delay = random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * 2 ** attempt))
+                if self.verbose:
+                    print(f"[LOG] Chunk {ix} of {url} failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+        self.limiter.settle(estimated, response.usage.total_tokens)
+        self._track_usage(response)
+        return self._parse(response.choices[0].message.content)
+
+    async def arun(self, url: str, sections: List[str]) -> List[Dict[str, Any]]:
+        """Extract every chunk concurrently and return the blocks in chunk order."""
+        merged = self._merge(sections, self.chunk_token_threshold,
+                             overlap=int(self.chunk_token_threshold * self.overlap_rate))
+        chunks = self._pack(merged)
+        slots = asyncio.Semaphore(self.max_concurrency)
+
+        async def extract_chunk(ix: int, chunk: str):
+            async with slots:
+                try:
+                    return await self.aextract(url, ix, sanitize_input_encode(chunk))
+                except Exception as e:
+                    return [{"index": ix, "error": True, "tags": ["error"], "content": str(e)}]
+
+        results = await asyncio.gather(*(extract_chunk(ix, chunk) for ix, chunk in enumerate(chunks)))
+        return [block for blocks in results for block in blocks]
+
+    def run(self, url: str, sections: List[str]) -> List[Dict[str, Any]]:
+        # The crawler calls run() synchronously from inside its event loop, so the
+        # scheduler gets a loop of its own on a helper thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, self.arun(url, sections)).result()
+
+
+# Define the data structure for product information
+class Product(BaseModel):
+    name: str    # Store product name as string
+    price: str   # Store price as string to handle various formats
+
+async def main():
+    # 1. Same setup as p1.py, plus the provider's rate limits
+    provider = {"provider": "openai/gpt-4o-mini", "api_token": os.getenv('OPENAI_API_KEY')}
+    llm_strategy = ScheduledLLMExtractionStrategy(
+        **({"llm_config": LLMConfig(**provider)} if LLMConfig else provider),  # 0.4 takes them directly
+        schema=Product.model_json_schema(),
+        extraction_type="schema",
+        instruction="Extract all product objects with 'name' and 'price' from the content.",
+        chunk_token_threshold=1000,
+        overlap_rate=0.0,
+        apply_chunking=True,
+        input_format="markdown",
+        extra_args={"temperature": 0.0, "max_tokens": 800},
+        rpm=500,                # Requests per minute allowed by the account tier
+        tpm=200_000,            # Tokens per minute allowed by the account tier
+        max_concurrency=32      # Chunks in flight at once
+    )
+
+    # 2. Build the crawler config
+    crawl_config = CrawlerRunConfig(
+        extraction_strategy=llm_strategy,
+        cache_mode=CacheMode.BYPASS
+    )
+
+    async with AsyncWebCrawler(config=BrowserConfig(headless=True)) as crawler:
+        # 3. All chunks of the page are extracted concurrently
+        result = await crawler.arun(
+            url="https://example.com/products",
+            config=crawl_config
+        )
+
+        if result.success:
+            data = json.loads(result.extracted_content)
+            print("Extracted items:", data)
+            llm_strategy.show_usage()
+        else:
+            print("Error:", result.error_message)
+
+if __name__ == "__main__":
+    asyncio.run(main())
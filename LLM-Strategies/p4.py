@@ -0,0 +1,201 @@
+# Import required libraries
+import os                  # For accessing environment variables
+import asyncio            # For handling asynchronous operations
+import hashlib           # Cache keys
+import json              # For JSON parsing and handling
+import sqlite3           # Persistent response cache
+import threading         # LLMExtractionStrategy extracts chunks from several threads
+import time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field  # For data validation and schema definition
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode  # Core crawler components
+from crawl4ai.extraction_strategy import LLMExtractionStrategy  # LLM-based extraction
+from crawl4ai.utils import sanitize_html
+from p3 import LLMConfig, keep_stock_signature, llm_settings  # Shared with the scheduled strategy
+
+
+class LLMResponseCache:
+    """
+    SQLite cache of parsed LLM extraction results, one row per prompt fingerprint.
+
+    Rows older than `ttl` seconds are treated as misses. Once stored results
+    exceed `max_bytes`, the least recently used rows are evicted. Safe to
+    share between threads.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 7 * 24 * 3600, max_bytes: int = 256 << 20):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                blocks TEXT NOT NULL,
+                prompt_tokens INTEGER NOT NULL,
+                completion_tokens INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS responses_by_access ON responses (last_access);
+        """)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.db.execute(
+                "SELECT blocks, prompt_tokens, completion_tokens, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or time.time() - row[3] > self.ttl:
+                return None
+            self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (time.time(), key))
+            self.db.commit()
+        return {"blocks": json.loads(row[0]), "prompt_tokens": row[1], "completion_tokens": row[2]}
+
+    def put(self, key: str, blocks: List[Dict[str, Any]], prompt_tokens: int, completion_tokens: int) -> None:
+        data = json.dumps(blocks)
+        now = time.time()
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, data, prompt_tokens, completion_tokens, len(data), now, now),
+            )
+            self._evict()
+            self.db.commit()
+
+    def _evict(self) -> None:
+        self.db.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl,))
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+
+# The usage entry recorded by the current thread's last LLM call
+_last_usage = threading.local()
+
+
+class _UsageLog(list):
+    def append(self, usage):
+        super().append(usage)
+        _last_usage.value = usage
+
+
+class CachedLLMExtractionStrategy(LLMExtractionStrategy):
+    """
+    LLMExtractionStrategy that answers unchanged chunks from an LLMResponseCache.
+
+    A chunk's key covers provider, model, endpoint, instruction, schema,
+    extraction type, extra_args, JSON mode and the hash of the chunk text. Any change to
+    any of them is a miss. Responses containing error blocks are never cached.
+    """
+
+    @keep_stock_signature
+    def __init__(self, *args, cache: LLMResponseCache = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.cache = cache
+        self.usages = _UsageLog()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.saved_prompt_tokens = 0
+        self.saved_completion_tokens = 0
+        self._stats_lock = threading.Lock()
+
+    def cache_key(self, html: str) -> str:
+        full_provider, _, endpoint = llm_settings(self)
+        provider, _, model = full_provider.partition("/")
+        fingerprint = json.dumps({
+            "provider": provider,
+            "model": model,
+            "endpoint": endpoint,
+            "instruction": self.instruction,
+            "schema": self.schema,
+            "extraction_type": self.extract_type,
+            "extra_args": self.extra_args,
+            "force_json_response": getattr(self, "force_json_response", False),  # crawl4ai 0.5+
+            # Hash what the prompt actually contains, so markup the prompt strips doesn't bust the cache
+            "chunk": hashlib.sha256(sanitize_html(html).encode("utf-8")).hexdigest(),
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+    def extract(self, url: str, ix: int, html: str) -> List[Dict[str, Any]]:
+        if self.cache is None:
+            return super().extract(url, ix, html)
+
+        key = self.cache_key(html)
+        cached = self.cache.get(key)
+        if cached is not None:
+            with self._stats_lock:
+                self.cache_hits += 1
+                self.saved_prompt_tokens += cached["prompt_tokens"]
+                self.saved_completion_tokens += cached["completion_tokens"]
+            if self.verbose:
+                print(f"[LOG] Cache hit for {url} - block index: {ix}")
+            return cached["blocks"]
+
+        _last_usage.value = None
+        blocks = super().extract(url, ix, html)
+        with self._stats_lock:
+            self.cache_misses += 1
+        usage = _last_usage.value
+        if usage is not None and not any(block.get("error") for block in blocks):
+            self.cache.put(key, blocks, usage.prompt_tokens, usage.completion_tokens)
+        return blocks
+
+    def show_usage(self) -> None:
+        super().show_usage()
+        saved = self.saved_prompt_tokens + self.saved_completion_tokens
+        print("\n=== Response Cache ===")
+        print(f"{'Hits':<15} {self.cache_hits:>12,}")
+        print(f"{'Misses':<15} {self.cache_misses:>12,}")
+        print(f"{'Prompt saved':<15} {self.saved_prompt_tokens:>12,}")
+        print(f"{'Completion saved':<15} {self.saved_completion_tokens:>12,}")
+        print(f"{'Total saved':<15} {saved:>12,}")
+
+
+class OpenAIModelFee(BaseModel):
+    model_name: str = Field(..., description="Name of the OpenAI model.")
+    input_fee: str = Field(..., description="Fee for input token for the OpenAI model.")
+    output_fee: str = Field(..., description="Fee for output token for the OpenAI model.")
+
+async def main():
+    # 1. The cache outlives the process, so re-runs only pay for chunks that changed
+    cache = LLMResponseCache("llm_cache.sqlite", ttl=3 * 24 * 3600, max_bytes=64 << 20)
+
+    # 2. Same pricing extraction as quickstart/p5.py, with the cache attached
+    provider = {"provider": "openai/gpt-4o-mini", "api_token": os.getenv("OPENAI_API_KEY")}
+    llm_strategy = CachedLLMExtractionStrategy(
+        **({"llm_config": LLMConfig(**provider)} if LLMConfig else provider),  # 0.4 takes them directly
+        schema=OpenAIModelFee.model_json_schema(),
+        extraction_type="schema",
+        instruction="From the crawled content, extract all mentioned model names along with their fees for input and output tokens.",
+        extra_args={"temperature": 0, "max_tokens": 2000},
+        cache=cache
+    )
+    crawl_config = CrawlerRunConfig(
+        extraction_strategy=llm_strategy,
+        cache_mode=CacheMode.BYPASS,  # Fetch fresh HTML; only the LLM calls are cached
+        word_count_threshold=1
+    )
+
+    async with AsyncWebCrawler(config=BrowserConfig(headless=True)) as crawler:
+        # 3. Crawl twice: the second run is served from the cache
+        for run in (1, 2):
+            result = await crawler.arun(url="https://openai.com/api/pricing/", config=crawl_config)
+            if result.success:
+                print(f"Run {run}: {len(json.loads(result.extracted_content))} items")
+            else:
+                print("Error:", result.error_message)
+
+        # 4. Spend and savings side by side
+        llm_strategy.show_usage()
+
+if __name__ == "__main__":
+    asyncio.run(main())
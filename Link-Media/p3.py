@@ -0,0 +1,206 @@
+import asyncio
+import contextvars
+import re
+from dataclasses import dataclass, field, replace
+from typing import Dict, FrozenSet, Optional, Sequence
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+from crawl4ai.models import CrawlResult
+
+# Ad, analytics and tag-manager hosts; subdomains match too
+TRACKER_DOMAINS = (
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "googletagservices.com", "adservice.google.com", "amazon-adsystem.com",
+    "facebook.net", "connect.facebook.net", "scorecardresearch.com", "quantserve.com", "chartbeat.com",
+    "chartbeat.net", "hotjar.com", "segment.io", "segment.com", "mixpanel.com", "taboola.com",
+    "outbrain.com", "criteo.com", "criteo.net", "adnxs.com", "rubiconproject.com", "pubmatic.com",
+    "moatads.com", "newrelic.com", "nr-data.net", "optimizely.com", "parsely.com", "permutive.com",
+)
+
+# Median transfer size per resource type (HTTP Archive), used to estimate what a blocked request would have cost
+ESTIMATED_BYTES = {
+    "image": 25_000, "media": 500_000, "font": 30_000, "stylesheet": 15_000,
+    "script": 20_000, "xhr": 3_000, "fetch": 3_000, "other": 2_000,
+}
+
+
+@dataclass(frozen=True)
+class BlockingProfile:
+    """
+    What a page may not load.
+
+    A request is blocked when its resource type is in `resource_types`, its
+    host is (a subdomain of) one of `domains`, or its URL matches one of
+    `url_patterns`. `allow_patterns` wins over all three. The page's own
+    document is never blocked. `domain_overrides` maps a site (its
+    subdomains included) to the profile to use on its pages instead.
+    """
+
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    domains: Sequence[str] = ()
+    url_patterns: Sequence[str] = ()
+    allow_patterns: Sequence[str] = ()
+    domain_overrides: Dict[str, "BlockingProfile"] = field(default_factory=dict, hash=False)
+
+    def __post_init__(self):
+        domains = "|".join(re.escape(d) for d in self.domains)
+        object.__setattr__(self, "_domain_re", re.compile(rf"(^|\.)({domains})$") if domains else None)
+        object.__setattr__(self, "_url_re", re.compile("|".join(self.url_patterns)) if self.url_patterns else None)
+        object.__setattr__(self, "_allow_re", re.compile("|".join(self.allow_patterns)) if self.allow_patterns else None)
+
+    def for_page(self, page_url: str) -> "BlockingProfile":
+        host = urlparse(page_url).hostname or ""
+        for domain, profile in self.domain_overrides.items():
+            if host == domain or host.endswith("." + domain):
+                return profile
+        return self
+
+    def blocks(self, url: str, resource_type: str) -> bool:
+        if self._allow_re and self._allow_re.search(url):
+            return False
+        if resource_type in self.resource_types:
+            return True
+        if self._domain_re and self._domain_re.search(urlparse(url).hostname or ""):
+            return True
+        return bool(self._url_re and self._url_re.search(url))
+
+    def with_overrides(self, domain_overrides: Dict[str, "BlockingProfile"]) -> "BlockingProfile":
+        """Copy of this profile with extra per-domain profiles."""
+        return replace(self, domain_overrides={**self.domain_overrides, **domain_overrides})
+
+
+ALLOW_ALL = BlockingProfile("allow_all")
+NO_TRACKERS = BlockingProfile("no_trackers", domains=TRACKER_DOMAINS, url_patterns=(r"/(ads|adserver|pixel|beacon)[/?]",))
+NO_MEDIA = BlockingProfile("no_media", frozenset({"image", "media", "font"}), TRACKER_DOMAINS, NO_TRACKERS.url_patterns)
+HTML_ONLY = BlockingProfile("html_only", frozenset({"image", "media", "font", "stylesheet", "texttrack", "eventsource",
+                                                   "websocket", "manifest"}), TRACKER_DOMAINS, NO_TRACKERS.url_patterns)
+
+
+class BlockingStats(BaseModel):
+    profile: str
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: Dict[str, int] = {}
+    estimated_bytes_saved: int = 0
+
+
+class BlockingCrawlResult(CrawlResult):
+    blocking: Optional[BlockingStats] = None
+
+
+_current_stats: contextvars.ContextVar[Optional[BlockingStats]] = contextvars.ContextVar("blocking_stats", default=None)
+_current_profile: contextvars.ContextVar[Optional[BlockingProfile]] = contextvars.ContextVar("blocking_profile",
+                                                                                           default=None)
+
+
+class BlockingCrawlerStrategy(AsyncPlaywrightCrawlerStrategy):
+    """
+    Playwright strategy that aborts unwanted requests at the route level.
+
+    `profile` applies to every crawl, as a browser-level setting.
+    `BlockingCrawler.arun(..., blocking_profile=...)` replaces it for a
+    single run. The route is installed
+    on the page from the `on_page_context_created` hook, which is
+    intercepted in `execute_hook`, so a hook set with `set_hook` still runs.
+    Counts go to the BlockingStats of the current arun.
+    """
+
+    def __init__(self, *args, profile: BlockingProfile = NO_TRACKERS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.profile = profile
+
+    async def execute_hook(self, hook_type: str, *args, **kwargs):
+        if hook_type == "on_page_context_created":
+            config = kwargs.get("config")
+            profile = _current_profile.get() or self.profile
+            await self._install_route(args[0] if args else kwargs.get("page"), profile.for_page(config.url or ""))
+        return await super().execute_hook(hook_type, *args, **kwargs)
+
+    async def _install_route(self, page, profile: BlockingProfile) -> None:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.profile = profile.name
+
+        async def handle(route):
+            request = route.request
+            is_main_document = request.is_navigation_request() and request.frame.parent_frame is None
+            if not is_main_document and profile.blocks(request.url, request.resource_type):
+                if stats is not None:
+                    stats.blocked_requests += 1
+                    stats.blocked_by_type[request.resource_type] = stats.blocked_by_type.get(request.resource_type, 0) + 1
+                    stats.estimated_bytes_saved += ESTIMATED_BYTES.get(request.resource_type, ESTIMATED_BYTES["other"])
+                await route.abort("blockedbyclient")
+            else:
+                if stats is not None:
+                    stats.allowed_requests += 1
+                await route.continue_()
+
+        # A reused session page keeps its route; replace it so profiles never stack.
+        # A profile that blocks nothing installs no route, so its requests skip the Python round trip.
+        previous = getattr(page, "_blocking_route", None)
+        if previous is not None:
+            await page.unroute("**/*", previous)
+        if profile.resource_types or profile.domains or profile.url_patterns:
+            await page.route("**/*", handle)
+            page._blocking_route = handle
+        else:
+            page._blocking_route = None
+
+
+class BlockingCrawler(AsyncWebCrawler):
+    """
+    AsyncWebCrawler whose results carry `blocking` stats; arun_many goes through `arun` too.
+
+    `arun` takes an optional `blocking_profile` that replaces the strategy's
+    profile for that run only.
+    """
+
+    def __init__(self, *args, profile: BlockingProfile = NO_TRACKERS, **kwargs):
+        if kwargs.get("crawler_strategy") is None:
+            kwargs["crawler_strategy"] = BlockingCrawlerStrategy(browser_config=kwargs.get("config"), profile=profile)
+        super().__init__(*args, **kwargs)
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None,
+                   blocking_profile: Optional[BlockingProfile] = None, **kwargs) -> BlockingCrawlResult:
+        stats = BlockingStats(profile="")
+        stats_token = _current_stats.set(stats)
+        profile_token = _current_profile.set(blocking_profile or _current_profile.get())
+        try:
+            result = await super().arun(url, config=config, **kwargs)
+        finally:
+            _current_profile.reset(profile_token)
+            _current_stats.reset(stats_token)
+        # Built through __init__ so private state such as the markdown result is restored
+        return BlockingCrawlResult(**result.model_dump(), blocking=stats if stats.profile else None)
+
+
+async def main():
+    # News sites need the HTML only; the blog keeps its images because we want them in result.media
+    profile = HTML_ONLY.with_overrides({"datacamp.com": NO_TRACKERS})
+
+    async with BlockingCrawler(config=BrowserConfig(headless=True), profile=profile) as crawler:
+        for url in ("https://www.nbcnews.com/business", "https://www.datacamp.com/blog/category/machine-learning"):
+            result = await crawler.arun(url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+            if not result.success:
+                print("[ERROR]", url, result.error_message)
+                continue
+            stats = result.blocking
+            print(f"[OK] {url} ({stats.profile}): {stats.blocked_requests} blocked, {stats.allowed_requests} allowed, "
+                  f"~{stats.estimated_bytes_saved / 2**20:.1f} MB saved")
+            print("     by type:", stats.blocked_by_type)
+            print("     images in result:", len(result.media.get("images", [])))
+
+        # A single run can switch profiles without touching the crawler
+        result = await crawler.arun(
+            "https://www.nbcnews.com/business",
+            config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS),
+            blocking_profile=ALLOW_ALL
+        )
+        print("Profile for this run:", result.blocking.profile if result.blocking else None)
+
+if __name__ == "__main__":
+    asyncio.run(main())
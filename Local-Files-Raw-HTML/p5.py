@@ -0,0 +1,181 @@
+import asyncio
+import importlib.util
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import httpx  # pip install "httpx[http2,brotli]" for HTTP/2 and brotli decoding
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CacheMode
+from crawl4ai.async_configs import CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy, AsyncPlaywrightCrawlerStrategy
+from crawl4ai.models import AsyncCrawlResponse
+
+# HTTP/2 needs the optional h2 package: pip install "httpx[http2]"
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Markers of pages that render their content with JavaScript
+SPA_ROOT = re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt)["\'][^>]*>\s*</div>', re.I)
+NOSCRIPT_WARNING = re.compile(r"<noscript[^>]*>[^<]*(enable|requires?) javascript", re.I)
+CHALLENGE_PAGE = re.compile(r"cf-browser-verification|cf-chl-|challenge-platform", re.I)
+TAGS = re.compile(r"<script\b.*?</script>|<style\b.*?</style>|<[^>]+>", re.I | re.S)
+
+
+def needs_javascript(html: str, status_code: int) -> bool:
+    """Guess whether a page fetched over plain HTTP still needs a browser to render."""
+    if status_code in (403, 503) and CHALLENGE_PAGE.search(html):
+        return True
+    if SPA_ROOT.search(html) or NOSCRIPT_WARNING.search(html):
+        return True
+    # Almost no visible text but plenty of markup: content is likely injected by scripts
+    visible_text = TAGS.sub(" ", html).split()
+    return len(visible_text) < 30 and len(html) > 2000
+
+
+class HttpFastPathStrategy(AsyncCrawlerStrategy):
+    """
+    Crawler strategy that fetches pages with a pooled HTTP client and only
+    falls back to Playwright when a page needs JavaScript.
+
+    The HTML goes through the same scraping/markdown/extraction pipeline as a
+    browser crawl, since AsyncWebCrawler only sees the returned AsyncCrawlResponse.
+    `domain_hints` maps a domain to "http" or "browser" to skip the heuristics;
+    domains that once needed the browser are remembered for the rest of the run.
+    """
+
+    def __init__(
+        self,
+        browser_config: Optional[BrowserConfig] = None,
+        domain_hints: Optional[Dict[str, str]] = None,
+        max_connections: int = 100,
+        max_connections_per_host: int = 6,
+        timeout: float = 30.0,
+        http2: bool = HTTP2_AVAILABLE,
+        **kwargs,
+    ):
+        self.browser_config = browser_config or BrowserConfig(headless=True)
+        self.domain_hints = dict(domain_hints or {})
+        self.max_connections_per_host = max_connections_per_host
+        self.headers = {"User-Agent": self.browser_config.user_agent, "Accept-Encoding": "gzip, deflate, br"}
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            follow_redirects=True,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections // 2),
+        )
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._browser: Optional[AsyncPlaywrightCrawlerStrategy] = None
+        self._browser_lock = asyncio.Lock()
+        self._hooks: Dict[str, object] = {}
+        self.stats = {"http": 0, "browser": 0}
+        self.logger = None  # AsyncWebCrawler attaches its own logger
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.client.aclose()
+        if self._browser is not None:
+            await self._browser.__aexit__(exc_type, exc_val, exc_tb)
+
+    async def _browser_strategy(self) -> AsyncPlaywrightCrawlerStrategy:
+        # Chromium is only started the first time a page actually needs it
+        async with self._browser_lock:
+            if self._browser is None:
+                self._browser = AsyncPlaywrightCrawlerStrategy(browser_config=self.browser_config)
+                for hook_type, hook in self._hooks.items():
+                    self._browser.set_hook(hook_type, hook)
+                await self._browser.__aenter__()
+            return self._browser
+
+    async def _fetch(self, url: str) -> httpx.Response:
+        host = urlparse(url).netloc
+        slot = self._host_slots.setdefault(host, asyncio.Semaphore(self.max_connections_per_host))
+        async with slot:
+            return await self.client.get(url, headers=self.headers)
+
+    async def crawl(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs) -> AsyncCrawlResponse:
+        domain = urlparse(url).netloc
+        use_browser = (
+            not url.startswith(("http://", "https://"))  # raw:/file: are handled by the default strategy
+            or self.domain_hints.get(domain) == "browser"
+            or (config is not None and (config.js_code or config.wait_for or config.screenshot or config.pdf))
+        )
+
+        if not use_browser:
+            response = await self._fetch(url)
+            html = response.text
+            if self.domain_hints.get(domain) == "http" or not needs_javascript(html, response.status_code):
+                self.stats["http"] += 1
+                return AsyncCrawlResponse(
+                    html=html,
+                    response_headers=dict(response.headers),
+                    status_code=response.status_code,
+                    redirected_url=str(response.url),  # Relative links resolve against the final URL
+                )
+            self.domain_hints[domain] = "browser"
+
+        self.stats["browser"] += 1
+        browser = await self._browser_strategy()
+        return await browser.crawl(url, config=config, **kwargs)
+
+    async def crawl_many(self, urls: List[str], **kwargs) -> List[AsyncCrawlResponse]:
+        return await asyncio.gather(*(self.crawl(url, **kwargs) for url in urls))
+
+    async def take_screenshot(self, **kwargs) -> str:
+        browser = await self._browser_strategy()
+        return await browser.take_screenshot(**kwargs)
+
+    def update_user_agent(self, user_agent: str):
+        self.headers["User-Agent"] = user_agent
+
+    def set_hook(self, hook_type: str, hook):
+        # Hooks only run for pages that go through the browser
+        self._hooks[hook_type] = hook
+        if self._browser is not None:
+            self._browser.set_hook(hook_type, hook)
+
+
+# Local fixture site: one static article and one page rendered by JavaScript
+FIXTURE_PAGES = {
+    "/static": "<html><body><h1>Static article</h1>" + "<p>Plain server-rendered text. </p>" * 50 + "</body></html>",
+    "/spa": "<html><body><div id='root'></div><script>document.getElementById('root').innerHTML="
+            "'<h1>Rendered by JS</h1>'</script></body></html>",
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = FIXTURE_PAGES.get(self.path, "<html><body>Not found</body></html>").encode()
+        self.send_response(200 if self.path in FIXTURE_PAGES else 404)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+async def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    strategy = HttpFastPathStrategy()
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    try:
+        async with AsyncWebCrawler(crawler_strategy=strategy) as crawler:
+            for path in FIXTURE_PAGES:
+                result = await crawler.arun(url=base_url + path, config=config)
+                if result.success:
+                    print(f"{path}: markdown length {len(result.markdown)}")
+                else:
+                    print(f"{path}: failed => {result.error_message}")
+        print("Fetched over HTTP:", strategy.stats["http"], "| rendered in browser:", strategy.stats["browser"])
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,226 @@
+# Import required libraries
+import asyncio  # For async/await functionality
+import random  # For jitter on backoff delays
+import time  # For token bucket bookkeeping
+from collections import deque  # Pending URL queue
+from typing import AsyncIterator, Dict, Iterable, Optional, Set
+from urllib.parse import urlparse  # To group URLs by domain
+
+import psutil  # Memory readings (installed alongside crawl4ai)
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode  # Main crawler components
+from crawl4ai.models import CrawlResult
+
+# Status codes that mean "slow down" rather than "this page is broken"
+RATE_LIMIT_CODES = (429, 503)
+
+
+class DomainRateLimiter:
+    """
+    Per-domain token bucket with exponential backoff.
+
+    Each domain gets `rate` requests per second with bursts of up to `burst`.
+    A 429/503 response doubles that domain's backoff (capped at `max_backoff`),
+    and every successful response halves it again.
+    """
+
+    def __init__(self, rate: float = 1.0, burst: int = 2, base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.rate = rate
+        self.burst = burst
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+        self._backoff: Dict[str, float] = {}
+        self._blocked_until: Dict[str, float] = {}
+
+    def _refill(self, domain: str, now: float) -> None:
+        last = self._updated.get(domain, now)
+        tokens = self._tokens.get(domain, float(self.burst))
+        self._tokens[domain] = min(float(self.burst), tokens + (now - last) * self.rate)
+        self._updated[domain] = now
+
+    def delay_for(self, domain: str) -> float:
+        """Seconds until `domain` may be requested again (0 means go now)."""
+        now = time.monotonic()
+        self._refill(domain, now)
+        blocked = self._blocked_until.get(domain, 0.0) - now
+        if blocked > 0:
+            return blocked
+        if self._tokens[domain] >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens[domain]) / self.rate
+
+    def acquire(self, domain: str) -> None:
+        """Spend one token; call only after `delay_for` returned 0."""
+        self._tokens[domain] -= 1.0
+
+    def record(self, domain: str, status_code: Optional[int]) -> None:
+        """Feed the response status back so the domain backs off or recovers."""
+        if status_code in RATE_LIMIT_CODES:
+            backoff = min(self.max_backoff, self._backoff.get(domain, self.base_backoff / 2) * 2)
+            self._backoff[domain] = backoff
+            # Jitter keeps many workers from retrying the same host in lockstep
+            self._blocked_until[domain] = time.monotonic() + backoff * random.uniform(0.8, 1.2)
+        elif domain in self._backoff:
+            self._backoff[domain] /= 2
+            if self._backoff[domain] < self.base_backoff:
+                del self._backoff[domain]
+
+
+class MemoryAdaptiveScheduler:
+    """
+    Feeds URLs to `crawler.arun` while keeping system memory under a target.
+
+    A standalone loop: call `run(crawler, urls, config)` instead of
+    `arun_many`. It is not a crawl4ai dispatcher and cannot be passed as
+    `arun_many(dispatcher=...)`.
+
+    Concurrency grows by one slot per check while memory is below
+    `memory_target_percent` and shrinks when it is above it; above
+    `memory_critical_percent` no new page is opened at all until in-flight
+    crawls finish. A URL whose crawl raises yields a failed CrawlResult
+    carrying the error. `queue_depth` and `in_flight` can be read at any
+    time for monitoring.
+    """
+
+    def __init__(
+        self,
+        memory_target_percent: float = 80.0,
+        memory_critical_percent: float = 90.0,
+        min_concurrency: int = 1,
+        max_concurrency: int = 20,
+        check_interval: float = 0.5,
+        max_retries: int = 3,
+        rate_limiter: Optional[DomainRateLimiter] = None,
+    ):
+        self.memory_target_percent = memory_target_percent
+        self.memory_critical_percent = memory_critical_percent
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.check_interval = check_interval
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or DomainRateLimiter()
+        self.concurrency = min_concurrency
+        self._queue: deque = deque()
+        self._in_flight = 0
+        self._tasks: Set[asyncio.Task] = set()  # The event loop only keeps weak references to tasks
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._queue)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @staticmethod
+    def memory_percent() -> float:
+        # Uses "available" memory, so page cache does not count as pressure
+        return psutil.virtual_memory().percent
+
+    def _adjust_concurrency(self) -> None:
+        used = self.memory_percent()
+        if used >= self.memory_critical_percent:
+            self.concurrency = self.min_concurrency
+        elif used >= self.memory_target_percent:
+            self.concurrency = max(self.min_concurrency, self.concurrency - 1)
+        elif self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+
+    def _can_start(self) -> bool:
+        if self._in_flight >= self.concurrency:
+            return False
+        # Never open a new page while over the critical mark
+        return self._in_flight == 0 or self.memory_percent() < self.memory_critical_percent
+
+    def _next_ready(self):
+        """Pop the first queued URL whose domain is not rate limited."""
+        for _ in range(len(self._queue)):
+            url, attempt = self._queue.popleft()
+            domain = urlparse(url).netloc
+            if self.rate_limiter.delay_for(domain) == 0.0:
+                self.rate_limiter.acquire(domain)
+                return url, attempt, domain
+            self._queue.append((url, attempt))
+        return None
+
+    async def run(self, crawler: AsyncWebCrawler, urls: Iterable[str], config: CrawlerRunConfig) -> AsyncIterator:
+        """Crawl `urls` and yield each CrawlResult as soon as it completes."""
+        self._queue.extend((url, 0) for url in urls)
+        done: asyncio.Queue = asyncio.Queue()
+
+        async def crawl(url: str, attempt: int, domain: str) -> None:
+            try:
+                result = await crawler.arun(url=url, config=config)
+            except Exception as e:
+                result = e
+            await done.put((url, attempt, domain, result))
+
+        last_check = 0.0
+        try:
+            while self._queue or self._in_flight:
+                now = time.monotonic()
+                if now - last_check >= self.check_interval:
+                    self._adjust_concurrency()
+                    last_check = now
+
+                while self._queue and self._can_start():
+                    ready = self._next_ready()
+                    if ready is None:
+                        break
+                    self._in_flight += 1
+                    task = asyncio.create_task(crawl(*ready))
+                    self._tasks.add(task)
+                    task.add_done_callback(self._tasks.discard)
+
+                try:
+                    url, attempt, domain, result = await asyncio.wait_for(done.get(), timeout=self.check_interval)
+                except asyncio.TimeoutError:
+                    continue
+                self._in_flight -= 1
+
+                status_code = getattr(result, "status_code", None)
+                self.rate_limiter.record(domain, status_code)
+                if status_code in RATE_LIMIT_CODES and attempt < self.max_retries:
+                    self._queue.append((url, attempt + 1))  # Retry once the domain's backoff expires
+                    continue
+                if isinstance(result, Exception):
+                    result = CrawlResult(url=url, html="", success=False,
+                                         error_message=f"{type(result).__name__}: {result}")
+                yield result
+        finally:
+            # The caller stopped early or failed: do not leave crawls running behind it
+            for task in self._tasks:
+                task.cancel()
+
+
+async def main():
+    urls = [
+        "https://www.example.com",
+        "https://www.python.org",
+        "https://www.python.org/about/",
+        "https://www.github.com",
+    ]
+
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,  # Fresh results
+        stream=True,
+    )
+
+    scheduler = MemoryAdaptiveScheduler(
+        memory_target_percent=80.0,  # Keep the box at ~80% memory
+        max_concurrency=10,
+        rate_limiter=DomainRateLimiter(rate=0.5, burst=1),  # At most one page every 2s per domain
+    )
+
+    async with AsyncWebCrawler() as crawler:
+        async for result in scheduler.run(crawler, urls, config):
+            status = "SUCCESS" if result.success else f"ERROR: {result.error_message}"
+            print(f"[{status}] {result.url}")
+            print(f"- Queue depth: {scheduler.queue_depth}, in flight: {scheduler.in_flight}, "
+                  f"concurrency: {scheduler.concurrency}, memory: {scheduler.memory_percent():.0f}%")
+
+
+# Standard Python entry point
+if __name__ == "__main__":
+    asyncio.run(main())  # Run the async main function
@@ -0,0 +1,212 @@
+# Import required libraries
+import asyncio  # For async/await functionality
+import json  # JSONL encoding
+import os  # For file operations
+from pathlib import Path  # For output paths
+from typing import Iterable, List, Set
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode  # Main crawler components
+
+# Light fields written by default; html/cleaned_html/screenshot/pdf must be asked for explicitly
+DEFAULT_FIELDS = ["url", "success", "status_code", "error_message", "markdown", "extracted_content", "links"]
+HEAVY_FIELDS = ["html", "cleaned_html", "fit_html", "markdown", "markdown_v2", "fit_markdown",
+                "screenshot", "pdf", "extracted_content", "media", "links"]
+
+
+def select_fields(result, fields: List[str]) -> dict:
+    """Pick `fields` from a CrawlResult as JSON-ready values."""
+    row = {}
+    for name in fields:
+        value = getattr(result, name, None)
+        if hasattr(value, "model_dump"):  # e.g. MarkdownGenerationResult
+            value = value.model_dump()
+        elif isinstance(value, bytes):  # pdf
+            value = value.hex()
+        row[name] = value
+    return row
+
+
+def release_heavy_fields(result) -> None:
+    """Drop page bodies from a result that has already been written out."""
+    for name in HEAVY_FIELDS:
+        if getattr(result, name, None) is not None:
+            setattr(result, name, None)
+
+
+class JsonlResultSink:
+    """
+    Appends one JSON line per CrawlResult and flushes every `flush_every` rows.
+
+    On open, everything after the last complete line (valid JSON ending in a
+    newline) is truncated away, so a line cut short by a crash is dropped. The URLs already
+    on disk are returned by `completed_urls()`, so a restarted run only
+    crawls what is missing.
+    """
+
+    def __init__(self, path: str, fields: List[str] = None, flush_every: int = 100):
+        self.path = Path(path)
+        self.fields = fields or DEFAULT_FIELDS
+        self.flush_every = flush_every
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._completed = self._recover()
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._unflushed = 0
+
+    def _recover(self) -> Set[str]:
+        completed = set()
+        if not self.path.exists():
+            return completed
+        good_bytes = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                # A line is only complete with its newline: one that parses without it would
+                # have the next append glued onto it
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    completed.add(json.loads(line)["url"])
+                except (ValueError, KeyError, TypeError):
+                    break  # Partial last line from a crash
+                good_bytes += len(line)
+        os.truncate(self.path, good_bytes)
+        return completed
+
+    def completed_urls(self) -> Set[str]:
+        return set(self._completed)
+
+    def write(self, result) -> None:
+        self._file.write(json.dumps(select_fields(result, self.fields), default=str, ensure_ascii=False) + "\n")
+        self._completed.add(result.url)
+        self._unflushed += 1
+        if self._unflushed >= self.flush_every:
+            self.flush()
+
+    def flush(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unflushed = 0
+
+    def close(self) -> None:
+        self.flush()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetResultSink:
+    """
+    Writes CrawlResult fields to Parquet in row groups of `row_group_size`.
+
+    Every run writes a new `part-NNNNN.parquet` file inside `directory`. A
+    crashed run leaves a part without a footer. That part is unreadable and
+    is skipped on resume, so its URLs are simply crawled again. Requires
+    pyarrow.
+    """
+
+    def __init__(self, directory: str, fields: List[str] = None, row_group_size: int = 5000):
+        import pyarrow as pa  # Optional dependency: pip install pyarrow
+        import pyarrow.parquet as pq
+
+        self._pa, self._pq = pa, pq
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.fields = fields or DEFAULT_FIELDS
+        self.row_group_size = row_group_size
+        self._completed = set()
+        parts = sorted(self.directory.glob("part-*.parquet"))
+        for part in parts:
+            try:
+                self._completed.update(pq.read_table(part, columns=["url"]).column("url").to_pylist())
+            except Exception:
+                print(f"Skipping incomplete part {part.name}")
+        self.path = self.directory / f"part-{len(parts):05d}.parquet"
+        self._rows: List[dict] = []
+        self._writer = None
+
+    def completed_urls(self) -> Set[str]:
+        return set(self._completed)
+
+    def write(self, result) -> None:
+        row = select_fields(result, self.fields)
+        # Nested values are stored as JSON text so every row group shares one schema
+        self._rows.append({k: v if isinstance(v, (str, int, float, bool, type(None))) else json.dumps(v, default=str)
+                           for k, v in row.items()})
+        self._completed.add(result.url)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        types = {"success": self._pa.bool_(), "status_code": self._pa.int64()}
+        schema = self._pa.schema([(name, types.get(name, self._pa.string())) for name in self.fields])
+        table = self._pa.Table.from_pylist(self._rows, schema=schema)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self.path, schema, compression="zstd")
+        self._writer.write_table(table)
+        self._rows = []
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def crawl_to_sink(crawler: AsyncWebCrawler, urls: Iterable[str], config: CrawlerRunConfig, sink) -> int:
+    """Stream `urls` through arun_many into `sink`, skipping URLs it already holds."""
+    done = sink.completed_urls()
+    todo = [url for url in urls if url not in done]
+    print(f"{len(done)} URLs already written, {len(todo)} left to crawl")
+    if not todo:
+        return 0
+
+    written = 0
+    async for result in await crawler.arun_many(todo, config=config.clone(stream=True)):
+        sink.write(result)
+        release_heavy_fields(result)  # Nothing large outlives the write
+        written += 1
+    return written
+
+
+async def main():
+    urls = [
+        "https://www.example.com",
+        "https://www.python.org",
+        "https://www.github.com"
+    ]
+
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,  # Disable caching for fresh results
+        stream=True  # Results are written as soon as each page completes
+    )
+    output_dir = Path("crawl_output")
+
+    async with AsyncWebCrawler() as crawler:
+        # Re-running after a crash resumes from what is already in results.jsonl
+        with JsonlResultSink(output_dir / "results.jsonl", fields=["url", "success", "markdown"]) as sink:
+            written = await crawl_to_sink(crawler, urls, config, sink)
+            print(f"Wrote {written} results to {sink.path}")
+
+        try:
+            parquet_sink = ParquetResultSink(output_dir / "parquet", row_group_size=1000)
+        except ImportError:
+            print("pyarrow not installed, skipping the Parquet sink")
+            return
+        with parquet_sink:
+            written = await crawl_to_sink(crawler, urls, config, parquet_sink)
+            print(f"Wrote {written} results to {parquet_sink.path}")
+
+
+# Standard Python entry point
+if __name__ == "__main__":
+    asyncio.run(main())  # Run the async main function
@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing as mp
+import os
+import queue
+import traceback
+import zlib
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.models import CrawlResult
+
+
+def shard_key(url: str) -> str:
+    """The part of a URL that decides its shard: the host, without a leading "www."."""
+    host = (urlparse(url).hostname or url).lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def shard_of(url: str, n_shards: int) -> int:
+    # crc32 is stable across processes and runs, unlike hash() on str
+    return zlib.crc32(shard_key(url).encode()) % n_shards
+
+
+def _shard_worker(shard: int, urls: List[str], browser_config: BrowserConfig, config: CrawlerRunConfig,
+                  results: mp.Queue) -> None:
+    """Process entry point: one browser and one event loop crawling one shard's URLs."""
+
+    async def run():
+        async with AsyncWebCrawler(config=browser_config) as crawler:
+            async for result in await crawler.arun_many(urls, config=config.clone(stream=True)):
+                results.put(("result", shard, result.model_dump()))
+
+    try:
+        asyncio.run(run())
+        results.put(("done", shard, None))
+    except BaseException as e:
+        # Tracebacks can end in decoration (Playwright's install box), so send the exception itself
+        traceback.print_exc()
+        results.put(("error", shard, f"{type(e).__name__}: {e}".strip()))
+
+
+class ShardedCrawler:
+    """
+    Crawls URLs with `n_shards` worker processes, each running its own browser and event loop.
+
+    A URL's shard is picked from a hash of its host. Every page of a domain is
+    therefore crawled by the same browser, which keeps that domain's cookies,
+    and is rate limited by the same dispatcher. Workers send results back as
+    they finish. `crawl` yields them as ordinary CrawlResults from a single
+    async iterator, in completion order. If a worker dies, each URL it had not
+    returned yet comes back as a failed CrawlResult, so every input URL
+    produces exactly one result. Leaving the iteration early stops all workers.
+    """
+
+    def __init__(self, n_shards: int = None, browser_config: Optional[BrowserConfig] = None,
+                 config: Optional[CrawlerRunConfig] = None, poll_interval: float = 0.5):
+        self.n_shards = n_shards or max(1, (os.cpu_count() or 2) // 2)
+        self.browser_config = browser_config or BrowserConfig(headless=True)
+        self.config = config or CrawlerRunConfig()
+        self.poll_interval = poll_interval
+        # Playwright does not survive fork(); workers always start from a fresh interpreter
+        self._mp = mp.get_context("spawn")
+
+    def partition(self, urls: List[str]) -> Dict[int, List[str]]:
+        shards: Dict[int, List[str]] = {}
+        for url in dict.fromkeys(urls):
+            shards.setdefault(shard_of(url, self.n_shards), []).append(url)
+        return shards
+
+    async def crawl(self, urls: List[str]) -> AsyncIterator[CrawlResult]:
+        results = self._mp.Queue()
+        pending = self.partition(urls)
+        workers = {
+            shard: self._mp.Process(target=_shard_worker, args=(shard, shard_urls, self.browser_config, self.config, results),
+                                    name=f"crawl-shard-{shard}", daemon=True)
+            for shard, shard_urls in pending.items()
+        }
+        pending = {shard: set(shard_urls) for shard, shard_urls in pending.items()}
+        for worker in workers.values():
+            worker.start()
+
+        loop = asyncio.get_running_loop()
+        running = set(workers)
+        try:
+            while running:
+                try:
+                    kind, shard, payload = await loop.run_in_executor(None, results.get, True, self.poll_interval)
+                except queue.Empty:
+                    # A worker killed outright (OOM, segfault) never reports; notice it here
+                    for shard in [s for s in running if not workers[s].is_alive()]:
+                        running.discard(shard)
+                        for result in self._lost(shard, pending, f"exit code {workers[shard].exitcode}"):
+                            yield result
+                    continue
+
+                if kind == "result":
+                    result = CrawlResult.model_validate(payload)
+                    pending[shard].discard(result.url)
+                    yield result
+                else:
+                    running.discard(shard)
+                    if kind == "error":
+                        for result in self._lost(shard, pending, payload):
+                            yield result
+        finally:
+            for worker in workers.values():
+                if worker.is_alive():
+                    worker.terminate()
+                worker.join(timeout=5)
+            results.close()
+
+    def _lost(self, shard: int, pending: Dict[int, set], reason: str):
+        for url in sorted(pending[shard]):
+            yield CrawlResult(url=url, html="", success=False, error_message=f"Shard {shard} failed: {reason}")
+        pending[shard].clear()
+
+
+async def main():
+    # The URLs from p1.py plus a few more pages per domain
+    urls = [
+        "https://www.example.com",
+        "https://www.python.org",
+        "https://www.python.org/downloads/",
+        "https://docs.python.org/3/",
+        "https://www.github.com",
+        "https://github.com/about",
+        "https://news.ycombinator.com",
+        "https://news.ycombinator.com/newest",
+    ]
+    crawler = ShardedCrawler(
+        n_shards=4,
+        browser_config=BrowserConfig(headless=True),
+        config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    )
+    for shard, shard_urls in sorted(crawler.partition(urls).items()):
+        print(f"Shard {shard}: {shard_urls}")
+
+    async for result in crawler.crawl(urls):
+        if result.success:
+            print(f"[SUCCESS] {result.url} - {len(result.markdown)} chars of markdown")
+        else:
+            print(f"[ERROR] {result.url} => {result.error_message}")
+
+# The guard is required: spawned workers re-import this file
+if __name__ == "__main__":
+    asyncio.run(main())
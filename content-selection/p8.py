@@ -0,0 +1,149 @@
+import asyncio
+import inspect
+import multiprocessing as mp
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Optional
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.async_logger import AsyncLogger
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.models import CrawlResult
+
+# crawl4ai 0.4 passes the screenshot to aprocess_html as `screenshot`, 0.5+ as `screenshot_data`
+SCREENSHOT_ARG = "screenshot_data" if "screenshot_data" in inspect.signature(AsyncWebCrawler.aprocess_html).parameters else "screenshot"
+
+# Per-worker state, set up once by _init_worker
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+_worker_crawler = None
+
+
+def _init_worker() -> None:
+    global _worker_loop, _worker_crawler
+    _worker_loop = asyncio.new_event_loop()
+    # aprocess_html only needs a logger from the crawler, so no browser is started here
+    _worker_crawler = AsyncWebCrawler.__new__(AsyncWebCrawler)
+    _worker_crawler.logger = AsyncLogger(verbose=False)
+
+
+def _read_shared(name: str, size: int) -> str:
+    # Spawned workers share the parent's resource tracker, so attaching here needs no unregister
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        return bytes(shm.buf[:size]).decode("utf-8")
+    finally:
+        shm.close()
+
+
+def _process_page(shm_name: str, size: int, url: str, config: CrawlerRunConfig, extracted_content, kwargs) -> CrawlResult:
+    """Worker side: scraping, markdown and extraction for one page. The HTML is not sent back."""
+    html = _read_shared(shm_name, size)
+    started = time.perf_counter()
+    result = _worker_loop.run_until_complete(AsyncWebCrawler.aprocess_html(
+        _worker_crawler, url=url, html=html, extracted_content=extracted_content, config=config, **kwargs
+    ))
+    result.html = ""
+    result.metadata = {**(result.metadata or {}), "process_ms": int((time.perf_counter() - started) * 1000)}
+    return result
+
+
+class PooledCrawler(AsyncWebCrawler):
+    """
+    AsyncWebCrawler that runs the post-fetch pipeline in a process pool.
+
+    Scraping, markdown generation and extraction (everything in
+    `aprocess_html`) run in one of `workers` processes. The event loop only
+    drives browsers and I/O, and throughput grows with cores instead of
+    stopping at one GIL. The HTML reaches the worker through shared memory,
+    and the result comes back without it. The config is pickled with each
+    page, so strategies must be picklable. Stateful strategies are updated in
+    the worker's copy: an LLM strategy's token usage stays in the worker.
+    Pages smaller than `min_offload_bytes` are processed inline, where the
+    hand-off would cost more than it saves.
+    """
+
+    def __init__(self, *args, workers: Optional[int] = None, min_offload_bytes: int = 32 * 1024, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.workers = workers or os.cpu_count() or 2
+        self.min_offload_bytes = min_offload_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn, not fork: the parent runs Playwright's threads
+            self._pool = ProcessPoolExecutor(self.workers, mp_context=mp.get_context("spawn"), initializer=_init_worker)
+        return self._pool
+
+    async def aprocess_html(self, url: str, html: str, extracted_content: str, config: CrawlerRunConfig,
+                            pdf_data: str = None, verbose: bool = True, **kwargs) -> CrawlResult:
+        screenshot = kwargs.pop(SCREENSHOT_ARG, None)
+        encoded = html.encode("utf-8")
+        if len(encoded) < self.min_offload_bytes:
+            return await super().aprocess_html(url=url, html=html, extracted_content=extracted_content, config=config,
+                                               pdf_data=pdf_data, verbose=verbose, **{SCREENSHOT_ARG: screenshot},
+                                               **kwargs)
+
+        size = len(encoded)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, size))
+        try:
+            shm.buf[:size] = encoded
+            del encoded
+            # Screenshot and PDF never leave this process; they are attached below
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._get_pool(), _process_page, shm.name, size, url, config, extracted_content,
+                {SCREENSHOT_ARG: None, "pdf_data": None, "verbose": verbose, **kwargs},
+            )
+        except BrokenProcessPool:
+            self._pool = None  # A worker died; the next page gets a fresh pool
+            raise
+        finally:
+            shm.close()
+            shm.unlink()
+
+        result.html = html
+        result.screenshot = screenshot or None
+        result.pdf = pdf_data or None
+        self.logger.info(
+            message="Processed {url:.50}... | Time: {timing}ms (worker)",
+            tag="SCRAPE",
+            params={"url": "Raw HTML" if kwargs.get("is_raw_html") else url, "timing": result.metadata["process_ms"]},
+        )
+        return result
+
+    async def close(self):
+        await super().close()
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+
+async def main():
+    # LXML scraping as in p6.py, plus CSS extraction: all of it runs in the pool
+    schema = {
+        "name": "Story",
+        "baseSelector": "tr.athing",
+        "fields": [
+            {"name": "title", "selector": "span.titleline > a", "type": "text"},
+            {"name": "link", "selector": "span.titleline > a", "type": "attribute", "attribute": "href"},
+        ],
+    }
+    config = CrawlerRunConfig(
+        scraping_strategy=LXMLWebScrapingStrategy(),
+        extraction_strategy=JsonCssExtractionStrategy(schema),
+        cache_mode=CacheMode.BYPASS,
+    )
+    urls = [f"https://news.ycombinator.com/news?p={page}" for page in range(1, 11)]
+
+    async with PooledCrawler(workers=4) as crawler:
+        started = time.perf_counter()
+        results = await crawler.arun_many(urls, config=config)
+        print(f"{len(results)} pages in {time.perf_counter() - started:.1f}s")
+        for result in results:
+            print(result.url, result.success, len(result.markdown or ""), result.metadata.get("process_ms"), "ms in worker")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,400 @@
+import asyncio
+import bisect
+import contextvars
+import copy
+import functools
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+from pydantic import BaseModel, PrivateAttr
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+from crawl4ai.extraction_strategy import NoExtractionStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from crawl4ai.models import CrawlResult
+
+# Browser-side stages nest under "fetch"; fetch and the post-processing stages nest under the arun itself
+PARENT_STAGE = {
+    "navigation": "fetch", "js_code": "fetch", "scroll": "fetch", "wait_for": "fetch", "capture_html": "fetch",
+    "fetch": None, "scrape": None, "markdown": None, "extract": None,
+}
+
+
+class StageSpan(BaseModel):
+    name: str
+    parent: Optional[str] = None
+    start_ns: int
+    end_ns: int
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class CrawlTimings(BaseModel):
+    """Per-stage timing and resource record for one arun call."""
+
+    url: str
+    start_ns: int
+    end_ns: Optional[int] = None
+    spans: List[StageSpan] = []
+    bytes_transferred: int = 0  # Encoded bytes of every response the page loaded
+    dom_nodes: Optional[int] = None
+    js_heap_bytes: Optional[int] = None
+
+    _open: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _cdp = PrivateAttr(default=None)
+
+    def begin(self, name: str) -> None:
+        self._open[name] = time.time_ns()
+
+    def end(self, name: str) -> None:
+        started = self._open.pop(name, None)
+        if started is not None:
+            self.spans.append(StageSpan(name=name, parent=PARENT_STAGE.get(name), start_ns=started, end_ns=time.time_ns()))
+
+    @contextmanager
+    def stage(self, name: str):
+        self.begin(name)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def stages_ms(self) -> Dict[str, float]:
+        """Wall time per stage; a stage entered more than once is summed."""
+        totals = defaultdict(float)
+        for span in self.spans:
+            totals[span.name] += span.duration_ms
+        return dict(totals)
+
+
+class TimedCrawlResult(CrawlResult):
+    timings: Optional[CrawlTimings] = None
+
+
+# The record for the arun in progress; every arun (including each one arun_many starts) is its own task
+_current_timings: contextvars.ContextVar = contextvars.ContextVar("crawl_timings", default=None)
+
+
+def current_timings() -> Optional[CrawlTimings]:
+    return _current_timings.get()
+
+
+@contextmanager
+def _stage(name: str):
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    with timings.stage(name):
+        yield
+
+
+@functools.lru_cache(maxsize=None)
+def _timed_class(cls, method: str, stage: str):
+    def timed(self, *args, **kwargs):
+        with _stage(stage):
+            return getattr(super(timed_cls, self), method)(*args, **kwargs)
+
+    timed_cls = type(f"Timed{cls.__name__}", (cls,), {method: timed})
+    return timed_cls
+
+
+def _timed(strategy, method: str, stage: str):
+    """Shallow copy of `strategy` whose `method` is timed; state such as LLM usage stays shared."""
+    timed = copy.copy(strategy)
+    timed.__class__ = _timed_class(type(strategy), method, stage)
+    return timed
+
+
+def instrument_config(config: CrawlerRunConfig) -> CrawlerRunConfig:
+    """Clone `config` with the scraping, markdown and extraction stages timed."""
+    overrides = {
+        "scraping_strategy": _timed(config.scraping_strategy, "scrap", "scrape"),
+        "markdown_generator": _timed(config.markdown_generator or DefaultMarkdownGenerator(),
+                                     "generate_markdown", "markdown"),
+    }
+    extraction = config.extraction_strategy
+    if extraction is not None and not isinstance(extraction, NoExtractionStrategy):
+        overrides["extraction_strategy"] = _timed(extraction, "run", "extract")
+    return config.clone(**overrides)
+
+
+class TimedPlaywrightCrawlerStrategy(AsyncPlaywrightCrawlerStrategy):
+    """
+    Playwright strategy that records browser-side stages into the current CrawlTimings.
+
+    Navigation and HTML capture are timed from the existing hooks. Those hooks
+    are intercepted in `execute_hook`, so hooks set with `set_hook` still run.
+    A CDP session per crawl counts transferred bytes and reads the DOM node
+    count and JS heap size (Chromium only).
+    """
+
+    async def crawl(self, url: str, config: CrawlerRunConfig = None, **kwargs):
+        timings = _current_timings.get()
+        try:
+            with _stage("fetch"):
+                return await super().crawl(url, config=config, **kwargs)
+        finally:
+            if timings is not None and timings._cdp is not None:
+                await self._detach(timings)
+
+    async def _handle_full_page_scan(self, *args, **kwargs):
+        with _stage("scroll"):
+            return await super()._handle_full_page_scan(*args, **kwargs)
+
+    async def smart_wait(self, *args, **kwargs):
+        with _stage("wait_for"):
+            return await super().smart_wait(*args, **kwargs)
+
+    async def robust_execute_user_script(self, *args, **kwargs):
+        with _stage("js_code"):
+            return await super().robust_execute_user_script(*args, **kwargs)
+
+    async def execute_hook(self, hook_type: str, *args, **kwargs):
+        timings = _current_timings.get()
+        if timings is not None:
+            page = args[0] if args else kwargs.get("page")
+            if hook_type == "before_goto":
+                await self._attach(timings, page)
+                timings.begin("navigation")
+            elif hook_type == "after_goto":
+                timings.end("navigation")
+            elif hook_type == "before_retrieve_html":
+                timings.begin("capture_html")
+            elif hook_type == "before_return_html":
+                timings.end("capture_html")
+                await self._read_page_metrics(timings, page)
+        return await super().execute_hook(hook_type, *args, **kwargs)
+
+    async def _attach(self, timings: CrawlTimings, page) -> None:
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send("Network.enable")
+            await cdp.send("Performance.enable")
+        except Exception:
+            return  # Not Chromium
+
+        def on_loading_finished(event):
+            timings.bytes_transferred += int(event.get("encodedDataLength", 0))
+
+        cdp.on("Network.loadingFinished", on_loading_finished)
+        timings._cdp = cdp
+
+    async def _read_page_metrics(self, timings: CrawlTimings, page) -> None:
+        try:
+            if timings._cdp is not None:
+                metrics = (await timings._cdp.send("Performance.getMetrics"))["metrics"]
+                metrics = {m["name"]: m["value"] for m in metrics}
+                timings.dom_nodes = int(metrics.get("Nodes", 0))
+                timings.js_heap_bytes = int(metrics.get("JSHeapUsedSize", 0))
+            else:
+                timings.dom_nodes = await page.evaluate("() => document.getElementsByTagName('*').length")
+        except Exception:
+            pass  # Metrics are best effort; the crawl itself goes on
+
+    async def _detach(self, timings: CrawlTimings) -> None:
+        cdp, timings._cdp = timings._cdp, None
+        try:
+            await cdp.detach()
+        except Exception:
+            pass
+
+
+class MetricsHook(ABC):
+    """Receives every finished crawl; subclass it to export timings anywhere."""
+
+    @abstractmethod
+    def on_crawl(self, result: TimedCrawlResult) -> None:
+        ...
+
+
+class InstrumentedCrawler(AsyncWebCrawler):
+    """
+    AsyncWebCrawler whose results carry a `timings` record (see CrawlTimings).
+
+    arun_many goes through `arun`, so batch crawls are instrumented too. Every
+    result is handed to each of `metrics_hooks`.
+    """
+
+    def __init__(self, *args, metrics_hooks: Sequence[MetricsHook] = (), **kwargs):
+        if kwargs.get("crawler_strategy") is None:
+            kwargs["crawler_strategy"] = TimedPlaywrightCrawlerStrategy(browser_config=kwargs.get("config"))
+        super().__init__(*args, **kwargs)
+        self.metrics_hooks = list(metrics_hooks)
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs) -> TimedCrawlResult:
+        timings = CrawlTimings(url=url, start_ns=time.time_ns())
+        token = _current_timings.set(timings)
+        try:
+            result = await super().arun(url, config=instrument_config(config or CrawlerRunConfig()), **kwargs)
+        finally:
+            _current_timings.reset(token)
+            timings.end_ns = time.time_ns()
+
+        # Built through __init__ so private state such as the markdown result is restored
+        result = TimedCrawlResult(**result.model_dump(), timings=timings)
+        for hook in self.metrics_hooks:
+            hook.on_crawl(result)
+        return result
+
+
+# ---------------------------------------------------------------- exporters
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.values: Dict[tuple, float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        self.values[tuple(labels[l] for l in self.labels)] += amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in self.values.items():
+            lines.append(f"{self.name}{_labels(self.labels, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: Sequence[float], labels: Sequence[str] = ()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = sorted(buckets)
+        self.counts: Dict[tuple, List[int]] = {}
+        self.sums: Dict[tuple, float] = defaultdict(float)
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels[l] for l in self.labels)
+        counts = self.counts.setdefault(key, [0] * (len(self.buckets) + 1))
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sums[key] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, counts in self.counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + [float("inf")], counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f"{self.name}_bucket{_labels(self.labels + ('le',), key + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {self.sums[key]:g}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {cumulative}")
+        return lines
+
+
+def _labels(names: tuple, values: tuple) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, values)) + "}"
+
+
+class MetricsRegistry:
+    """A minimal Prometheus-style registry; `render()` returns the text exposition format."""
+
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, *args, **kwargs) -> Counter:
+        self.metrics.append(Counter(*args, **kwargs))
+        return self.metrics[-1]
+
+    def histogram(self, *args, **kwargs) -> Histogram:
+        self.metrics.append(Histogram(*args, **kwargs))
+        return self.metrics[-1]
+
+    def render(self) -> str:
+        return "\n".join(line for metric in self.metrics for line in metric.render()) + "\n"
+
+
+class PrometheusMetricsHook(MetricsHook):
+    """Aggregates crawl timings into a MetricsRegistry (serve `registry.render()` on /metrics)."""
+
+    def __init__(self, registry: MetricsRegistry = None):
+        self.registry = registry or MetricsRegistry()
+        self.pages = self.registry.counter("crawl4ai_pages_total", "Crawled pages", ["status"])
+        self.bytes = self.registry.counter("crawl4ai_bytes_transferred_total", "Bytes loaded by crawled pages")
+        self.stage_seconds = self.registry.histogram(
+            "crawl4ai_stage_seconds", "Wall time per crawl stage",
+            buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30], labels=["stage"])
+        self.dom_nodes = self.registry.histogram(
+            "crawl4ai_dom_nodes", "DOM node count at HTML capture", buckets=[100, 500, 1000, 5000, 10000, 50000])
+
+    def on_crawl(self, result: TimedCrawlResult) -> None:
+        timings = result.timings
+        self.pages.inc(status="success" if result.success else "failure")
+        self.bytes.inc(timings.bytes_transferred)
+        self.stage_seconds.observe(timings.total_ms / 1000, stage="total")
+        for stage, ms in timings.stages_ms().items():
+            self.stage_seconds.observe(ms / 1000, stage=stage)
+        if timings.dom_nodes is not None:
+            self.dom_nodes.observe(timings.dom_nodes)
+
+
+class OpenTelemetryHook(MetricsHook):
+    """Emits one span per arun with a child span per stage. Requires opentelemetry-api."""
+
+    def __init__(self, tracer=None):
+        from opentelemetry import trace  # Optional dependency: pip install opentelemetry-api
+
+        self._trace = trace
+        self.tracer = tracer or trace.get_tracer("crawl4ai")
+
+    def on_crawl(self, result: TimedCrawlResult) -> None:
+        timings = result.timings
+        root = self.tracer.start_span("crawl4ai.arun", start_time=timings.start_ns, attributes={
+            "url.full": result.url,
+            "http.response.status_code": result.status_code or 0,
+            "crawl4ai.success": result.success,
+            "crawl4ai.bytes_transferred": timings.bytes_transferred,
+            "crawl4ai.dom_nodes": timings.dom_nodes or 0,
+            "crawl4ai.js_heap_bytes": timings.js_heap_bytes or 0,
+        })
+        # Parents are always recorded before their children finish, so start them first
+        spans = {None: root}
+        for span in sorted(timings.spans, key=lambda s: (s.parent is not None, s.start_ns)):
+            context = self._trace.set_span_in_context(spans.get(span.parent, root))
+            child = self.tracer.start_span(f"crawl4ai.{span.name}", context=context, start_time=span.start_ns)
+            child.end(end_time=span.end_ns)
+            spans.setdefault(span.name, child)
+        root.end(end_time=timings.end_ns)
+
+
+async def main():
+    prometheus = PrometheusMetricsHook()
+    hooks = [prometheus]
+    try:
+        hooks.append(OpenTelemetryHook())
+    except ImportError:
+        print("opentelemetry-api not installed, skipping span export")
+
+    browser_config = BrowserConfig(headless=True)
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        scan_full_page=True,  # Timed as its own "scroll" stage
+        wait_for="css:body"
+    )
+
+    async with InstrumentedCrawler(config=browser_config, metrics_hooks=hooks) as crawler:
+        result = await crawler.arun("https://www.nbcnews.com/business", config=run_config)
+        timings = result.timings
+        print(f"Total: {timings.total_ms:.0f} ms")
+        for stage, ms in timings.stages_ms().items():
+            print(f"  {stage:13} {ms:8.1f} ms")
+        print(f"Bytes transferred: {timings.bytes_transferred:,}")
+        print(f"DOM nodes: {timings.dom_nodes}, JS heap: {timings.js_heap_bytes}")
+
+        # arun_many results are instrumented as well and aggregated by the hooks
+        await crawler.arun_many(["https://example.com", "https://www.python.org"], config=run_config)
+
+    print(prometheus.registry.render())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,272 @@
+import asyncio
+from html.entities import html5
+import threading
+import tracemalloc
+from typing import AsyncIterator, Dict, Iterable, Iterator, NamedTuple, Optional, Union
+
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai import markdown_generation_strategy
+from crawl4ai.html2text import CustomHTML2Text
+from crawl4ai.markdown_generation_strategy import LINK_PATTERN, DefaultMarkdownGenerator, fast_urljoin
+from crawl4ai.models import MarkdownGenerationResult
+
+
+def _stock_options() -> Dict:
+    """
+    The html2text options DefaultMarkdownGenerator applies by default. They
+    change between crawl4ai releases (protect_links, for one) and live inside
+    generate_markdown, so they are recorded from one stock conversion.
+    """
+    recorded = {}
+
+    class Recorder(CustomHTML2Text):
+        def update_params(self, **kwargs):
+            recorded.update(kwargs)
+            super().update_params(**kwargs)
+
+    stock = markdown_generation_strategy.CustomHTML2Text
+    markdown_generation_strategy.CustomHTML2Text = Recorder
+    try:
+        DefaultMarkdownGenerator().generate_markdown("", citations=False)
+    finally:
+        markdown_generation_strategy.CustomHTML2Text = stock
+    return recorded
+
+
+# Recorded once at import, before any crawl converts markdown concurrently
+DEFAULT_OPTIONS = _stock_options()
+
+
+class MarkdownChunk(NamedTuple):
+    raw_markdown: str
+    markdown_with_citations: str
+
+
+class CitationTracker:
+    """Link-to-citation conversion that keeps its numbering across chunks."""
+
+    def __init__(self, base_url: str = ""):
+        self.base_url = base_url
+        self.link_map: Dict[str, tuple] = {}
+        self._url_cache: Dict[str, str] = {}
+
+    def convert(self, markdown: str) -> str:
+        # Same rules as DefaultMarkdownGenerator.convert_links_to_citations
+        parts, last_end = [], 0
+        for match in LINK_PATTERN.finditer(markdown):
+            parts.append(markdown[last_end:match.start()])
+            text, url, title = match.groups()
+            if self.base_url and not url.startswith(("http://", "https://", "mailto:")):
+                if url not in self._url_cache:
+                    self._url_cache[url] = fast_urljoin(self.base_url, url)
+                url = self._url_cache[url]
+            if url not in self.link_map:
+                desc = [d for d in (title, text if text != title else None) if d]
+                self.link_map[url] = (len(self.link_map) + 1, ": " + " - ".join(desc) if desc else "")
+            num = self.link_map[url][0]
+            parts.append(f"{text}⟨{num}⟩" if not match.group(0).startswith("!") else f"![{text}⟨{num}⟩]")
+            last_end = match.end()
+        parts.append(markdown[last_end:])
+        return "".join(parts)
+
+    def references(self) -> str:
+        lines = ["\n\n## References\n\n"]
+        lines.extend(f"⟨{num}⟩ {url}{desc}\n" for url, (num, desc) in sorted(self.link_map.items(), key=lambda x: x[1][0]))
+        return "".join(lines)
+
+
+def _tag_aligned(pieces: Iterable[str]) -> Iterator[str]:
+    """
+    Re-cut HTML pieces so each one ends just before a "<". The parser emits
+    the text at the end of a feed right away, and html2text turns a text node
+    split across two feeds into two words. Text that ends at a "<" is complete.
+    """
+    carry = ""
+    for piece in pieces:
+        piece = carry + piece
+        cut = piece.rfind("<")
+        if cut > 0:
+            yield piece[:cut]
+            carry = piece[cut:]
+        else:
+            carry = piece
+    if carry:
+        yield carry
+
+
+def _safe_cut(text: str) -> int:
+    """Length of the longest prefix ending in a newline that no markdown link straddles (0 if none)."""
+    cut = text.rfind("\n")
+    while cut >= 0:
+        head = text[:cut + 1]
+        open_bracket, close_bracket = head.rfind("["), head.rfind("]")
+        inside_text = open_bracket > close_bracket
+        inside_url = close_bracket >= 0 and head[close_bracket + 1:close_bracket + 2] == "(" and head.rfind(")") < close_bracket
+        if not inside_text and not inside_url:
+            return cut + 1
+        cut = text.rfind("\n", 0, min(open_bracket if inside_text else close_bracket, cut))
+    return 0
+
+
+class StreamingMarkdownGenerator(DefaultMarkdownGenerator):
+    """
+    Markdown generator that emits markdown in chunks while the HTML is being parsed.
+
+    HTML goes through html2text's incremental parser about `feed_size`
+    characters at a time, cut only where a tag starts. Its output is drained at line boundaries that no link
+    straddles, and each chunk is converted to citations right away. Neither
+    the whole markdown nor a second citation pass is needed: a consumer that
+    writes chunks out holds only the current chunk. `generate_markdown`
+    joins the stream, so the generator also works as a drop-in inside
+    CrawlerRunConfig.
+    """
+
+    def __init__(self, *args, feed_size: int = 64 * 1024, max_pending: int = 1 << 20, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.feed_size = feed_size
+        self.max_pending = max_pending  # Flush anyway if an unclosed "[" holds back this much text
+
+    def _converter(self, base_url: str, html2text_options: Optional[Dict] = None) -> CustomHTML2Text:
+        h = CustomHTML2Text(baseurl=base_url)
+        options = dict(DEFAULT_OPTIONS)
+        options.update(html2text_options or self.options)
+        h.update_params(**options)
+        h.start = True
+        return h
+
+    def iter_markdown(self, html: Union[str, Iterable[str]], base_url: str = "", citations: bool = True,
+                      html2text_options: Optional[Dict] = None, tracker: CitationTracker = None) -> Iterator[MarkdownChunk]:
+        """Yield MarkdownChunks for `html`, which may be a string or an iterable of HTML pieces."""
+        h = self._converter(base_url, html2text_options)
+        tracker = tracker or CitationTracker(base_url)
+        if isinstance(html, str):
+            pieces = _tag_aligned(html[i:i + self.feed_size] for i in range(0, len(html), self.feed_size))
+        else:
+            pieces = _tag_aligned(html)
+        pending = ""
+
+        def drain(final: bool) -> Optional[MarkdownChunk]:
+            nonlocal pending
+            # html2text looks back at its last output piece, so that one stays in the list until the end
+            keep = 0 if final else 1
+            if len(h.outtextlist) > keep:
+                pending += "".join(h.outtextlist[:len(h.outtextlist) - keep])
+                del h.outtextlist[:len(h.outtextlist) - keep]
+            cut = len(pending) if final or len(pending) > self.max_pending else _safe_cut(pending)
+            if not cut:
+                return None
+            text, pending = pending[:cut], pending[cut:]
+            nbsp = html5["nbsp;"] if h.unicode_snob else " "
+            text = h.optwrap(text.replace("&nbsp_place_holder;", nbsp)).replace("    ```", "```")
+            return MarkdownChunk(text, tracker.convert(text) if citations else text)
+
+        for piece in pieces:
+            h.feed(piece)
+            chunk = drain(final=False)
+            if chunk:
+                yield chunk
+        h.feed("")
+        h.close()
+        h.pbr()
+        h.o("", force="end")
+        chunk = drain(final=True)
+        if chunk:
+            yield chunk
+
+    async def astream(self, html: Union[str, Iterable[str]], base_url: str = "", citations: bool = True,
+                      tracker: CitationTracker = None, max_buffered: int = 8) -> AsyncIterator[MarkdownChunk]:
+        """
+        Async iterator over MarkdownChunks. Conversion runs on a worker thread,
+        so the consumer's awaits (an LLM call, a socket write) overlap with parsing.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered)
+        done = object()
+        stop = threading.Event()
+
+        def produce():
+            try:
+                for chunk in self.iter_markdown(html, base_url, citations, tracker=tracker):
+                    if stop.is_set():
+                        return
+                    asyncio.run_coroutine_threadsafe(queue.put(chunk), loop).result()  # Backpressure
+                asyncio.run_coroutine_threadsafe(queue.put(done), loop).result()
+            except BaseException as e:
+                if not stop.is_set():
+                    asyncio.run_coroutine_threadsafe(queue.put(e), loop).result()
+
+        producer = loop.run_in_executor(None, produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            while not queue.empty():  # Unblock a producer waiting on a full queue
+                queue.get_nowait()
+            await producer
+
+    def generate_markdown(self, input_html: str = "", base_url: str = "", html2text_options: Optional[Dict] = None,
+                          options: Optional[Dict] = None, content_filter=None, citations: bool = True,
+                          **kwargs) -> MarkdownGenerationResult:
+        # crawl4ai 0.4 passes the HTML as cleaned_html=, later releases as input_html=
+        cleaned_html = kwargs.pop("cleaned_html", None) or input_html or ""
+        tracker = CitationTracker(base_url)
+        raw, cited = [], []
+        for chunk in self.iter_markdown(cleaned_html, base_url, citations, html2text_options or options, tracker):
+            raw.append(chunk.raw_markdown)
+            cited.append(chunk.markdown_with_citations)
+
+        fit_markdown, fit_html = "", ""
+        content_filter = content_filter or self.content_filter
+        if content_filter:
+            fit_html = "\n".join(f"<div>{s}</div>" for s in content_filter.filter_content(cleaned_html))
+            fit_markdown = "".join(c.raw_markdown for c in self.iter_markdown(fit_html, base_url, citations=False))
+
+        return MarkdownGenerationResult(
+            raw_markdown="".join(raw),
+            markdown_with_citations="".join(cited),
+            references_markdown=tracker.references() if citations else "",
+            fit_markdown=fit_markdown,
+            fit_html=fit_html,
+        )
+
+
+async def main():
+    # 1. Fetch the long Wikipedia article from Local-Files-Raw-HTML/p1.py
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    async with AsyncWebCrawler() as crawler:
+        result = await crawler.arun(url="https://en.wikipedia.org/wiki/apple", config=config)
+    if not result.success:
+        print(f"Failed to crawl: {result.error_message}")
+        return
+    cleaned_html = result.cleaned_html
+    generator = StreamingMarkdownGenerator()
+
+    # 2. Stream chunks to disk as they are produced; only one chunk is alive at a time
+    tracemalloc.start()
+    tracker = CitationTracker("https://en.wikipedia.org/wiki/apple")
+    chunks = 0
+    with open("apple.md", "w", encoding="utf-8") as out:
+        async for chunk in generator.astream(cleaned_html, tracker.base_url, tracker=tracker):
+            out.write(chunk.markdown_with_citations)
+            chunks += 1
+        out.write(tracker.references())
+    _, streaming_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # 3. The same conversion in one piece, for comparison
+    tracemalloc.start()
+    DefaultMarkdownGenerator().generate_markdown(cleaned_html, base_url=tracker.base_url)
+    _, default_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"Wrote {chunks} chunks and {len(tracker.link_map)} references to apple.md")
+    print(f"Peak memory: streaming {streaming_peak / 2**20:.1f} MB, default {default_peak / 2**20:.1f} MB")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,352 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+import aiofiles
+import aiohttp
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.models import CrawlResult
+
+
+@dataclass
+class DownloadProgress:
+    url: str
+    path: str
+    downloaded: int
+    total: Optional[int]  # None when the server sends no length
+    done: bool = False
+
+
+def print_progress(progress: DownloadProgress) -> None:
+    name = os.path.basename(progress.path)
+    if progress.done:
+        print(f"Downloaded {name} ({progress.downloaded / 2**20:.1f} MB)")
+    elif progress.total:
+        print(f"  {name}: {progress.downloaded * 100 // progress.total}%")
+
+
+class DownloadManager:
+    """
+    Concurrent, resumable downloads of the files a crawl links to.
+
+    - At most `max_concurrency` downloads run at once, and at most
+      `per_host_limit` requests go to any one host.
+    - Bytes go to `<name>.partN` files next to the target. An interrupted
+      download resumes with an HTTP Range request from where each part stopped.
+      Parts are dropped if the server's ETag/Last-Modified changed.
+    - A file of `multipart_threshold` bytes or more, on a server that accepts
+      ranges, is fetched as up to `max_parts` ranges in parallel.
+    - Each finished file's SHA-256 goes into an index in `download_path`. A
+      file whose content was already downloaded (a mirror, a renamed copy) is
+      deleted, and the existing path is reported instead. A URL that was
+      already downloaded is not fetched again.
+    - `on_progress` receives a DownloadProgress every `progress_interval`
+      seconds per file, and once when the file is done.
+    """
+
+    INDEX_NAME = ".downloads.json"
+
+    def __init__(self, download_path: str, extensions: Iterable[str] = (), max_concurrency: int = 8,
+                 per_host_limit: int = 2, multipart_threshold: int = 32 * 2**20, max_parts: int = 4,
+                 chunk_size: int = 2**20, max_retries: int = 3, timeout: float = 600,
+                 on_progress: Optional[Callable[[DownloadProgress], None]] = print_progress,
+                 progress_interval: float = 1.0):
+        self.download_path = Path(download_path)
+        self.download_path.mkdir(parents=True, exist_ok=True)
+        self.extensions = tuple(e.lower() if e.startswith(".") else f".{e.lower()}" for e in extensions)
+        self.max_concurrency = max_concurrency
+        self.per_host_limit = per_host_limit
+        self.multipart_threshold = multipart_threshold
+        self.max_parts = max_parts
+        self.chunk_size = chunk_size
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}  # url -> future of its path
+        self._reserved = set()  # Target names claimed by running downloads
+        index_file = self.download_path / self.INDEX_NAME
+        self._index = json.loads(index_file.read_text()) if index_file.exists() else {"urls": {}, "hashes": {}}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_slots:
+            self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_slots[host]
+
+    def collect_links(self, result: CrawlResult) -> List[str]:
+        """Absolute URLs of links in `result.links` whose path ends in one of `extensions`, in page order."""
+        urls = []
+        for link in result.links.get("internal", []) + result.links.get("external", []):
+            href = link.get("href") if isinstance(link, dict) else link
+            if href and urlparse(href).path.lower().endswith(self.extensions):
+                urls.append(href)
+        return list(dict.fromkeys(urls))
+
+    async def download_all(self, urls: Iterable[str]) -> List[str]:
+        """Download `urls` concurrently; returns the paths that succeeded, in input order."""
+        urls = list(urls)
+        results = await asyncio.gather(*(self.download(url) for url in urls), return_exceptions=True)
+        paths = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):
+                print(f"Error downloading {url}: {result}")
+            else:
+                paths.append(result)
+        return list(dict.fromkeys(paths))
+
+    async def download(self, url: str) -> str:
+        known = self._index["urls"].get(url)
+        if known and (self.download_path / known).exists():
+            return str(self.download_path / known)
+        if url in self._inflight:  # Same file linked from several pages crawled at once
+            return await asyncio.shield(self._inflight[url])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[url] = future
+        try:
+            self._ensure_session()
+            async with self._slots:
+                path = await self._download_with_retries(url)
+            future.set_result(path)
+            return path
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved so an unawaited future does not warn
+            raise
+        finally:
+            del self._inflight[url]
+
+    async def _download_with_retries(self, url: str) -> str:
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await self._download(url)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(2 ** attempt)  # The next attempt resumes from the .part files
+
+    async def _probe(self, url: str) -> Tuple[Optional[int], bool, str, Optional[str]]:
+        """(size, accepts_ranges, validator, filename) from a HEAD request, tolerating servers that reject HEAD."""
+        async with self._host_slot(url):
+            async with self._session.head(url, allow_redirects=True) as response:
+                if response.status >= 400:
+                    return None, False, "", None
+                headers = response.headers
+        size = int(headers["Content-Length"]) if headers.get("Content-Length", "").isdigit() else None
+        accepts_ranges = headers.get("Accept-Ranges", "").lower() == "bytes"
+        validator = headers.get("ETag") or headers.get("Last-Modified") or ""
+        match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', headers.get("Content-Disposition", ""))
+        return size, accepts_ranges, validator, unquote(match.group(1)) if match else None
+
+    def _target_name(self, url: str, suggested: Optional[str]) -> str:
+        name = os.path.basename(suggested or unquote(urlparse(url).path)) or "download"
+        stem, ext = os.path.splitext(name)
+        candidate, n = name, 1
+        # A different URL may already own this name; "file.zip" becomes "file (1).zip"
+        while candidate in self._reserved or (self.download_path / candidate).exists() \
+                and candidate not in self._resumable_names(url):
+            candidate, n = f"{stem} ({n}){ext}", n + 1
+        return candidate
+
+    def _resumable_names(self, url: str) -> set:
+        # A name whose .part files were left by an earlier run of this same URL
+        names = set()
+        for meta in self.download_path.glob("*.part.json"):
+            try:
+                if json.loads(meta.read_text()).get("url") == url:
+                    names.add(meta.name[:-len(".part.json")])
+            except ValueError:
+                pass
+        return names
+
+    async def _download(self, url: str) -> str:
+        size, accepts_ranges, validator, suggested = await self._probe(url)
+        resumable = self._resumable_names(url)
+        name = next(iter(resumable)) if resumable else self._target_name(url, suggested)
+        self._reserved.add(name)
+        try:
+            target = self.download_path / name
+            meta_file = self.download_path / f"{name}.part.json"
+            meta = json.loads(meta_file.read_text()) if meta_file.exists() else {}
+            if meta.get("validator") != validator or meta.get("size") != size:
+                self._remove_parts(name, meta.get("parts", 1))  # Server copy changed: start over
+
+            n_parts = self.max_parts if size and accepts_ranges and size >= self.multipart_threshold else 1
+            meta = {"url": url, "validator": validator, "size": size, "parts": n_parts}
+            meta_file.write_text(json.dumps(meta))
+
+            ranges = self._split(size, n_parts)
+            progress = [self._part_file(name, i).stat().st_size if self._part_file(name, i).exists() else 0
+                        for i in range(n_parts)]
+            reporter = self._reporter(url, str(target), size, progress)
+            await asyncio.gather(*(
+                self._fetch_part(url, self._part_file(name, i), start, end, n_parts > 1, progress, i, reporter)
+                for i, (start, end) in enumerate(ranges)
+            ))
+            digest = await self._assemble(name, n_parts, target)
+            meta_file.unlink()
+        finally:
+            self._reserved.discard(name)
+
+        existing = self._index["hashes"].get(digest)
+        if existing and existing != name and (self.download_path / existing).exists():
+            target.unlink()  # Same bytes as a file we already have
+            name = existing
+        else:
+            self._index["hashes"][digest] = name
+        self._index["urls"][url] = name
+        (self.download_path / self.INDEX_NAME).write_text(json.dumps(self._index, indent=2))
+        if self.on_progress:
+            self.on_progress(DownloadProgress(url, str(self.download_path / name), sum(progress), size, done=True))
+        return str(self.download_path / name)
+
+    @staticmethod
+    def _split(size: Optional[int], n_parts: int) -> List[Tuple[int, Optional[int]]]:
+        """Inclusive byte ranges; the last one is open-ended when the size is unknown."""
+        if not size or n_parts == 1:
+            return [(0, size - 1 if size else None)]
+        step = -(-size // n_parts)
+        return [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+    def _part_file(self, name: str, index: int) -> Path:
+        return self.download_path / f"{name}.part{index}"
+
+    def _remove_parts(self, name: str, n_parts: int) -> None:
+        for i in range(max(n_parts, self.max_parts)):
+            self._part_file(name, i).unlink(missing_ok=True)
+
+    def _reporter(self, url: str, path: str, size: Optional[int], progress: List[int]) -> Callable[[], None]:
+        last = 0.0
+
+        def report():
+            nonlocal last
+            if self.on_progress and time.monotonic() - last >= self.progress_interval:
+                last = time.monotonic()
+                self.on_progress(DownloadProgress(url, path, sum(progress), size))
+        return report
+
+    async def _fetch_part(self, url: str, part: Path, start: int, end: Optional[int], multipart: bool,
+                          progress: List[int], index: int, report: Callable[[], None]) -> None:
+        have = progress[index]
+        if end is not None and have >= end - start + 1:
+            return  # Finished in an earlier run
+        headers = {}
+        if multipart:
+            headers["Range"] = f"bytes={start + have}-{end}"
+        elif have:
+            headers["Range"] = f"bytes={have}-"  # Resume; open-ended in case the size was unknown
+
+        async with self._host_slot(url):
+            async with self._session.get(url, headers=headers) as response:
+                if response.status == 416 and end is None:
+                    return  # Nothing left after the bytes we have
+                response.raise_for_status()
+                mode = "ab"
+                if "Range" in headers and response.status != 206:
+                    if multipart:  # Parts cannot be rebuilt from a full body
+                        raise aiohttp.ClientPayloadError(f"{url} ignored the Range header")
+                    mode, progress[index] = "wb", 0  # Whole body came back: restart the file
+                async with aiofiles.open(part, mode) as f:
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        await f.write(chunk)
+                        progress[index] += len(chunk)
+                        report()
+
+    async def _assemble(self, name: str, n_parts: int, target: Path) -> str:
+        """Join the parts into `target` and return its SHA-256, reading each byte once."""
+        sha256 = hashlib.sha256()
+        first = self._part_file(name, 0)
+        if n_parts == 1:
+            async with aiofiles.open(first, "rb") as f:
+                while chunk := await f.read(self.chunk_size):
+                    sha256.update(chunk)
+            os.replace(first, target)
+            return sha256.hexdigest()
+
+        async with aiofiles.open(target, "wb") as out:
+            for i in range(n_parts):
+                async with aiofiles.open(self._part_file(name, i), "rb") as f:
+                    while chunk := await f.read(self.chunk_size):
+                        sha256.update(chunk)
+                        await out.write(chunk)
+        self._remove_parts(name, n_parts)
+        return sha256.hexdigest()
+
+
+class DownloadingCrawler(AsyncWebCrawler):
+    """
+    AsyncWebCrawler with a download stage: after each successful crawl, the
+    links `download_manager` matches are fetched and added to
+    `result.downloaded_files`.
+
+    The manager belongs to the crawler, not to the run config, so any stock
+    CrawlerRunConfig (and its clones) works unchanged. arun_many goes through
+    `arun`, so batch crawls share the manager's per-host limits, and a file
+    linked from several pages is fetched once.
+    """
+
+    def __init__(self, *args, download_manager: Optional[DownloadManager] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.download_manager = download_manager
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs) -> CrawlResult:
+        result = await super().arun(url, config=config, **kwargs)
+        manager = self.download_manager
+        if manager and result.success:
+            paths = await manager.download_all(manager.collect_links(result))
+            result.downloaded_files = (result.downloaded_files or []) + paths
+        return result
+
+
+async def main():
+    # Same page and extensions as p1.py
+    download_path = os.path.join(Path.home(), ".crawl4ai", "downloads")
+    async with DownloadManager(
+        download_path,
+        extensions=(".exe", ".msi", ".zip", ".pdf", ".doc", ".docx"),
+        max_concurrency=8,
+        per_host_limit=4,                 # python.org serves every file from one host
+        multipart_threshold=16 * 2**20,   # Installers above 16 MB come in 4 parallel ranges
+    ) as manager:
+        config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+        async with DownloadingCrawler(config=BrowserConfig(headless=True), download_manager=manager) as crawler:
+            result = await crawler.arun("https://www.python.org/downloads/windows/", config=config)
+            if result.success:
+                print(f"{len(result.downloaded_files or [])} files in {download_path}")
+            else:
+                print(f"Failed to crawl: {result.error_message}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
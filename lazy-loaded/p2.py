@@ -0,0 +1,188 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai.async_configs import CacheMode
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+
+# Installed once per page. Records when the DOM last changed and which images are in the viewport.
+INSTALL_OBSERVERS = """
+() => {
+    if (window.__scrollWatch) return;
+    const watch = window.__scrollWatch = {lastMutation: performance.now(), visible: new Set()};
+    const images = new IntersectionObserver(entries => {
+        for (const e of entries) e.isIntersecting ? watch.visible.add(e.target) : watch.visible.delete(e.target);
+    });
+    document.querySelectorAll('img').forEach(img => images.observe(img));
+    new MutationObserver(mutations => {
+        watch.lastMutation = performance.now();
+        for (const m of mutations) for (const node of m.addedNodes) {
+            if (node.nodeType !== 1) continue;
+            if (node.tagName === 'IMG') images.observe(node);
+            node.querySelectorAll && node.querySelectorAll('img').forEach(img => images.observe(img));
+        }
+    }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['src', 'srcset']});
+}
+"""
+
+PAGE_STATE = """
+() => {
+    const watch = window.__scrollWatch;
+    let pendingImages = 0;
+    for (const img of watch.visible) if (img.isConnected && !img.complete) pendingImages++;
+    return {
+        quietMs: performance.now() - watch.lastMutation,
+        pendingImages,
+        height: document.documentElement.scrollHeight,
+    };
+}
+"""
+
+# Long-lived connections never finish, so they do not count against network idle
+IGNORED_RESOURCE_TYPES = {"websocket", "eventsource", "media", "manifest", "other"}
+
+
+@dataclass
+class ScrollReport:
+    steps: int
+    seconds: float
+    final_height: int
+    stop_reason: str
+
+
+class AdaptiveScrollCrawlerStrategy(AsyncPlaywrightCrawlerStrategy):
+    """
+    scan_full_page that moves on as soon as the page settles instead of after a fixed delay.
+
+    After each viewport-sized step it waits until all of the following hold:
+    the DOM has not changed for `quiet_ms`, no requests are in flight, and
+    every image in the viewport has loaded. It waits at most
+    `max_step_wait` seconds per step. Scrolling stops when the bottom has
+    been reached and the height did not grow for `stable_rounds` steps, or
+    after `max_scroll_time` seconds, or at `max_scroll_height` pixels. Growth
+    restarts the count of stable steps. The steps, time and stop reason of
+    each crawl are logged and kept in `scroll_reports`, keyed by URL. Only
+    the last `max_reports` are kept, so long crawls do not accumulate them.
+    `scroll_delay` from CrawlerRunConfig becomes the minimum wait per step.
+    """
+
+    def __init__(self, *args, quiet_ms: int = 300, max_step_wait: float = 3.0, max_scroll_time: float = 30.0,
+                 max_scroll_height: int = 50_000, stable_rounds: int = 2, max_reports: int = 1000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.quiet_ms = quiet_ms
+        self.max_step_wait = max_step_wait
+        self.max_scroll_time = max_scroll_time
+        self.max_scroll_height = max_scroll_height
+        self.stable_rounds = stable_rounds
+        self.max_reports = max_reports
+        self.scroll_reports: "OrderedDict[str, ScrollReport]" = OrderedDict()
+
+    async def _wait_for_settle(self, page, inflight: set, min_delay: float) -> int:
+        """Wait until the page settles (or max_step_wait passes); returns the page height."""
+        started = time.monotonic()
+        await page.wait_for_timeout(min_delay * 1000)
+        while True:
+            state = await page.evaluate(PAGE_STATE)
+            settled = state["quietMs"] >= self.quiet_ms and not inflight and not state["pendingImages"]
+            if settled or time.monotonic() - started >= self.max_step_wait:
+                return state["height"]
+            await page.wait_for_timeout(50)
+
+    async def _handle_full_page_scan(self, page, scroll_delay: float = 0.1):
+        started = time.monotonic()
+        steps, stable, height, reason = 0, 0, 0, "bottom reached"
+        inflight = set()
+
+        def on_request(request):
+            if request.resource_type not in IGNORED_RESOURCE_TYPES:
+                inflight.add(request)
+
+        def on_done(request):
+            inflight.discard(request)
+
+        page.on("request", on_request)
+        page.on("requestfinished", on_done)
+        page.on("requestfailed", on_done)
+        try:
+            await page.evaluate(INSTALL_OBSERVERS)
+            viewport_height = page.viewport_size.get("height", self.browser_config.viewport_height)
+            height = await self._wait_for_settle(page, inflight, 0)
+            position = 0
+            while True:
+                if time.monotonic() - started >= self.max_scroll_time:
+                    reason = "time cap"
+                    break
+                if position >= self.max_scroll_height:
+                    reason = "height cap"
+                    break
+                position = min(position + viewport_height, height)
+                await self.csp_scroll_to(page, 0, position)
+                steps += 1
+                if position + viewport_height >= height:
+                    # Infinite scroll only starts loading once the bottom is in view: restart the quiet window
+                    await page.evaluate("() => { window.__scrollWatch.lastMutation = performance.now(); }")
+                new_height = await self._wait_for_settle(page, inflight, scroll_delay)
+                if new_height > height:
+                    stable = 0  # Rounds at the old bottom no longer count
+                elif position + viewport_height >= new_height:  # Bottom of the page is in view
+                    stable += 1
+                    if stable >= self.stable_rounds:
+                        break
+                height = new_height
+        except Exception as e:
+            reason = f"error: {e}"
+            self.logger.warning(
+                message="Failed to perform full page scan: {error}",
+                tag="PAGE_SCAN",
+                params={"error": str(e)},
+            )
+        finally:
+            page.remove_listener("request", on_request)
+            page.remove_listener("requestfinished", on_done)
+            page.remove_listener("requestfailed", on_done)
+
+        report = ScrollReport(steps, time.monotonic() - started, height, reason)
+        self.scroll_reports.pop(page.url, None)
+        self.scroll_reports[page.url] = report
+        while len(self.scroll_reports) > self.max_reports:
+            self.scroll_reports.popitem(last=False)
+        self.logger.info(
+            message="{steps} scroll steps in {seconds:.2f}s, height {height}px ({reason})",
+            tag="SCROLL",
+            params={"steps": steps, "seconds": report.seconds, "height": height, "reason": reason},
+        )
+
+
+async def main():
+    browser_config = BrowserConfig(headless=True)
+    strategy = AdaptiveScrollCrawlerStrategy(
+        browser_config=browser_config,
+        quiet_ms=300,            # DOM unchanged for 300 ms counts as settled
+        max_step_wait=3.0,       # Never wait longer than this on one step
+        max_scroll_time=20.0,    # Whole scan budget
+        max_scroll_height=40_000,
+        stable_rounds=2,         # Stop after two steps at the bottom without growth
+    )
+    # Same crawl as p1.py; the engine waits for viewport images itself, so wait_for_images is not needed
+    config = CrawlerRunConfig(
+        scan_full_page=True,
+        scroll_delay=0.05,       # Now only the minimum pause per step
+        cache_mode=CacheMode.BYPASS,
+        verbose=True
+    )
+
+    async with AsyncWebCrawler(crawler_strategy=strategy, config=browser_config) as crawler:
+        result = await crawler.arun("https://www.pexels.com", config=config)
+        if result.success:
+            images = result.media.get("images", [])
+            report = strategy.scroll_reports.get(result.redirected_url or result.url)  # Keyed by the final URL
+            print("Images found:", len(images))
+            if report:
+                print(f"Scroll: {report.steps} steps, {report.seconds:.1f}s, stopped on {report.stop_reason}")
+        else:
+            print("Error:", result.error_message)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,247 @@
+import asyncio
+import math
+import time
+
+import numpy as np
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig, CacheMode
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+# get_text() on an ordinary tag only counts strings of exactly these types
+MAIN_TEXT_TYPES = {NavigableString, CData}
+
+
+class VectorizedPruningContentFilter(PruningContentFilter):
+    """
+    PruningContentFilter with the per-node scoring done in NumPy.
+
+    The stock filter walks the tree top-down. At every node it re-serializes
+    and re-reads the node's whole subtree (get_text, encode_contents), which
+    is quadratic on deep pages. Here one bottom-up pass collects every node's
+    text length, inner HTML length, direct link text, tag weight and
+    class/id weight into arrays. All scores and dynamic thresholds are then
+    computed at once, and a node is removed when it fails and no ancestor
+    already did. Every arithmetic step runs in the same order as the stock
+    filter, and log() is taken with math.log on the distinct lengths, so the
+    kept blocks are identical.
+    """
+
+    def filter_content(self, html: str, min_word_threshold: int = None):
+        if not html or not isinstance(html, str):
+            return []
+
+        soup = BeautifulSoup(html, "lxml")
+        if not soup.body:
+            soup = BeautifulSoup(f"<body>{html}</body>", "lxml")
+        self._remove_comments(soup)
+        self._remove_unwanted_tags(soup)
+        body = soup.find("body")
+
+        nodes, parents, features = self._collect_features(body)
+        remove = self._removal_mask(nodes, features)
+
+        # A failed node is only decomposed if no ancestor was; its descendants go with it
+        removed = np.zeros(len(nodes), dtype=bool)
+        for i in range(len(nodes)):
+            parent_removed = parents[i] >= 0 and removed[parents[i]]
+            removed[i] = parent_removed or remove[i]
+            if remove[i] and not parent_removed:
+                nodes[i].decompose()
+
+        content_blocks = []
+        for element in body.children:
+            if isinstance(element, str) or not hasattr(element, "name"):
+                continue
+            if len(element.get_text(strip=True)) > 0:
+                content_blocks.append(str(element))
+        return content_blocks
+
+    def _collect_features(self, body: Tag):
+        # Pre-order list, so every child comes after its parent
+        nodes, parents = [], []
+        stack = [(body, -1)]
+        while stack:
+            node, parent = stack.pop()
+            index = len(nodes)
+            nodes.append(node)
+            parents.append(parent)
+            stack.extend((child, index) for child in reversed(node.contents) if isinstance(child, Tag))
+
+        n = len(nodes)
+        index_of = {id(node): i for i, node in enumerate(nodes)}
+        text_len = np.zeros(n, dtype=np.int64)       # len(get_text(strip=True)) with the node's own string types
+        main_text_len = np.zeros(n, dtype=np.int64)  # ... counting only ordinary strings, as ancestors see it
+        spaces = np.zeros(n, dtype=np.int64)         # spaces in that text, for min_word_threshold
+        tag_len = np.zeros(n, dtype=np.int64)        # len(encode_contents().decode())
+        outer_len = np.zeros(n, dtype=np.int64)
+        link_text_len = np.zeros(n, dtype=np.int64)
+        tag_weight = np.empty(n)
+        class_score = np.empty(n)
+        formatter = body.formatter_for_name("minimal")
+
+        # Children before parents: each node sums what its children already computed
+        for i in range(n - 1, -1, -1):
+            node = nodes[i]
+            text = own_spaces = inner = 0
+            for child in node.contents:
+                if isinstance(child, Tag):
+                    j = index_of[id(child)]
+                    text += main_text_len[j]
+                    own_spaces += spaces[j]
+                    inner += outer_len[j]
+                else:
+                    inner += len(child.output_ready(formatter))
+                    if type(child) in MAIN_TEXT_TYPES:
+                        stripped = child.strip()
+                        text += len(stripped)
+                        own_spaces += stripped.count(" ")
+            main_text_len[i] = text
+            spaces[i] = own_spaces
+            if node.interesting_string_types == MAIN_TEXT_TYPES:
+                text_len[i] = text
+            else:  # e.g. <template>, whose own text is of another string type
+                own_text = node.get_text(strip=True)
+                text_len[i] = len(own_text)
+                spaces[i] = own_text.count(" ")
+            tag_len[i] = inner
+            outer_len[i] = inner + self._tag_markup_len(node, formatter)
+
+            link_text_len[i] = sum(
+                len(s.strip()) for s in (a.string for a in node.find_all("a", recursive=False)) if s
+            )
+            tag_weight[i] = self.tag_weights.get(node.name, 0.5)
+            class_score[i] = self._compute_class_id_weight(node)
+
+        return nodes, parents, {
+            "tag_name": [node.name for node in nodes],
+            "text_len": text_len,
+            "tag_len": tag_len,
+            "link_text_len": link_text_len,
+            "tag_weight": tag_weight,
+            "class_score": class_score,
+            "word_count": spaces + 1,
+        }
+
+    @staticmethod
+    def _tag_markup_len(node: Tag, formatter) -> int:
+        if hasattr(node, "_format_tag"):  # beautifulsoup4 >= 4.13
+            length = len(node._format_tag("utf-8", formatter, opening=True))
+            if not node.is_empty_element:
+                length += len(node._format_tag("utf-8", formatter, opening=False))
+            return length
+        return len(node.decode(formatter=formatter)) - len(node.decode_contents(formatter=formatter))
+
+    def _removal_mask(self, nodes, f) -> np.ndarray:
+        text_len = f["text_len"].astype(float)
+        tag_len = f["tag_len"].astype(float)
+        link_text_len = f["link_text_len"].astype(float)
+        has_text, has_tag = text_len > 0, tag_len > 0
+
+        # Same terms, accumulated in the same order, as _compute_composite_score
+        score = np.zeros(len(nodes))
+        total_weight = 0.0
+        if self.metric_config["text_density"]:
+            density = np.divide(text_len, tag_len, out=np.zeros_like(text_len), where=has_tag)
+            score = score + self.metric_weights["text_density"] * density
+            total_weight += self.metric_weights["text_density"]
+        if self.metric_config["link_density"]:
+            density = 1 - np.divide(link_text_len, text_len, out=np.zeros_like(text_len), where=has_text)
+            score = score + self.metric_weights["link_density"] * density
+            total_weight += self.metric_weights["link_density"]
+        if self.metric_config["tag_weight"]:
+            score = score + self.metric_weights["tag_weight"] * f["tag_weight"]
+            total_weight += self.metric_weights["tag_weight"]
+        if self.metric_config["class_id_weight"]:
+            score = score + self.metric_weights["class_id_weight"] * np.maximum(0, f["class_score"])
+            total_weight += self.metric_weights["class_id_weight"]
+        if self.metric_config["text_length"]:
+            # math.log on each distinct length keeps results bit-identical to the stock filter
+            unique, inverse = np.unique(f["text_len"], return_inverse=True)
+            logs = np.array([math.log(v + 1) for v in unique.tolist()])[inverse]
+            score = score + self.metric_weights["text_length"] * logs
+            total_weight += self.metric_weights["text_length"]
+        score = score / total_weight if total_weight > 0 else np.zeros(len(nodes))
+
+        if self.min_word_threshold:
+            score[f["word_count"] < self.min_word_threshold] = -1.0
+
+        if self.threshold_type == "fixed":
+            return score < self.threshold
+
+        threshold = np.full(len(nodes), self.threshold)
+        importance = np.array([self.tag_importance.get(name, 0.7) for name in f["tag_name"]])
+        text_ratio = np.divide(text_len, tag_len, out=np.zeros_like(text_len), where=has_tag)
+        link_ratio = np.divide(link_text_len, text_len, out=np.ones_like(text_len), where=has_text)
+        threshold[importance > 1] *= 0.8
+        threshold[text_ratio > 0.4] *= 0.9
+        threshold[link_ratio > 0.6] *= 1.2
+        return score < threshold
+
+
+def fixture_corpus():
+    """Small pages exercising nesting, link-heavy blocks, negative classes, entities and void tags."""
+    yield "<p>Just a paragraph of text without a body tag, &amp; an entity.</p>"
+    yield """<html><body>
+        <div class="sidebar"><a href="/a">Home</a> <a href="/b">About</a></div>
+        <article><h1>Title</h1><p>Long paragraph with <b>bold</b>, <a href="/x">a link</a> and more text to
+        make it dense enough.</p><img src="x.png" alt="x"><br><p>Second &lt;para&gt; here.</p></article>
+        <div id="comments"><p>Comment one</p><p>Comment two</p></div>
+        <template><p>Template text</p></template>
+        <ul><li><a href="/1">One</a></li><li><a href="/2">Two</a></li><li>Three, plain</li></ul>
+    </body></html>"""
+    for depth in (5, 30):
+        nested = "".join(f"<div class='level-{d}'><span>Level {d} text</span>" for d in range(depth))
+        yield f"<html><body>{nested}<p>{'Deep content. ' * 40}</p>{'</div>' * depth}</body></html>"
+    rows = "".join(
+        f"<tr><td><a href='/item/{i}'>Item {i}</a></td><td>{'Description words ' * (i % 9)}</td></tr>" for i in range(300)
+    )
+    yield f"<html><body><main><section><table>{rows}</table></section></main></body></html>"
+
+
+# Threshold modes the parity check covers
+PARITY_SETTINGS = (
+    {"threshold": 0.4, "threshold_type": "fixed"},
+    {"threshold": 0.48, "threshold_type": "dynamic"},
+    {"threshold": 0.3, "threshold_type": "fixed", "min_word_threshold": 3},
+)
+
+
+def check_parity(pages, **filter_kwargs) -> int:
+    """Compare against the stock filter; returns the number of pages whose output differs."""
+    mismatches = 0
+    for page in pages:
+        expected = PruningContentFilter(**filter_kwargs).filter_content(page)
+        actual = VectorizedPruningContentFilter(**filter_kwargs).filter_content(page)
+        if expected != actual:
+            mismatches += 1
+    return mismatches
+
+
+async def main():
+    # 1. Regression check against the stock filter over the fixture corpus, for every threshold mode
+    corpus = list(fixture_corpus())
+    for kwargs in PARITY_SETTINGS:
+        print(f"{kwargs}: {check_parity(corpus, **kwargs)} mismatching pages out of {len(corpus)}")
+
+    # 2. Same setup as quickstart/p3.py, with the vectorized filter
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        markdown_generator=DefaultMarkdownGenerator(
+            content_filter=VectorizedPruningContentFilter(threshold=0.4, threshold_type="fixed")
+        )
+    )
+    async with AsyncWebCrawler() as crawler:
+        result = await crawler.arun("https://news.ycombinator.com", config=config)
+        print("Raw Markdown length:", len(result.markdown.raw_markdown))
+        print("Fit Markdown length:", len(result.markdown.fit_markdown))
+
+        # 3. Timing and parity on the live page
+        for name, cls in (("stock", PruningContentFilter), ("vectorized", VectorizedPruningContentFilter)):
+            started = time.perf_counter()
+            blocks = cls(threshold=0.4, threshold_type="fixed").filter_content(result.cleaned_html)
+            print(f"{name:10} {len(blocks)} blocks in {(time.perf_counter() - started) * 1000:.1f} ms")
+        print("Live page mismatches:", check_parity([result.cleaned_html], threshold=0.4, threshold_type="fixed"))
+
+if __name__ == "__main__":
+    asyncio.run(main())
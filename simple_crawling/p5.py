@@ -0,0 +1,275 @@
+import asyncio
+import contextvars
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+from crawl4ai import AsyncWebCrawler
+from crawl4ai.async_configs import CrawlerRunConfig, CacheMode
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.models import AsyncCrawlResponse
+
+try:
+    import zstandard  # pip install zstandard
+except ImportError:  # Fall back to zlib so the cache still works without it
+    zstandard = None
+
+
+class CrawlCache:
+    """
+    Content-addressed on-disk HTML cache.
+
+    Bodies are stored once per SHA-256 of their content (compressed with zstd,
+    or zlib when zstandard is missing), so identical pages served under many
+    URLs take the space of one. A SQLite index maps each URL to its body hash,
+    ETag/Last-Modified validators and expiry time. Least recently used URLs
+    are evicted once stored bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 1 << 30, default_ttl: float = 24 * 3600):
+        self.blob_dir = Path(cache_dir) / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.codec = "zst" if zstandard else "zz"
+        self.db = sqlite3.connect(Path(cache_dir) / "index.sqlite")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                status_code INTEGER,
+                expires_at REAL,
+                last_access REAL
+            );
+            CREATE TABLE IF NOT EXISTS blobs (
+                content_hash TEXT PRIMARY KEY,
+                path TEXT NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_by_access ON entries (last_access);
+        """)
+
+    def _compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=10).compress(data) if self.codec == "zst" else zlib.compress(data, 6)
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        if path.endswith(".zst"):
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def lookup(self, url: str, touch: bool = True) -> Optional[dict]:
+        row = self.db.execute(
+            "SELECT e.content_hash, e.etag, e.last_modified, e.status_code, e.expires_at, b.path "
+            "FROM entries e JOIN blobs b USING (content_hash) WHERE e.url = ?",
+            (url,),
+        ).fetchone()
+        if row is None:
+            return None
+        if touch:
+            self.db.execute("UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url))
+            self.db.commit()
+        content_hash, etag, last_modified, status_code, expires_at, path = row
+        return {
+            "content_hash": content_hash,
+            "etag": etag,
+            "last_modified": last_modified,
+            "status_code": status_code,
+            "expires_at": expires_at,
+            "path": path,
+        }
+
+    def read_body(self, entry: dict) -> Optional[str]:
+        """The stored body, or None if eviction removed it after `lookup`."""
+        try:
+            data = Path(entry["path"]).read_bytes()
+        except FileNotFoundError:
+            return None
+        return self._decompress(entry["path"], data).decode("utf-8")
+
+    def store(self, url: str, body: str, etag=None, last_modified=None, status_code=200, ttl=None) -> None:
+        data = body.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        if self.db.execute("SELECT 1 FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone() is None:
+            path = self.blob_dir / content_hash[:2] / f"{content_hash}.{self.codec}"
+            path.parent.mkdir(exist_ok=True)
+            compressed = self._compress(data)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(compressed)
+            os.replace(tmp_path, path)  # Readers never see a half-written blob
+            self.db.execute("INSERT INTO blobs VALUES (?, ?, ?)", (content_hash, str(path), len(compressed)))
+        now = time.time()
+        self.db.execute(
+            "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (url, content_hash, etag, last_modified, status_code, now + (ttl or self.default_ttl), now),
+        )
+        self.db.commit()
+        self.evict()
+
+    def refresh(self, url: str, ttl=None) -> None:
+        """Extend an entry after the server answered 304 Not Modified."""
+        now = time.time()
+        self.db.execute(
+            "UPDATE entries SET expires_at = ?, last_access = ? WHERE url = ?",
+            (now + (ttl or self.default_ttl), now, url),
+        )
+        self.db.commit()
+
+    def total_bytes(self) -> int:
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+
+    def evict(self) -> None:
+        """Drop least recently used URLs, one at a time, until the stored bodies fit in max_bytes."""
+        total = self.total_bytes()
+        if total <= self.max_bytes:
+            return
+        for url, content_hash in self.db.execute("SELECT url, content_hash FROM entries ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM entries WHERE url = ?", (url,))
+            # The body goes once no other URL points to it
+            if self.db.execute("SELECT 1 FROM entries WHERE content_hash = ?", (content_hash,)).fetchone():
+                continue
+            path, size = self.db.execute("SELECT path, size FROM blobs WHERE content_hash = ?", (content_hash,)).fetchone()
+            Path(path).unlink(missing_ok=True)
+            self.db.execute("DELETE FROM blobs WHERE content_hash = ?", (content_hash,))
+            total -= size
+        self.db.commit()
+
+
+# The cache mode the caller asked for; RevalidatingCrawler hands the built-in cache BYPASS instead
+_requested_cache_mode: contextvars.ContextVar[Optional[CacheMode]] = contextvars.ContextVar("cache_mode", default=None)
+
+
+class RevalidatingCacheStrategy(AsyncCrawlerStrategy):
+    """
+    HTTP crawler strategy backed by CrawlCache.
+
+    Pages are fetched with httpx, not a browser: JavaScript does not run, so
+    content rendered client-side is missing, and there are no screenshots
+    or page hooks. Use it for server-rendered pages.
+
+    The cache mode of each run decides what happens. With ENABLED or
+    READ_ONLY, fresh entries are served from disk. Stale ones are
+    revalidated with If-None-Match/If-Modified-Since, and a 304 reuses the
+    stored body. Only ENABLED and WRITE_ONLY write to the cache: new bodies
+    and the new expiry after a 304. BYPASS and DISABLED fetch without the
+    cache. A body evicted between lookup and read counts as a miss. Use it
+    through RevalidatingCrawler, so that this is the only cache layer.
+    """
+
+    def __init__(self, cache: CrawlCache, **kwargs):
+        self.cache = cache
+        self.client = httpx.AsyncClient(follow_redirects=True, timeout=30.0)
+        self.stats = {"fresh": 0, "not_modified": 0, "fetched": 0}
+        self.logger = None  # AsyncWebCrawler attaches its own logger
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.client.aclose()
+
+    async def crawl(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs) -> AsyncCrawlResponse:
+        mode = _requested_cache_mode.get() or (config.cache_mode if config else None) or CacheMode.ENABLED
+        writable = mode in (CacheMode.ENABLED, CacheMode.WRITE_ONLY)
+        entry = self.cache.lookup(url, touch=writable) if mode in (CacheMode.ENABLED, CacheMode.READ_ONLY) else None
+        body = self.cache.read_body(entry) if entry else None
+        if body is None:
+            entry = None
+
+        if entry and entry["expires_at"] > time.time():
+            self.stats["fresh"] += 1
+            return AsyncCrawlResponse(html=body, response_headers={}, status_code=entry["status_code"])
+
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        response = await self.client.get(url, headers=headers)
+
+        if response.status_code == 304 and entry:
+            self.stats["not_modified"] += 1
+            if writable:
+                self.cache.refresh(url)
+            return AsyncCrawlResponse(html=body, response_headers=dict(response.headers), status_code=entry["status_code"])
+
+        self.stats["fetched"] += 1
+        if writable and response.status_code == 200:
+            self.cache.store(
+                url,
+                response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+                status_code=response.status_code,
+            )
+        return AsyncCrawlResponse(html=response.text, response_headers=dict(response.headers), status_code=response.status_code)
+
+    async def crawl_many(self, urls: List[str], **kwargs) -> List[AsyncCrawlResponse]:
+        return await asyncio.gather(*(self.crawl(url, **kwargs) for url in urls))
+
+    async def take_screenshot(self, **kwargs) -> Optional[str]:
+        return None  # Fetched over HTTP: there is no page to capture
+
+    def update_user_agent(self, user_agent: str):
+        self.client.headers["User-Agent"] = user_agent
+
+    def set_hook(self, hook_type: str, hook):
+        pass  # No browser, so there are no page hooks to run
+
+
+class RevalidatingCrawler(AsyncWebCrawler):
+    """
+    AsyncWebCrawler that serves pages through a RevalidatingCacheStrategy.
+
+    Each run's `cache_mode` goes to the strategy, and the built-in cache
+    always sees BYPASS. Otherwise it would answer from its own copy before the
+    strategy could revalidate.
+    """
+
+    def __init__(self, cache: CrawlCache, *args, **kwargs):
+        kwargs["crawler_strategy"] = RevalidatingCacheStrategy(cache)
+        super().__init__(*args, **kwargs)
+
+    async def arun(self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs):
+        config = config or CrawlerRunConfig()
+        token = _requested_cache_mode.set(config.cache_mode)
+        try:
+            return await super().arun(url, config=config.clone(cache_mode=CacheMode.BYPASS), **kwargs)
+        finally:
+            _requested_cache_mode.reset(token)
+
+
+async def main():
+    cache_dir = os.path.join(Path.home(), ".crawl4ai", "http_cache")
+    cache = CrawlCache(cache_dir, max_bytes=512 * 1024 * 1024, default_ttl=3600)
+
+    run_config = CrawlerRunConfig(
+        word_count_threshold=10,
+        exclude_external_links=True,
+        cache_mode=CacheMode.ENABLED  # Served by the revalidating cache; the built-in one is bypassed
+    )
+
+    async with RevalidatingCrawler(cache) as crawler:
+        for _ in range(2):  # The second crawl is served from the cache
+            result = await crawler.arun(
+                url="https://www.datacamp.com/blog/category/machine-learning",
+                config=run_config
+            )
+            if result.success:
+                print("Content:", result.markdown[:200])
+            else:
+                print(f"Crawl failed: {result.error_message}")
+
+    print("Cache stats:", crawler.crawler_strategy.stats, "| stored bytes:", cache.total_bytes())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable
+
+from crawl4ai import AsyncWebCrawler, LXMLWebScrapingStrategy
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.content_filter_strategy import PruningContentFilter
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+# Settings that never change a stage's output
+IGNORED_SETTINGS = {"logger"}
+# Memory addresses in reprs would make every run's fingerprint different
+ADDRESS = re.compile(r" at 0x[0-9a-fA-F]+")
+
+
+def _plain(value: Any, depth: int) -> Any:
+    """JSON-ready form of a setting. Objects become their class and settings, `depth` levels down."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_plain(v, depth) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted((_plain(v, depth) for v in value), key=repr)
+    if isinstance(value, dict):
+        return {str(k): _plain(v, depth) for k, v in value.items()}
+    if depth > 0 and hasattr(value, "__dict__") and not callable(value):
+        return describe(value, depth - 1)
+    return {"class": type(value).__qualname__, "repr": ADDRESS.sub("", repr(value))}
+
+
+def describe(obj: Any, depth: int = 2) -> dict:
+    """
+    Class name plus settings of a strategy, used for fingerprints. Nested
+    objects (a chunking strategy, a content filter) are described in turn.
+    Anything else is kept as its type and repr, so no setting goes unseen.
+    """
+    if obj is None:
+        return {}
+    settings = {k: _plain(v, depth) for k, v in vars(obj).items()
+                if not k.startswith("_") and k not in IGNORED_SETTINGS}
+    return {"class": type(obj).__qualname__, **settings}
+
+
+def fingerprint(*parts: Any) -> str:
+    payload = json.dumps(parts, sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ArtifactCache:
+    """
+    Memoizes pipeline stage outputs under (stage, input hash, config fingerprint).
+
+    The input hash covers the bytes a stage consumes and the fingerprint covers
+    every setting that can change its output. A changed extraction schema
+    therefore misses only the extraction stage, and cleaned HTML and markdown
+    are reused.
+    """
+
+    def __init__(self, db_path: str):
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS artifacts (
+                stage TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (stage, content_hash, fingerprint)
+            )
+        """)
+        self.stats = Counter()
+
+    def get_or_compute(self, stage: str, content: str, config_fp: str, compute: Callable[[], Any]) -> Any:
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        row = self.db.execute(
+            "SELECT value FROM artifacts WHERE stage = ? AND content_hash = ? AND fingerprint = ?",
+            (stage, content_hash, config_fp),
+        ).fetchone()
+        if row is not None:
+            self.stats[f"{stage}_hit"] += 1
+            return json.loads(row[0])
+
+        self.stats[f"{stage}_miss"] += 1
+        value = compute()
+        self.db.execute(
+            "INSERT OR REPLACE INTO artifacts VALUES (?, ?, ?, ?, ?)",
+            (stage, content_hash, config_fp, json.dumps(value), time.time()),
+        )
+        self.db.commit()
+        return value
+
+
+class CachedPipeline:
+    """Runs scraping -> markdown -> extraction on HTML, reusing every cached stage."""
+
+    def __init__(
+        self,
+        cache: ArtifactCache,
+        scraping_strategy=None,
+        markdown_generator=None,
+        extraction_strategy=None,
+        **scrape_kwargs,
+    ):
+        self.cache = cache
+        self.scraping_strategy = scraping_strategy or LXMLWebScrapingStrategy()
+        self.markdown_generator = markdown_generator or DefaultMarkdownGenerator()
+        self.extraction_strategy = extraction_strategy
+        self.scrape_kwargs = scrape_kwargs
+
+        # Fingerprints are computed once; strategies are treated as immutable after construction
+        self.scrape_fp = fingerprint(describe(self.scraping_strategy), scrape_kwargs)
+        self.markdown_fp = fingerprint(
+            describe(self.markdown_generator),
+            describe(getattr(self.markdown_generator, "content_filter", None)),
+        )
+        self.extraction_fp = fingerprint(describe(extraction_strategy)) if extraction_strategy else None
+
+    def process(self, url: str, html: str) -> dict:
+        cleaned_html = self.cache.get_or_compute(
+            "cleaned_html", html, self.scrape_fp,
+            lambda: self.scraping_strategy.scrap(url, html, **self.scrape_kwargs).cleaned_html,
+        )
+        # Keyed on the cleaned HTML, so scraping changes that do not alter the output still hit
+        markdown = self.cache.get_or_compute(
+            "markdown", cleaned_html, fingerprint(self.markdown_fp, url),
+            lambda: self.markdown_generator.generate_markdown(cleaned_html, base_url=url).model_dump(),
+        )
+        extracted = None
+        if self.extraction_strategy is not None:
+            extracted = self.cache.get_or_compute(
+                "extracted_content", html, self.extraction_fp,
+                lambda: self.extraction_strategy.extract(url, html),
+            )
+        return {"cleaned_html": cleaned_html, "markdown": markdown, "extracted_content": extracted}
+
+
+async def main():
+    url = "https://webscraper.io/test-sites/e-commerce/allinone"
+    cache = ArtifactCache(os.path.join(Path.home(), ".crawl4ai", "artifacts.sqlite"))
+    md_generator = DefaultMarkdownGenerator(content_filter=PruningContentFilter(threshold=0.4, threshold_type="fixed"))
+
+    schema_v1 = {
+        "name": "Products",
+        "baseSelector": ".thumbnail",
+        "fields": [{"name": "product_name", "selector": ".title", "type": "text"}],
+    }
+    # v2 only adds a field: cleaned_html and markdown come straight from the cache
+    schema_v2 = {**schema_v1, "fields": schema_v1["fields"] + [{"name": "price", "selector": ".price", "type": "text"}]}
+
+    async with AsyncWebCrawler(config=BrowserConfig(headless=True)) as crawler:
+        # Raw HTML comes from crawl4ai's own cache after the first run
+        result = await crawler.arun(url=url, config=CrawlerRunConfig(cache_mode=CacheMode.ENABLED))
+        if not result.success:
+            print(f"Crawl failed: {result.error_message}")
+            return
+
+    for schema in (schema_v1, schema_v2, schema_v2):
+        pipeline = CachedPipeline(
+            cache,
+            markdown_generator=md_generator,
+            extraction_strategy=JsonCssExtractionStrategy(schema),
+        )
+        started = time.perf_counter()
+        output = pipeline.process(result.url, result.html)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{len(output['extracted_content'])} items, fields={[f['name'] for f in schema['fields']]}, {elapsed:.1f} ms")
+
+    print("Stage cache stats:", dict(cache.stats))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,174 @@
+import asyncio
+import json
+from typing import Iterable
+
+from crawl4ai import AsyncWebCrawler, LXMLWebScrapingStrategy
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig, CacheMode
+from crawl4ai.content_scraping_strategy import ContentScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator, MarkdownGenerationStrategy
+from crawl4ai.models import MarkdownGenerationResult, ScrapingResult
+
+ALL_OUTPUTS = {"html", "cleaned_html", "markdown", "fit_markdown", "media", "links", "metadata", "extracted_content"}
+_MISSING = object()
+
+
+class SkipMarkdownGenerator(MarkdownGenerationStrategy):
+    """Markdown generator that does nothing, for crawls that never read markdown."""
+
+    def generate_markdown(self, *args, **kwargs) -> MarkdownGenerationResult:
+        return MarkdownGenerationResult(raw_markdown="", markdown_with_citations="", references_markdown="")
+
+
+class SkipScrapingStrategy(ContentScrapingStrategy):
+    """Scraping strategy that returns nothing, for crawls that only extract from raw HTML."""
+
+    def __init__(self, logger=None):
+        self.logger = logger
+
+    def scrap(self, url: str, html: str, **kwargs) -> ScrapingResult:
+        return ScrapingResult(cleaned_html="", success=True)
+
+    async def ascrap(self, url: str, html: str, **kwargs) -> ScrapingResult:
+        return self.scrap(url, html, **kwargs)
+
+
+def lean_config(config: CrawlerRunConfig, outputs: Iterable[str]) -> CrawlerRunConfig:
+    """
+    Clone `config` so the pipeline only computes what `outputs` needs.
+
+    JSON CSS/XPath extraction reads the raw HTML. A crawl that only wants
+    `extracted_content` therefore skips scraping (including link and media
+    scoring) and markdown generation. If neither markdown flavour is wanted,
+    markdown generation is skipped while cleaned HTML is still produced. An
+    extraction strategy that reads cleaned HTML or markdown keeps the stages
+    it depends on.
+    """
+    outputs = set(outputs)
+    unknown = outputs - ALL_OUTPUTS
+    if unknown:
+        raise ValueError(f"Unknown outputs: {sorted(unknown)}")
+
+    overrides = {}
+    extraction = config.extraction_strategy
+    extraction_input = getattr(extraction, "input_format", None) if extraction else None
+    # Raw and fit HTML come straight from the page; any other input format is built from the scraped content
+    needs_markdown = (bool(outputs & {"markdown", "fit_markdown"})
+                      or extraction_input not in (None, "html", "fit_html", "cleaned_html"))
+    needs_scraping = (needs_markdown or extraction_input == "cleaned_html"
+                      or bool(outputs & {"cleaned_html", "media", "links", "metadata"}))
+
+    if not needs_markdown:
+        overrides["markdown_generator"] = SkipMarkdownGenerator()
+    if not needs_scraping:
+        overrides["scraping_strategy"] = SkipScrapingStrategy()
+    return config.clone(**overrides)
+
+
+def _result_value(result, name: str):
+    # From 0.5 on, result.markdown is a MarkdownGenerationResult and result.fit_markdown raises
+    markdown = getattr(result, "markdown", None)
+    if name in ("markdown", "fit_markdown") and hasattr(markdown, "raw_markdown"):
+        return markdown.raw_markdown if name == "markdown" else markdown.fit_markdown
+    return getattr(result, name, None)
+
+
+class LeanCrawlResult:
+    """
+    A CrawlResult cut down to the requested outputs.
+
+    Only requested fields are copied over, and `__slots__` means unused
+    fields take no per-instance space. With `lazy=True` the raw HTML is kept,
+    and an unrequested field is computed on first access, then memoized.
+    """
+
+    __slots__ = ("url", "success", "status_code", "error_message", "_html", "_scraped",
+                 "_cleaned_html", "_markdown", "_fit_markdown", "_media", "_links", "_metadata",
+                 "_extracted_content")
+
+    def __init__(self, result, outputs: Iterable[str], lazy: bool = False):
+        outputs = set(outputs)
+        self.url = result.url
+        self.success = result.success
+        self.status_code = result.status_code
+        self.error_message = result.error_message
+        self._html = result.html if ("html" in outputs or lazy) else None
+        self._scraped = None
+        for name in ("cleaned_html", "markdown", "fit_markdown", "media", "links", "metadata", "extracted_content"):
+            setattr(self, f"_{name}", _result_value(result, name) if name in outputs else _MISSING)
+
+    def _lazy(self, name: str):
+        value = getattr(self, f"_{name}")
+        if value is not _MISSING:
+            return value
+        if self._html is None:
+            raise AttributeError(f"'{name}' was not requested; pass it in outputs or use lazy=True")
+        if name in ("cleaned_html", "media", "links", "metadata"):
+            if self._scraped is None:
+                self._scraped = LXMLWebScrapingStrategy().scrap(self.url, self._html)
+            value = {
+                "cleaned_html": self._scraped.cleaned_html,
+                "media": self._scraped.media.model_dump(),
+                "links": self._scraped.links.model_dump(),
+                "metadata": self._scraped.metadata,
+            }[name]
+        elif name in ("markdown", "fit_markdown"):
+            md = DefaultMarkdownGenerator().generate_markdown(self.cleaned_html, base_url=self.url)
+            value = md.raw_markdown if name == "markdown" else md.fit_markdown
+        else:
+            raise AttributeError(f"'{name}' cannot be recomputed after the crawl")
+        setattr(self, f"_{name}", value)
+        return value
+
+    html = property(lambda self: self._html)
+    cleaned_html = property(lambda self: self._lazy("cleaned_html"))
+    markdown = property(lambda self: self._lazy("markdown"))
+    fit_markdown = property(lambda self: self._lazy("fit_markdown"))
+    media = property(lambda self: self._lazy("media"))
+    links = property(lambda self: self._lazy("links"))
+    metadata = property(lambda self: self._lazy("metadata"))
+    extracted_content = property(lambda self: self._lazy("extracted_content"))
+
+
+async def lean_arun(crawler: AsyncWebCrawler, url: str, config: CrawlerRunConfig,
+                    outputs: Iterable[str], lazy: bool = False) -> LeanCrawlResult:
+    """`crawler.arun` that computes and keeps only `outputs`."""
+    outputs = set(outputs)
+    result = await crawler.arun(url=url, config=lean_config(config, outputs))
+    return LeanCrawlResult(result, outputs, lazy=lazy)
+
+
+async def main():
+    schema = {
+        "name": "Articles",
+        "baseSelector": "article",
+        "fields": [
+            {"name": "title", "selector": "h2", "type": "text"},
+            {"name": "link", "selector": "a", "type": "attribute", "attribute": "href"}
+        ]
+    }
+    run_config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        extraction_strategy=JsonCssExtractionStrategy(schema)
+    )
+
+    async with AsyncWebCrawler(config=BrowserConfig()) as crawler:
+        # Only the JSON is needed: no scraping, link/media scoring or markdown runs
+        result = await lean_arun(
+            crawler,
+            "https://www.datacamp.com/blog/category/machine-learning",
+            run_config,
+            outputs={"extracted_content"},
+            lazy=True,
+        )
+
+        if result.success:
+            data = json.loads(result.extracted_content)
+            print(f"Extracted {len(data)} articles")
+            # Still available on demand, computed only now because lazy=True
+            print("Markdown (computed lazily):", result.markdown[:200])
+        else:
+            print(f"Crawl failed: {result.error_message}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
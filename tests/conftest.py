@@ -0,0 +1,53 @@
+import importlib.util
+import sys
+from pathlib import Path
+from typing import Dict
+
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_logger import AsyncLogger
+from crawl4ai.models import AsyncCrawlResponse
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_example(relative_path: str):
+    """Import an example script by path; the directories are not packages and some names have spaces."""
+    path = ROOT / relative_path
+    name = "example_" + "".join(c if c.isalnum() else "_" for c in relative_path[:-3])
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        # Run as a script, the example's own directory is on sys.path; some import their neighbours
+        sys.path.insert(0, str(path.parent))
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(str(path.parent))
+    return sys.modules[name]
+
+
+class StaticCrawlerStrategy(AsyncCrawlerStrategy):
+    """Serves fixed HTML per URL, so AsyncWebCrawler runs its whole pipeline without a browser."""
+
+    def __init__(self, pages: Dict[str, str]):
+        self.pages = pages
+        self.hooks = {}
+        self.logger = AsyncLogger(verbose=False)  # crawl4ai 0.4 takes the crawler's logger from its strategy
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def set_hook(self, hook_type: str, hook) -> None:
+        self.hooks[hook_type] = hook
+
+    def update_user_agent(self, user_agent: str) -> None:
+        pass
+
+    async def crawl(self, url: str, **kwargs) -> AsyncCrawlResponse:
+        if url not in self.pages:
+            raise ValueError(f"No page for {url}")
+        return AsyncCrawlResponse(html=self.pages[url], response_headers={}, status_code=200, redirected_url=url)
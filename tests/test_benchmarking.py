@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("psutil")  # The benchmark samples memory with it
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+
+from conftest import StaticCrawlerStrategy, load_example
+
+benchmark = load_example("Benchmarking/p1.py")
+
+PAGE = "https://example.com/article"
+HTML = "<html><body><h1>Title</h1><p>A paragraph with a <a href='/next'>link</a>.</p></body></html>"
+
+
+def test_timed_markdown_generator_records_a_stock_crawl():
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, markdown_generator=benchmark.TimedMarkdownGenerator())
+
+    async def run():
+        times = {}
+        benchmark._stage_times.set(times)
+        async with AsyncWebCrawler(crawler_strategy=StaticCrawlerStrategy({PAGE: HTML})) as crawler:
+            return await crawler.arun(PAGE, config=config), times
+
+    result, times = asyncio.run(run())
+    assert result.success, result.error_message
+    assert "# Title" in str(result.markdown)
+    assert times["markdown"] > 0
@@ -0,0 +1,55 @@
+import asyncio
+import types
+
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from conftest import load_example
+
+pooling = load_example("Browser-Crawler-Config/p3.py")
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler: records the sessions crawled at once instead of driving a browser."""
+
+    def __init__(self, config):
+        self.config = config
+        self.active, self.peak, self.sessions, self.closed = set(), 0, set(), False
+        self.crawler_strategy = types.SimpleNamespace(kill_session=self._kill_session)
+
+    async def _kill_session(self, session_id):
+        self.sessions.discard(session_id)
+
+    async def start(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+    async def arun(self, url, config):
+        self.active.add(config.session_id)
+        self.sessions.add(config.session_id)
+        self.peak = max(self.peak, len(self.active))
+        await asyncio.sleep(0.01)
+        self.active.discard(config.session_id)
+        return types.SimpleNamespace(success=True, url=url)
+
+
+def test_pages_per_browser_are_bounded(monkeypatch):
+    crawlers = []
+    monkeypatch.setattr(pooling, "AsyncWebCrawler", lambda config: crawlers.append(FakeCrawler(config)) or crawlers[-1])
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    async def run():
+        pool = pooling.CrawlerPool(max_browsers=2, max_pages_per_browser=2)
+        proxy = {"server": "http://proxy.example.com:8080"}
+        results = await asyncio.gather(*(
+            pool.arun(f"https://example.com/{n}", config, proxy_config=proxy if n % 2 else None) for n in range(12)
+        ))
+        await pool.close()
+        return results
+
+    results = asyncio.run(run())
+    assert all(result.success for result in results)
+    assert len(crawlers) == 2  # One crawler per identity
+    for crawler in crawlers:
+        assert crawler.peak == 2 and len(crawler.sessions) == 2 and crawler.closed
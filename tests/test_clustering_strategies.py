@@ -0,0 +1,75 @@
+import hashlib
+import threading
+import types
+
+import numpy as np
+import pytest
+from crawl4ai.extraction_strategy import CosineStrategy
+
+from conftest import load_example
+
+scalable = load_example("Clustering Strategies/p3.py")
+
+
+@pytest.fixture(scope="module")
+def frozen():
+    pytest.importorskip("torch")  # The example loads its embedding model at import
+    return load_example("Clustering Strategies/p4.py")
+
+
+def test_page_vectors_stay_with_their_call(monkeypatch):
+    pytest.importorskip("scipy")
+    both_embedding = threading.Barrier(2, timeout=5)
+
+    def embed(self, sentences, batch_size=None, bypass_buffer=False):
+        both_embedding.wait()  # Both threads are inside extract() on the same instance
+        return np.vstack([np.frombuffer(hashlib.sha256(s.encode()).digest(), np.uint8) for s in sentences]) + 1.0
+
+    monkeypatch.setattr(CosineStrategy, "get_embeddings", embed)
+    # The stock __init__ loads a torch model; clustering itself only needs these settings
+    strategy = object.__new__(scalable.ScalableCosineStrategy)
+    strategy.__dict__.update(
+        DEL="\n", semantic_filter=None, word_count_threshold=0, max_dist=0.2, linkage_method="ward", top_k=3,
+        verbose=False, device=types.SimpleNamespace(type="cpu"), nlp=lambda texts: [[] for _ in texts],
+        large_threshold=0, large_method="knn_graph", knn_k=3, block_size=8, n_clusters=None,
+    )
+    pages = ["\n".join(f"page {p} block {b}" for b in range(12)) for p in range(2)]
+    results = [None, None]
+    threads = [threading.Thread(target=lambda p=p: results.__setitem__(p, strategy.extract("u", pages[p])))
+               for p in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    for p, result in enumerate(results):
+        content = " ".join(cluster["content"] for cluster in result)
+        assert content.count(f"page {p} block") == 12 and content.count("page") == 12
+    assert scalable._page_vectors.get() is None
+
+
+def test_llm_strategy_takes_stock_arguments(frozen):
+    from crawl4ai import LLMConfig
+
+    strategy = frozen.FrozenLLMExtractionStrategy(
+        llm_config=LLMConfig(provider="openai/gpt-4o-mini", api_token="test"), instruction="titles"
+    )
+    clone = strategy.clone(instruction="prices", schema={"type": "object"})
+
+    assert (strategy.instruction, strategy.extract_type) == ("titles", "block")
+    assert (clone.instruction, clone.extract_type) == ("prices", "schema")
+    assert clone.usages is not strategy.usages
+    with pytest.raises(AttributeError):
+        strategy.instruction = "other"
+
+
+def test_subclass_init_can_set_fields_before_freezing(frozen):
+    class Tuned(frozen.FrozenJsonCssExtractionStrategy):
+        def __init__(self, schema):
+            super().__init__(schema)
+            self.verbose = True
+
+    strategy = Tuned({"name": "t", "baseSelector": "div", "fields": []})
+    assert strategy.verbose and not strategy.clone(verbose=False).verbose
+    with pytest.raises(AttributeError):
+        strategy.verbose = False
@@ -0,0 +1,64 @@
+import asyncio
+import json
+
+import pytest
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.content_scraping_strategy import LXMLWebScrapingStrategy
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+
+from conftest import ROOT, StaticCrawlerStrategy, load_example
+
+pooled = load_example("content-selection/p8.py")
+
+PAGE = "https://news.example.com/news"
+HTML = "<html><body><table>" + "".join(
+    f"<tr class='athing'><td><span class='titleline'><a href='/item?id={i}'>Story {i}</a></span></td></tr>"
+    f"<tr><td><p>{i} points by someone, with a paragraph long enough to keep.</p></td></tr>"
+    for i in range(30)
+) + "</table></body></html>"
+SCHEMA = {
+    "name": "Story",
+    "baseSelector": "tr.athing",
+    "fields": [
+        {"name": "title", "selector": "span.titleline > a", "type": "text"},
+        {"name": "link", "selector": "span.titleline > a", "type": "attribute", "attribute": "href"},
+    ],
+}
+
+
+@pytest.fixture
+def importable_in_workers(tmp_path, monkeypatch):
+    """Spawned workers unpickle _process_page by module name, so give them a module of that name to import."""
+    path = ROOT / "content-selection" / "p8.py"
+    (tmp_path / f"{pooled.__name__}.py").write_text(
+        f"exec(compile(open({str(path)!r}).read(), {str(path)!r}, 'exec'))\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+
+def crawl(crawler_cls, **kwargs):
+    config = CrawlerRunConfig(
+        scraping_strategy=LXMLWebScrapingStrategy(),
+        extraction_strategy=JsonCssExtractionStrategy(SCHEMA),
+        cache_mode=CacheMode.BYPASS,
+    )
+
+    async def run():
+        async with crawler_cls(crawler_strategy=StaticCrawlerStrategy({PAGE: HTML}), **kwargs) as crawler:
+            return await crawler.arun(PAGE, config=config)
+
+    return asyncio.run(run())
+
+
+@pytest.mark.parametrize("min_offload_bytes", [0, 1 << 20], ids=["worker", "inline"])
+def test_pooled_crawl_matches_stock(importable_in_workers, min_offload_bytes):
+    expected = crawl(AsyncWebCrawler)
+    result = crawl(pooled.PooledCrawler, workers=1, min_offload_bytes=min_offload_bytes)
+
+    assert result.success, result.error_message
+    assert str(result.markdown) == str(expected.markdown)
+    assert json.loads(result.extracted_content) == json.loads(expected.extracted_content)
+    assert len(json.loads(result.extracted_content)) == 30
+    assert result.html == HTML
+    assert ("process_ms" in result.metadata) == (min_offload_bytes == 0)
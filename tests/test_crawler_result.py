@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from conftest import StaticCrawlerStrategy, load_example
+
+instrumented = load_example("crawler-result/p2.py")
+
+PAGE = "https://example.com/"
+HTML = "<html><body><h1>Title</h1><p>Some text with a <a href='https://example.com/a'>link</a>.</p></body></html>"
+
+
+class RecordingHook(instrumented.MetricsHook):
+    def __init__(self):
+        self.results = []
+
+    def on_crawl(self, result):
+        self.results.append(result)
+
+
+def test_instrumented_result_keeps_markdown_and_timings():
+    hook = RecordingHook()
+
+    async def run():
+        crawler = instrumented.InstrumentedCrawler(crawler_strategy=StaticCrawlerStrategy({PAGE: HTML}),
+                                                   metrics_hooks=[hook])
+        async with crawler:
+            return await crawler.arun(PAGE, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+
+    result = asyncio.run(run())
+    assert "# Title" in str(result.markdown)
+    assert {"scrape", "markdown"} <= set(result.timings.stages_ms())
+    assert hook.results == [result]
+
+
+def test_metrics_hook_is_abstract():
+    with pytest.raises(TypeError):
+        instrumented.MetricsHook()
+
+
+streaming = load_example("crawler-result/p3.py")
+
+ARTICLE = "".join(
+    f"<h2>Section {i}</h2><p>This is <strong>important</strong> text &amp; an <em>emphasised</em> phrase with "
+    f"a <a href='/wiki/page_{i % 7}' title='Page {i % 7}'>relative link</a> and "
+    f"<a href='https://example.org/{i}'>an absolute one</a>. 3 &lt; 4 &gt; 2.</p>"
+    f"<ul><li>First item {i}</li><li>Second <code>code_{i}</code></li></ul>"
+    f"<table><tr><th>Key</th><th>Value</th></tr><tr><td>k{i}</td><td>v{i}</td></tr></table>"
+    f"<pre><code>def f():\n    return {i} &lt; 5</code></pre><script>if (a < b) {{ x = '<p>'; }}</script>"
+    for i in range(12)
+)
+ARTICLE = f"<html><body><article>{ARTICLE}</article></body></html>"
+
+
+@pytest.mark.parametrize("feed_size", [1, 3, 7, 10, 64, 333, 4096])
+def test_streaming_markdown_matches_stock(feed_size):
+    base_url = "https://en.wikipedia.org/wiki/apple"
+    expected = streaming.DefaultMarkdownGenerator().generate_markdown(ARTICLE, base_url=base_url)
+    actual = streaming.StreamingMarkdownGenerator(feed_size=feed_size).generate_markdown(ARTICLE, base_url=base_url)
+
+    assert "**important**" in expected.raw_markdown
+    assert actual.raw_markdown == expected.raw_markdown
+    assert actual.markdown_with_citations == expected.markdown_with_citations
+    assert actual.references_markdown == expected.references_markdown
+
+
+def test_streaming_markdown_uses_stock_options():
+    html = "<p>See <a href='https://example.org/a b'>this</a>.</p>"
+    expected = streaming.DefaultMarkdownGenerator().generate_markdown(html)
+    assert streaming.StreamingMarkdownGenerator().generate_markdown(input_html=html).raw_markdown == expected.raw_markdown
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from conftest import load_example
+
+deep = load_example("Deep-Crawling/p1.py")
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "frontier.sqlite")
+
+
+def states(frontier):
+    return dict(frontier.db.execute("SELECT url, state FROM urls"))
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("HTTPS://Example.COM:443/a?b=2&utm_source=x&a=1#top", "https://example.com/a?a=1&b=2"),
+    ("http://example.com:8080?gclid=1", "http://example.com:8080/?"),
+    ("http://example.com.", "http://example.com/"),
+    ("mailto:someone@example.com", None),
+    ("javascript:void(0)", None),
+])
+def test_normalize_url(url, expected):
+    assert deep.normalize_url(url) == (expected.rstrip("?") if expected else None)
+
+
+def test_normalize_resolves_against_base():
+    assert deep.normalize_url("../b?ref=nav", base="https://example.com/x/y/") == "https://example.com/x/b"
+
+
+def test_add_dedups_variants_and_repeats(path):
+    frontier = deep.Frontier(path)
+    assert frontier.add(["https://example.com/a", "https://EXAMPLE.com/a#x", "https://example.com/a?utm_medium=m"]) == 1
+    assert frontier.add(["https://example.com/a", "https://example.com/b"]) == 1
+    assert frontier.pending() == 2
+    frontier.close()
+
+
+def test_next_batch_is_round_robin_and_respects_domain_delay(path):
+    frontier = deep.Frontier(path, domain_delay=60)
+    for domain in ("a.example", "b.example", "c.example"):
+        frontier.add([f"https://{domain}/deep"], depth=2)
+        frontier.add([f"https://{domain}/{n}" for n in range(4)], depth=1)
+
+    batch = frontier.next_batch(size=10, per_domain=2)
+    by_domain = {}
+    for url, depth, _ in batch:
+        by_domain.setdefault(url.split("/")[2], []).append((url, depth))
+    assert sorted(by_domain) == ["a.example", "b.example", "c.example"]
+    # Shallower first, then in discovery order
+    assert all(urls == [(f"https://{d}/0", 1), (f"https://{d}/1", 1)] for d, urls in by_domain.items())
+    assert frontier.next_batch(size=10, per_domain=2) == []  # Every domain is cooling down
+    assert frontier.pending() == 9
+    frontier.close()
+
+
+def test_next_batch_stops_at_size(path):
+    frontier = deep.Frontier(path, domain_delay=0)
+    for domain in ("a.example", "b.example", "c.example"):
+        frontier.add([f"https://{domain}/{n}" for n in range(3)])
+
+    assert len(frontier.next_batch(size=5, per_domain=2)) == 5
+    frontier.close()
+
+
+def test_reopen_resumes_in_progress_urls(path):
+    frontier = deep.Frontier(path, domain_delay=0)
+    frontier.add([f"https://example.com/{n}" for n in range(3)])
+    (first, _, _), (second, _, _) = frontier.next_batch(size=2, per_domain=2)
+    frontier.complete(first, success=True)
+    frontier.checkpoint()
+    frontier.add(["https://example.com/after-checkpoint"])
+    frontier.db.close()  # Crash: nothing since the checkpoint is committed
+
+    frontier = deep.Frontier(path, domain_delay=0)
+    assert states(frontier) == {
+        first: deep.DONE, second: deep.PENDING, "https://example.com/2": deep.PENDING,
+    }
+    assert frontier.pending() == 2
+    assert sorted(url for url, _, _ in frontier.next_batch()) == [second, "https://example.com/2"]
+    frontier.close()
+
+
+def test_requeue_stale_puts_old_pages_back(path):
+    frontier = deep.Frontier(path, domain_delay=0)
+    frontier.add(["https://example.com/old", "https://example.com/new"])
+    for url, _, _ in frontier.next_batch():
+        frontier.complete(url, success=True)
+    frontier.db.execute("UPDATE urls SET crawled_at = ? WHERE url LIKE '%/old'", (time.time() - 3600,))
+
+    assert frontier.requeue_stale(max_age=60) == 1
+    assert frontier.pending() == 1
+    assert [url for url, _, _ in frontier.next_batch()] == ["https://example.com/old"]
+    frontier.close()
+
+
+@pytest.mark.parametrize("reopen_capacity", [1000, 5000], ids=["missing checkpoint", "different size"])
+def test_bloom_filter_is_rebuilt_from_the_table(path, reopen_capacity):
+    frontier = deep.Frontier(path, capacity=1000)
+    urls = [f"https://example.com/{n}" for n in range(50)]
+    frontier.add(urls)
+    frontier.close()
+    if reopen_capacity == 1000:
+        frontier = deep.Frontier(path, capacity=1000)
+        frontier.db.execute("DELETE FROM meta WHERE key = 'bloom'")
+        frontier.db.execute("COMMIT")
+        frontier.db.close()
+
+    frontier = deep.Frontier(path, capacity=reopen_capacity)
+    assert all(deep.url_hash(url) in frontier.bloom for url in urls)
+    assert frontier.add(urls) == 0
+    frontier.close()
@@ -0,0 +1,50 @@
+import asyncio
+
+from aiohttp import web
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from conftest import StaticCrawlerStrategy, load_example
+
+downloads = load_example("file-downloading/p2.py")
+
+PAYLOAD = b"%PDF-1.4 " + bytes(range(256)) * 64
+
+
+async def serve_payload(request):
+    return web.Response(body=PAYLOAD)
+
+
+def test_stock_config_constructs_and_clones(tmp_path):
+    manager = downloads.DownloadManager(str(tmp_path), extensions=(".pdf",), on_progress=None)
+    crawler = downloads.DownloadingCrawler(crawler_strategy=StaticCrawlerStrategy({}), download_manager=manager)
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    clone = config.clone(stream=True)
+
+    assert crawler.download_manager is manager
+    assert clone.stream and clone.cache_mode is CacheMode.BYPASS
+
+
+def test_arun_downloads_linked_files(tmp_path):
+    async def run():
+        app = web.Application()
+        app.router.add_get("/files/report.pdf", serve_payload)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        page = "https://example.com/"
+        html = f'<html><body><p>Reports</p><a href="http://127.0.0.1:{port}/files/report.pdf">PDF</a></body></html>'
+        try:
+            async with downloads.DownloadManager(str(tmp_path), extensions=(".pdf",), on_progress=None) as manager:
+                crawler = downloads.DownloadingCrawler(crawler_strategy=StaticCrawlerStrategy({page: html}),
+                                                       download_manager=manager)
+                async with crawler:
+                    return await crawler.arun(page, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+        finally:
+            await runner.cleanup()
+
+    result = asyncio.run(run())
+    assert result.success, result.error_message
+    assert len(result.downloaded_files) == 1
+    assert (tmp_path / "report.pdf").read_bytes() == PAYLOAD
@@ -0,0 +1,58 @@
+import asyncio
+
+from crawl4ai.async_logger import AsyncLogger
+
+from conftest import load_example
+
+adaptive = load_example("lazy-loaded/p2.py")
+
+
+class ScriptedPage:
+    """Stands in for a Playwright page whose scroll height follows a script, one entry per settle."""
+
+    viewport_size = {"width": 1200, "height": 1000}
+
+    def __init__(self, url, heights):
+        self.url = url
+        self.heights = list(heights)
+
+    def on(self, event, handler):
+        pass
+
+    def remove_listener(self, event, handler):
+        pass
+
+    async def wait_for_timeout(self, ms):
+        pass
+
+    async def evaluate(self, script, *args):
+        if script == adaptive.PAGE_STATE:
+            height = self.heights.pop(0) if len(self.heights) > 1 else self.heights[0]
+            return {"quietMs": 10_000, "pendingImages": 0, "height": height}
+        return {"success": True}
+
+
+def scan(strategy, page):
+    strategy.logger = AsyncLogger(verbose=False)  # Normally handed over by the crawler
+    asyncio.run(strategy._handle_full_page_scan(page, scroll_delay=0))
+    return strategy.scroll_reports[page.url]
+
+
+def test_growth_restarts_the_stable_count():
+    strategy = adaptive.AdaptiveScrollCrawlerStrategy(stable_rounds=2)
+    # One round at the bottom of a 2000px page, then it grows past the viewport to 5000px
+    report = scan(strategy, ScriptedPage("https://example.com/feed", [2000, 2000, 5000]))
+
+    assert report.stop_reason == "bottom reached"
+    assert report.final_height == 5000
+    # Steps at 1000, 2000, 3000 and 4000px, then two rounds at the new bottom
+    assert report.steps == 5
+
+
+def test_scroll_reports_are_capped():
+    strategy = adaptive.AdaptiveScrollCrawlerStrategy(max_reports=2)
+    for n in range(3):
+        scan(strategy, ScriptedPage(f"https://example.com/{n}", [1000]))
+    scan(strategy, ScriptedPage("https://example.com/1", [1000]))
+
+    assert list(strategy.scroll_reports) == ["https://example.com/2", "https://example.com/1"]
@@ -0,0 +1,53 @@
+import asyncio
+
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from conftest import StaticCrawlerStrategy, load_example
+
+blocking = load_example("Link-Media/p3.py")
+
+PAGE = "https://example.com/"
+HTML = "<html><body><h1>Title</h1><p>Some text with a <a href='https://example.com/a'>link</a>.</p></body></html>"
+
+
+class ProfileRecordingStrategy(StaticCrawlerStrategy):
+    """Records the per-run profile the Playwright strategy would read in its hook."""
+
+    def __init__(self, pages):
+        super().__init__(pages)
+        self.profiles = []
+
+    async def crawl(self, url, **kwargs):
+        self.profiles.append(blocking._current_profile.get())
+        return await super().crawl(url, **kwargs)
+
+
+def crawl(strategy, **kwargs):
+    async def run():
+        async with blocking.BlockingCrawler(crawler_strategy=strategy) as crawler:
+            return await crawler.arun(PAGE, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS), **kwargs)
+
+    return asyncio.run(run())
+
+
+def test_result_keeps_markdown():
+    result = crawl(StaticCrawlerStrategy({PAGE: HTML}))
+    assert isinstance(result, blocking.BlockingCrawlResult)
+    assert "# Title" in str(result.markdown)
+    assert result.links["internal"]
+
+
+def test_per_run_profile_reaches_the_strategy():
+    strategy = ProfileRecordingStrategy({PAGE: HTML})
+    crawl(strategy, blocking_profile=blocking.ALLOW_ALL)
+    crawl(strategy)
+    assert strategy.profiles == [blocking.ALLOW_ALL, None]
+
+
+def test_profile_rules():
+    profile = blocking.HTML_ONLY.with_overrides({"datacamp.com": blocking.NO_TRACKERS})
+    assert profile.blocks("https://cdn.example.com/a.png", "image")
+    assert profile.blocks("https://www.google-analytics.com/collect", "script")
+    assert not profile.blocks("https://example.com/app.js", "script")
+    assert profile.for_page("https://www.datacamp.com/blog") is blocking.NO_TRACKERS
+    assert not profile.for_page("https://www.datacamp.com/blog").blocks("https://cdn.example.com/a.png", "image")
@@ -0,0 +1,127 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("cssselect")  # Used by the compiled CSS plans; not a crawl4ai dependency
+
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy, JsonXPathExtractionStrategy
+
+from conftest import load_example
+
+compiled = load_example("LLM-Free-Strategies/p5.py")
+
+PRODUCTS = "".join(
+    f"<div class='thumbnail'><img class='img-responsive' src='/img/{i}.png'>"
+    f"<h4 class='price'>${i}.99</h4><a class='title' href='/p/{i}'>Product {i}</a>"
+    f"<div><p class='description'>Description of <b>product</b> {i}</p></div>"
+    f"<ul><li class='tag'>new</li><li class='tag'>sale {i}</li></ul></div>"
+    for i in range(5)
+)
+
+CSS_CASES = {
+    "simple selectors": (
+        {"baseSelector": ".thumbnail", "fields": [
+            {"name": "name", "selector": ".title", "type": "text", "transform": "uppercase"},
+            {"name": "price", "selector": "h4.price", "type": "regex", "pattern": r"\$(\d+)"},
+            {"name": "link", "selector": "a[href]", "type": "attribute", "attribute": "href"},
+            {"name": "image", "selector": ".img-responsive", "type": "attribute", "attribute": "src"},
+            {"name": "missing", "selector": ".nothing", "type": "text", "default": "n/a"},
+            {"name": "tags", "selector": "li.tag", "type": "list", "fields": [
+                {"name": "tag", "type": "text"}]},
+            {"name": "label", "type": "computed", "expression": "name + ' ' + price"},
+        ]},
+        f"<html><body>{PRODUCTS}</body></html>",
+    ),
+    "combinator anchored at the base element": (
+        {"baseSelector": ".thumbnail", "fields": [
+            {"name": "description", "selector": "div > p", "type": "text", "default": "none"},
+            {"name": "second_tag", "selector": "div > ul li:nth-child(2)", "type": "text"},
+        ]},
+        "<html><body><div class='thumbnail'><p>Description</p><ul><li>new</li><li>sale</li></ul></div></body></html>",
+    ),
+    "child combinator skips deeper descendants": (
+        {"baseSelector": "section", "fields": [
+            {"name": "direct", "selector": "div > span", "type": "text"},
+            {"name": "all", "selector": "div span", "type": "list", "fields": [{"name": "t", "type": "text"}]},
+        ]},
+        "<html><body><section><div><em><span>deep</span></em><span>direct</span></div></section></body></html>",
+    ),
+    "repeated class token": (
+        {"baseSelector": "ul", "fields": [
+            {"name": "items", "selector": ".t2", "type": "list", "fields": [{"name": "t", "type": "text"}]},
+        ]},
+        "<html><body><ul><li class='t2 t2'>a</li><li class='t2'>b</li></ul></body></html>",
+    ),
+    "script and style text": (
+        {"baseSelector": "article", "fields": [
+            {"name": "body", "selector": ".body", "type": "text"},
+            {"name": "script", "selector": "script", "type": "text"},
+        ]},
+        "<html><body><article><div class='body'>Hello<script>var x=1</script><style>p{}</style>"
+        "<!-- note -->world</div></article></body></html>",
+    ),
+    "nested and nested_list": (
+        {"baseSelector": ".thumbnail", "fields": [
+            {"name": "detail", "selector": "div", "type": "nested", "fields": [
+                {"name": "text", "selector": "p", "type": "text"}]},
+            {"name": "tags", "selector": "ul", "type": "nested_list", "fields": [
+                {"name": "first", "selector": "li", "type": "text"}]},
+        ]},
+        f"<html><body>{PRODUCTS}</body></html>",
+    ),
+}
+
+XPATH_CASES = {
+    "child and descendant steps": (
+        {"baseSelector": "//section", "fields": [
+            {"name": "direct", "selector": "div > span", "type": "text"},
+            {"name": "any", "selector": "div span", "type": "text"},
+            {"name": "plain", "selector": "em", "type": "text"},
+            {"name": "explicit", "selector": ".//em/span", "type": "text"},
+        ]},
+        "<html><body><section><div><em><span>deep</span></em><span>direct</span></div></section></body></html>",
+    ),
+}
+
+
+@pytest.mark.parametrize("case", CSS_CASES)
+def test_css_matches_stock(case):
+    schema, html = CSS_CASES[case]
+    schema = {"name": case, **schema}
+    expected = JsonCssExtractionStrategy(schema).extract(None, html)
+    assert expected
+    assert compiled.CompiledJsonCssExtractionStrategy(schema).extract(None, html) == expected
+
+
+@pytest.mark.parametrize("case", XPATH_CASES)
+def test_xpath_matches_stock(case):
+    schema, html = XPATH_CASES[case]
+    schema = {"name": case, **schema}
+    expected = JsonXPathExtractionStrategy(schema).extract(None, html)
+    assert expected
+    assert compiled.CompiledJsonXPathExtractionStrategy(schema).extract(None, html) == expected
+
+
+batch = load_example("LLM-Free-Strategies/p6.py")
+
+
+def test_extract_many_reuses_one_pool_of_compiled_workers():
+    schema = {"name": "products", **CSS_CASES["simple selectors"][0]}
+    html = CSS_CASES["simple selectors"][1]
+    expected = JsonCssExtractionStrategy(schema).extract(None, html)
+
+    async def run():
+        async with batch.BatchJsonCssExtractionStrategy(schema) as strategy:
+            first = [o async for o in strategy.extract_many([("u1", html), ("u2", html)], max_workers=2, batch_size=1)]
+            pool = strategy._pool
+            second = [o async for o in strategy.extract_many([html] * 3, max_workers=2)]
+            assert strategy._pool is pool
+            async for _ in strategy.extract_many([html] * 50, max_workers=2, batch_size=1):
+                break  # Leaving early cancels the batches still queued
+        return first, second, strategy
+
+    first, second, strategy = asyncio.run(run())
+    assert strategy._pool is None
+    assert type(strategy.plan).__name__ == "CompiledSchema"
+    assert sorted(o.url for o in first) == ["u1", "u2"]
+    assert all(o.items == expected and o.error is None for o in first + second)
@@ -0,0 +1,61 @@
+import pytest
+
+from conftest import load_example
+
+scheduled = load_example("LLM-Strategies/p3.py")
+cached = load_example("LLM-Strategies/p4.py")
+
+
+def llm_config(provider):
+    crawl4ai = pytest.importorskip("crawl4ai")
+    if not hasattr(crawl4ai, "LLMConfig"):
+        pytest.skip("LLMConfig arrived in crawl4ai 0.5")
+    return crawl4ai.LLMConfig(provider=provider, api_token="test-key")
+
+
+def test_scheduled_strategy_accepts_llm_config():
+    strategy = scheduled.ScheduledLLMExtractionStrategy(
+        llm_config=llm_config("openai/gpt-4o-mini"), instruction="Extract", rpm=60
+    )
+
+    assert strategy.limiter is scheduled.provider_limiter("openai/gpt-4o-mini", 60)
+    assert scheduled.llm_settings(strategy)[:2] == ("openai/gpt-4o-mini", "test-key")
+
+
+def test_limiters_are_shared_only_with_the_same_limits():
+    first = scheduled.provider_limiter("openai/gpt-4o-mini", rpm=60, tpm=1000)
+
+    assert scheduled.provider_limiter("openai/gpt-4o-mini", rpm=60, tpm=1000) is first
+    faster = scheduled.provider_limiter("openai/gpt-4o-mini", rpm=500, tpm=1000)
+    assert faster is not first
+    assert faster.requests.capacity != first.requests.capacity
+
+
+def test_scheduled_strategy_accepts_provider():
+    if hasattr(pytest.importorskip("crawl4ai"), "LLMConfig"):
+        pytest.skip("crawl4ai 0.5+ rejects provider= in favour of llm_config")
+    strategy = scheduled.ScheduledLLMExtractionStrategy(provider="openai/gpt-4o", api_token="test-key", rpm=60)
+
+    assert scheduled.llm_settings(strategy)[:2] == ("openai/gpt-4o", "test-key")
+
+
+def test_cache_key_follows_the_configured_model(tmp_path):
+    cache = cached.LLMResponseCache(str(tmp_path / "llm.db"))
+    mini, full = (
+        cached.CachedLLMExtractionStrategy(llm_config=llm_config(provider), instruction="Extract", cache=cache)
+        for provider in ("openai/gpt-4o-mini", "openai/gpt-4o")
+    )
+
+    assert mini.cache is cache
+    assert mini.cache_key("<p>Same chunk</p>") != full.cache_key("<p>Same chunk</p>")
+
+
+def test_cache_key_separates_json_mode(tmp_path):
+    cache = cached.LLMResponseCache(str(tmp_path / "llm.db"))
+    free_text, json_mode = (
+        cached.CachedLLMExtractionStrategy(llm_config=llm_config("openai/gpt-4o-mini"), instruction="Extract",
+                                           force_json_response=force, cache=cache)
+        for force in (False, True)
+    )
+
+    assert free_text.cache_key("<p>Same chunk</p>") != json_mode.cache_key("<p>Same chunk</p>")
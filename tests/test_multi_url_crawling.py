@@ -0,0 +1,97 @@
+import asyncio
+import json
+import subprocess
+import sys
+import textwrap
+import types
+
+from conftest import ROOT, load_example
+
+DRIVER = textwrap.dedent("""
+    import asyncio
+    import sys
+
+    sys.path.insert(0, sys.argv[1])
+    from p4 import ShardedCrawler
+
+    async def main():
+        urls = [f"raw:<html><body><p>page {i}</p></body></html>" for i in range(4)]
+        async for result in ShardedCrawler(n_shards=2).crawl(urls):
+            print("RESULT", result.success, repr((result.error_message or "").splitlines()[:1]))
+
+    if __name__ == "__main__":
+        asyncio.run(main())
+""")
+
+
+def test_every_url_gets_one_result_with_a_readable_error(tmp_path):
+    # Spawned shard workers must import the example by name, so it runs as a script in a subprocess
+    driver = tmp_path / "driver.py"
+    driver.write_text(DRIVER)
+    examples = ROOT / "Multi-URL-Crawling-with-Dispatchers"
+    output = subprocess.run([sys.executable, str(driver), str(examples)], capture_output=True, text=True,
+                            timeout=300).stdout
+    results = [line for line in output.splitlines() if line.startswith("RESULT")]
+
+    assert len(results) == 4
+    for line in results:
+        # Without a browser every shard fails at launch; the reason must be the exception, not box drawing
+        assert line.startswith("RESULT True") or ("Shard" in line and "Error" in line and "═" not in line), line
+
+
+sinks = load_example("Multi-URL-Crawling-with-Dispatchers/p3.py")
+
+
+def test_jsonl_sink_drops_a_last_line_without_newline(tmp_path):
+    path = tmp_path / "results.jsonl"
+    # The crash left a parseable last line whose newline never reached the disk
+    path.write_text('{"url": "https://a.example"}\n{"url": "https://b.example"}')
+
+    with sinks.JsonlResultSink(str(path), fields=["url", "success"]) as sink:
+        assert sink.completed_urls() == {"https://a.example"}
+        sink.write(types.SimpleNamespace(url="https://b.example", success=True))
+
+    rows = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [row["url"] for row in rows] == ["https://a.example", "https://b.example"]
+
+
+scheduling = load_example("Multi-URL-Crawling-with-Dispatchers/p2.py")
+
+
+class FlakyCrawler:
+    """arun() raises for URLs containing "broken" and is slow for "slow" ones."""
+
+    def __init__(self):
+        self.cancelled = 0
+
+    async def arun(self, url, config):
+        if "broken" in url:
+            raise ConnectionError("connection reset")
+        try:
+            await asyncio.sleep(10 if "slow" in url else 0)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return types.SimpleNamespace(url=url, success=True, status_code=200)
+
+
+def test_scheduler_yields_failures_and_cancels_on_early_exit():
+    crawler = FlakyCrawler()
+    scheduler = scheduling.MemoryAdaptiveScheduler(min_concurrency=4, max_concurrency=4)
+
+    async def run():
+        urls = ["https://a.example/ok", "https://b.example/broken", "https://c.example/slow", "https://d.example/slow"]
+        results, stream = [], scheduler.run(crawler, urls, config=None)
+        async for result in stream:
+            results.append(result)
+            if len(results) == 2:
+                break  # The slow crawls are still in flight
+        await stream.aclose()
+        await asyncio.sleep(0)  # Let the cancelled crawls unwind
+        return results
+
+    results = asyncio.run(run())
+    assert {r.url: r.success for r in results} == {"https://a.example/ok": True, "https://b.example/broken": False}
+    failed = next(r for r in results if not r.success)
+    assert failed.error_message == "ConnectionError: connection reset"
+    assert crawler.cancelled == 2
@@ -0,0 +1,18 @@
+import pytest
+
+from crawl4ai.content_filter_strategy import PruningContentFilter
+
+from conftest import load_example
+
+vectorized = load_example("quickstart/p8.py")
+
+CORPUS = list(vectorized.fixture_corpus())
+
+
+@pytest.mark.parametrize("settings", vectorized.PARITY_SETTINGS, ids=lambda s: "-".join(map(str, s.values())))
+def test_vectorized_pruning_matches_stock(settings):
+    assert vectorized.check_parity(CORPUS, **settings) == 0
+    # Not vacuous: on this corpus the stock filter keeps some content and prunes some
+    kept = sum(len("".join(PruningContentFilter(**settings).filter_content(page))) for page in CORPUS)
+    everything = sum(len("".join(PruningContentFilter(threshold=-1).filter_content(page))) for page in CORPUS)
+    assert 0 < kept < everything
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import random
+from importlib.metadata import version
+
+import pytest
+from aiohttp import web
+
+from crawl4ai import CacheMode, CrawlerRunConfig
+from crawl4ai.chunking_strategy import RegexChunking
+from crawl4ai.extraction_strategy import ExtractionStrategy, JsonCssExtractionStrategy
+
+from conftest import StaticCrawlerStrategy, load_example
+
+lean = load_example("simple_crawling/p7.py")
+
+PAGE = "https://example.com/blog"
+HTML = ("<html><body><article><h2>First post</h2><a href='/a'>Read</a></article>"
+        "<article><h2>Second post</h2><a href='/b'>Read</a></article></body></html>")
+
+
+class CleanedHtmlLength(ExtractionStrategy):
+    """Reports the length of the cleaned HTML it was given."""
+
+    def extract(self, url, html, *q, **kwargs):
+        return [{"length": len(html)}]
+
+    def run(self, url, sections, *q, **kwargs):
+        return self.extract(url, "".join(sections))
+
+
+def lean_crawl(config, outputs, lazy=False):
+    async def run():
+        async with lean.AsyncWebCrawler(crawler_strategy=StaticCrawlerStrategy({PAGE: HTML})) as crawler:
+            return await lean.lean_arun(crawler, PAGE, config, outputs, lazy=lazy)
+
+    return asyncio.run(run())
+
+
+def test_json_extraction_skips_scraping_and_markdown():
+    schema = {"name": "a", "baseSelector": "article", "fields": [{"name": "title", "selector": "h2", "type": "text"}]}
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, extraction_strategy=JsonCssExtractionStrategy(schema))
+    lean_config = lean.lean_config(config, {"extracted_content"})
+    assert isinstance(lean_config.scraping_strategy, lean.SkipScrapingStrategy)
+    assert isinstance(lean_config.markdown_generator, lean.SkipMarkdownGenerator)
+
+    result = lean_crawl(config, {"extracted_content"}, lazy=True)
+    assert [item["title"] for item in json.loads(result.extracted_content)] == ["First post", "Second post"]
+    assert "First post" in result.markdown
+
+
+@pytest.mark.skipif(version("crawl4ai") < "0.5", reason="crawl4ai 0.4 has no cleaned_html input format")
+def test_cleaned_html_extraction_keeps_scraping():
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS,
+                              extraction_strategy=CleanedHtmlLength(input_format="cleaned_html"))
+    assert not isinstance(lean.lean_config(config, {"extracted_content"}).scraping_strategy, lean.SkipScrapingStrategy)
+
+    result = lean_crawl(config, {"extracted_content"})
+    assert json.loads(result.extracted_content)[0]["length"] > 0
+
+
+def test_requested_markdown_is_copied():
+    result = lean_crawl(CrawlerRunConfig(cache_mode=CacheMode.BYPASS), {"markdown", "fit_markdown"})
+    assert "## First post" in result.markdown
+    assert result.fit_markdown == ""
+
+
+def test_skip_markdown_generator_accepts_any_call():
+    generator = lean.SkipMarkdownGenerator()
+    assert generator.generate_markdown(input_html="<p>x</p>", base_url=PAGE).raw_markdown == ""
+    assert generator.generate_markdown("<p>x</p>").raw_markdown == ""
+
+
+revalidating = load_example("simple_crawling/p5.py")
+
+
+class EtagServer:
+    """Local page that honours If-None-Match, counting full and 304 responses."""
+
+    def __init__(self):
+        self.full = self.not_modified = 0
+
+    async def handle(self, request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            self.not_modified += 1
+            return web.Response(status=304)
+        self.full += 1
+        return web.Response(text=HTML, content_type="text/html", headers={"ETag": '"v1"'})
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_get("/page", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/page"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.runner.cleanup()
+
+
+def test_cache_mode_comes_from_each_run(tmp_path):
+    cache = revalidating.CrawlCache(str(tmp_path))
+
+    async def run():
+        async with EtagServer() as server, revalidating.RevalidatingCrawler(cache) as crawler:
+            for mode in (CacheMode.BYPASS, CacheMode.ENABLED, CacheMode.ENABLED):
+                result = await crawler.arun(server.url, config=CrawlerRunConfig(cache_mode=mode))
+                assert result.success and "First post" in result.html
+            return server, crawler.crawler_strategy.stats
+
+    server, stats = asyncio.run(run())
+    assert server.full == 2  # BYPASS does not store, so the first ENABLED run fetches again
+    assert stats == {"fresh": 1, "not_modified": 0, "fetched": 2}
+
+
+def test_read_only_revalidation_does_not_write(tmp_path):
+    cache = revalidating.CrawlCache(str(tmp_path), default_ttl=-1)  # Every entry is stale at once
+    strategy = revalidating.RevalidatingCacheStrategy(cache)
+
+    async def run():
+        async with EtagServer() as server:
+            await strategy.crawl(server.url, config=CrawlerRunConfig(cache_mode=CacheMode.ENABLED))
+            before = cache.lookup(server.url, touch=False)
+            response = await strategy.crawl(server.url, config=CrawlerRunConfig(cache_mode=CacheMode.READ_ONLY))
+            after = cache.lookup(server.url, touch=False)
+            await strategy.client.aclose()
+            return server, response, before, after
+
+    server, response, before, after = asyncio.run(run())
+    assert server.not_modified == 1 and "First post" in response.html
+    assert after["expires_at"] == before["expires_at"]
+
+
+def test_evicted_body_is_a_miss(tmp_path):
+    cache = revalidating.CrawlCache(str(tmp_path))
+    strategy = revalidating.RevalidatingCacheStrategy(cache)
+
+    async def run():
+        async with EtagServer() as server:
+            config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED)
+            await strategy.crawl(server.url, config=config)
+            os.remove(cache.lookup(server.url)["path"])  # As if evict() ran in another process
+            response = await strategy.crawl(server.url, config=config)
+            await strategy.client.aclose()
+            return server, response
+
+    server, response = asyncio.run(run())
+    assert server.full == 2 and server.not_modified == 0
+    assert "First post" in response.html
+
+
+def test_eviction_stops_once_under_the_limit(tmp_path):
+    cache = revalidating.CrawlCache(str(tmp_path))
+    urls = [f"https://example.com/{n}" for n in range(5)]
+    for n, url in enumerate(urls):
+        cache.store(url, random.Random(n).randbytes(4000).hex())
+    cache.store("https://example.com/copy", random.Random(4).randbytes(4000).hex())  # Shares the newest body
+    sizes = [size for (size,) in cache.db.execute("SELECT size FROM blobs ORDER BY rowid")]
+
+    cache.max_bytes = sum(sizes[2:])
+    cache.store(urls[2], random.Random(2).randbytes(4000).hex())  # Touch: now the most recent, so it stays
+
+    kept = {url for (url,) in cache.db.execute("SELECT url FROM entries")}
+    assert kept == {urls[2], urls[3], urls[4], "https://example.com/copy"}
+    assert cache.total_bytes() == sum(sizes[2:])
+    assert len(list(cache.blob_dir.rglob("*.*"))) == 3
+
+
+artifacts = load_example("simple_crawling/p6.py")
+
+
+class ChunkedExtraction(ExtractionStrategy):
+    def __init__(self, chunking_strategy, **kwargs):
+        super().__init__(**kwargs)
+        self.chunking_strategy = chunking_strategy
+
+    def extract(self, url, html, *q, **kwargs):
+        return []
+
+
+def test_fingerprint_is_stable_and_sees_nested_settings():
+    def extraction_fp(patterns):
+        strategy = ChunkedExtraction(RegexChunking(patterns=patterns))
+        return artifacts.fingerprint(artifacts.describe(strategy))
+
+    assert extraction_fp([r"\n\n"]) == extraction_fp([r"\n\n"])  # No memory addresses in the fingerprint
+    assert extraction_fp([r"\n\n"]) != extraction_fp([r"\n"])
+    assert artifacts.fingerprint(artifacts.describe(artifacts.DefaultMarkdownGenerator())) == \
+        artifacts.fingerprint(artifacts.describe(artifacts.DefaultMarkdownGenerator()))